@@ -2,9 +2,6 @@
 机器学习数据分析与统计系统
 """
 
-from .data import DataProcessor
-from .models import ModelTrainer, Predictor
-from .api import app, run_api
 from .config import (
     MODEL_CONFIG,
     DATA_CONFIG,
@@ -14,6 +11,7 @@ from .config import (
     LOGGING_CONFIG,
     DATABASE_CONFIG
 )
+from utils.startup import lazy_exports
 
 __version__ = "1.0.0"
 __title__ = "机器学习数据分析与统计系统"
@@ -32,4 +30,13 @@ __all__ = [
     'SYSTEM_CONFIG',
     'LOGGING_CONFIG',
     'DATABASE_CONFIG'
-]
\ No newline at end of file
+]
+
+
+__getattr__ = lazy_exports(__name__, {
+    'DataProcessor': '.data',
+    'ModelTrainer': '.models',
+    'Predictor': '.models',
+    'app': '.api',
+    'run_api': '.api'
+})
@@ -1,3 +1,8 @@
-from .ml_api import app, run_api
+from utils.startup import lazy_exports
 
-__all__ = ['app', 'run_api']
\ No newline at end of file
+__all__ = ['app', 'run_api']
+
+__getattr__ = lazy_exports(__name__, {
+    'app': '.ml_api',
+    'run_api': '.ml_api'
+})
@@ -0,0 +1,121 @@
+import time
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from models.model_handle import ModelHandle
+from utils.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+QUEUE_WAIT_BUCKETS_MS = [0.1, 0.5, 1, 2, 5, 10, 25, 50, 100]
+
+
+class MicroBatcher:
+
+    def __init__(self, predictor, max_wait_ms: float = 2.0, max_batch_size: int = 64, pool=None):
+        self.predictor = predictor
+        self.pool = pool
+        self.max_wait_ms = max_wait_ms
+        self.max_batch_size = max_batch_size
+        self.queues: Dict[ModelHandle, List[Tuple[Dict[str, Any], asyncio.Future, float]]] = {}
+        self.flush_handles: Dict[ModelHandle, asyncio.TimerHandle] = {}
+        self.batch_size_histogram = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_histogram = Histogram(QUEUE_WAIT_BUCKETS_MS)
+        self._dispatch_tasks = set()
+
+    async def predict(self, model_name: Optional[str], data: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            if self.pool is None:
+                handle = self.predictor.get_handle(model_name)
+            else:
+                handle = await self.pool.run(self.predictor.get_handle, model_name)
+        except ValueError as e:
+            return {'success': False, 'message': str(e)}
+
+        return await self.submit(handle, data)
+
+    async def submit(self, handle: ModelHandle, data: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        queue = self.queues.setdefault(handle, [])
+        queue.append((data, future, time.perf_counter()))
+
+        if len(queue) >= self.max_batch_size:
+            self._flush(handle)
+        elif handle not in self.flush_handles:
+            self.flush_handles[handle] = loop.call_later(self.max_wait_ms / 1000, self._flush, handle)
+
+        return await future
+
+    def _flush(self, handle: ModelHandle):
+        timer = self.flush_handles.pop(handle, None)
+        if timer is not None:
+            timer.cancel()
+
+        queue = self.queues.pop(handle, [])
+        if not queue:
+            return
+
+        flushed_at = time.perf_counter()
+        self.batch_size_histogram.observe(len(queue))
+        for _, _, enqueued_at in queue:
+            self.queue_wait_histogram.observe((flushed_at - enqueued_at) * 1000)
+
+        if self.pool is None:
+            self._resolve(queue, self._safe_run_batch(handle, [item[0] for item in queue]))
+            return
+
+        task = asyncio.ensure_future(self._dispatch(handle, queue))
+        self._dispatch_tasks.add(task)
+        task.add_done_callback(self._dispatch_tasks.discard)
+
+    async def _dispatch(self, handle: ModelHandle, queue: List[Tuple[Dict[str, Any], asyncio.Future, float]]):
+        try:
+            results = await self.pool.run(self._safe_run_batch, handle, [item[0] for item in queue])
+        except Exception as e:
+            results = self._failed_results(len(queue), e)
+        self._resolve(queue, results)
+
+    def _resolve(self, queue: List[Tuple[Dict[str, Any], asyncio.Future, float]], results: List[Dict[str, Any]]):
+        for (_, future, _), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+
+    def _failed_results(self, count: int, error: Exception) -> List[Dict[str, Any]]:
+        logger.error("微批预测失败: %s", error)
+        return [{'success': False, 'message': f'预测失败: {str(error)}'}] * count
+
+    def _safe_run_batch(self, handle: ModelHandle, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        try:
+            return self._run_batch(handle, rows)
+        except Exception as e:
+            return self._failed_results(len(rows), e)
+
+    def _run_batch(self, handle: ModelHandle, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        result = handle.batch_predict(rows)
+        if not result['success']:
+            return [handle.predict(row) for row in rows]
+
+        probabilities = result['predictions_proba']
+        return [
+            {
+                'success': True,
+                'prediction': prediction,
+                'prediction_proba': probabilities[i] if probabilities else None,
+                'model_name': result['model_name'],
+                'batch_size': len(rows)
+            }
+            for i, prediction in enumerate(result['predictions'])
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'max_wait_ms': self.max_wait_ms,
+            'max_batch_size': self.max_batch_size,
+            'pending': sum(len(queue) for queue in self.queues.values()),
+            'batch_size': self.batch_size_histogram.snapshot(),
+            'queue_wait_ms': self.queue_wait_histogram.snapshot()
+        }
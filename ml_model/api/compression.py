@@ -0,0 +1,181 @@
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from utils.metrics import REGISTRY
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/msgpack",
+    "application/vnd.apache.arrow.stream",
+    "application/x-npy",
+    "text/"
+)
+
+COMPRESSED_BYTES = REGISTRY.counter(
+    "ml_http_compressed_bytes_total", "压缩响应的字节数（raw为压缩前, sent为压缩后）", ["encoding", "kind"]
+)
+
+
+def available_encodings() -> List[str]:
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str], available: Sequence[str]) -> str:
+    if not accept_encoding:
+        return "identity"
+
+    qualities: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        name, *params = part.strip().split(';')
+        quality = 1.0
+        for param in params:
+            key, _, number = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if name.strip():
+            qualities[name.strip().lower()] = quality
+
+    wildcard = qualities.get('*', 0.0)
+    candidates = [
+        (-qualities.get(encoding, wildcard), position, encoding)
+        for position, encoding in enumerate(available)
+    ]
+    candidates = [candidate for candidate in candidates if candidate[0] < 0]
+    return min(candidates)[2] if candidates else "identity"
+
+
+class _Compressor:
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + (self._brotli.finish() if final else self._brotli.flush())
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def compress_body(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    return _Compressor(encoding, gzip_level, brotli_quality).compress(body, final=True)
+
+
+class CompressionMiddleware:
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4,
+                 offload_size: Optional[int] = None, offload: Optional[Callable[..., Any]] = None,
+                 content_types: Sequence[str] = COMPRESSIBLE_TYPES):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+        self.offload = offload
+        self.content_types = tuple(content_types)
+        self.encodings = available_encodings()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressionResponder(self, encoding, send).send)
+
+    def compressible(self, message: Dict[str, Any]) -> bool:
+        headers = Headers(raw=message["headers"])
+        if message["status"] < 200 or message["status"] in (204, 206, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").lower().startswith(self.content_types)
+
+    async def compress(self, body: bytes, encoding: str) -> bytes:
+        if self.offload is not None and self.offload_size is not None and len(body) >= self.offload_size:
+            return await self.offload(compress_body, body, encoding, self.gzip_level, self.brotli_quality)
+        return compress_body(body, encoding, self.gzip_level, self.brotli_quality)
+
+
+class _CompressionResponder:
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self.start: Optional[Dict[str, Any]] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+        self.raw_bytes = 0
+        self.sent_bytes = 0
+
+    def _encoded_start(self, content_length: Optional[int]) -> Dict[str, Any]:
+        headers = MutableHeaders(raw=self.start["headers"])
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return self.start
+
+    def _record(self, raw: int, sent: int):
+        self.raw_bytes += raw
+        self.sent_bytes += sent
+
+    async def send(self, message: Dict[str, Any]):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressor is None:
+            if not self.middleware.compressible(self.start) or (not more_body and len(body) < self.middleware.minimum_size):
+                self.passthrough = True
+                await self._send(self.start)
+                await self._send(message)
+                return
+
+            if not more_body:
+                compressed = await self.middleware.compress(body, self.encoding)
+                await self._send(self._encoded_start(len(compressed)))
+                await self._send({"type": "http.response.body", "body": compressed})
+                self._finish(len(body), len(compressed))
+                return
+
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+            await self._send(self._encoded_start(None))
+
+        chunk = self.compressor.compress(body, final=not more_body)
+        self._record(len(body), len(chunk))
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            self._finish(0, 0)
+
+    def _finish(self, raw: int, sent: int):
+        self._record(raw, sent)
+        COMPRESSED_BYTES.inc(self.raw_bytes, encoding=self.encoding, kind="raw")
+        COMPRESSED_BYTES.inc(self.sent_bytes, encoding=self.encoding, kind="sent")
@@ -0,0 +1,141 @@
+import io
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+NPY_MEDIA_TYPE = "application/x-npy"
+
+MEDIA_TYPE_ALIASES = {
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    "application/octet-stream+npy": NPY_MEDIA_TYPE
+}
+
+BINARY_MEDIA_TYPES = (ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, NPY_MEDIA_TYPE)
+
+
+class EncodingUnavailable(Exception):
+    pass
+
+
+def media_type(header: Optional[str]) -> str:
+    if not header:
+        return JSON_MEDIA_TYPE
+    value = header.split(';', 1)[0].strip().lower()
+    return MEDIA_TYPE_ALIASES.get(value, value)
+
+
+def negotiate(accept: Optional[str]) -> str:
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    candidates = []
+    for position, part in enumerate(accept.split(',')):
+        value = media_type(part)
+        quality = 1.0
+        for param in part.split(';')[1:]:
+            key, _, number = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0 and (value in BINARY_MEDIA_TYPES or value == JSON_MEDIA_TYPE):
+            candidates.append((-quality, position, value))
+
+    return min(candidates)[2] if candidates else JSON_MEDIA_TYPE
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+    except ImportError:
+        raise EncodingUnavailable('Arrow编码需要安装pyarrow')
+    return pyarrow
+
+
+def _import_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise EncodingUnavailable('msgpack编码需要安装msgpack')
+    return msgpack
+
+
+def decode_frame(content_type: str, body: bytes, columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, Optional[str]]:
+    if content_type == ARROW_MEDIA_TYPE:
+        pa = _import_pyarrow()
+        table = pa.ipc.open_stream(body).read_all()
+        metadata = table.schema.metadata or {}
+        model_name = metadata.get(b'model_name')
+        return table.to_pandas(), model_name.decode('utf-8') if model_name else None
+
+    if content_type == MSGPACK_MEDIA_TYPE:
+        msgpack = _import_msgpack()
+        payload = msgpack.unpackb(body, raw=False)
+        if not isinstance(payload, dict) or not isinstance(payload.get('data'), dict):
+            raise ValueError('msgpack请求体应为 {"data": {列名: 列数组}} 结构')
+        return pd.DataFrame(payload['data']), payload.get('model_name')
+
+    if content_type == NPY_MEDIA_TYPE:
+        array = np.load(io.BytesIO(body), allow_pickle=False)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.ndim != 2:
+            raise ValueError(f'npy数组应为二维, 实际为{array.ndim}维')
+        if not columns:
+            raise ValueError('npy格式需要提供特征列名')
+        if len(columns) != array.shape[1]:
+            raise ValueError(f'npy数组有{array.shape[1]}列, 但提供了{len(columns)}个特征列名')
+        return pd.DataFrame(array, columns=columns, copy=False), None
+
+    raise EncodingUnavailable(f'不支持的请求格式: {content_type}')
+
+
+def _probability_columns(probabilities: Any) -> Dict[str, np.ndarray]:
+    if probabilities is None:
+        return {}
+    probabilities = np.asarray(probabilities)
+    return {f'proba_{i}': probabilities[:, i] for i in range(probabilities.shape[1])}
+
+
+def predictions_to_columns(predictions: Any, probabilities: Any = None) -> Dict[str, Any]:
+    data = {'prediction': np.asarray(predictions), **_probability_columns(probabilities)}
+    return {'columns': list(data), 'data': data}
+
+
+def encode_predictions(accept: str, result: Dict[str, Any]) -> bytes:
+    predictions = np.asarray(result['predictions'])
+    probabilities = result.get('predictions_proba')
+    model_name = result.get('model_name') or ''
+
+    if accept == ARROW_MEDIA_TYPE:
+        pa = _import_pyarrow()
+        columns = {'prediction': predictions, **_probability_columns(probabilities)}
+        table = pa.table(columns).replace_schema_metadata({'model_name': model_name})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    if accept == MSGPACK_MEDIA_TYPE:
+        msgpack = _import_msgpack()
+        return msgpack.packb({
+            'model_name': model_name,
+            'count': len(predictions),
+            'predictions': predictions.tolist(),
+            'predictions_proba': np.asarray(probabilities).tolist() if probabilities is not None else None
+        })
+
+    if accept == NPY_MEDIA_TYPE:
+        if predictions.dtype == object:
+            predictions = predictions.astype(str)
+        buffer = io.BytesIO()
+        np.save(buffer, predictions, allow_pickle=False)
+        return buffer.getvalue()
+
+    raise EncodingUnavailable(f'不支持的响应格式: {accept}')
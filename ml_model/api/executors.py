@@ -0,0 +1,125 @@
+import os
+import time
+import asyncio
+import threading
+import functools
+import contextvars
+import multiprocessing
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.metrics import Histogram
+
+POOL_WAIT_BUCKETS_MS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000]
+POOL_RUN_BUCKETS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000, 30000, 120000]
+
+
+def resolve_pool_size(workers: Optional[int], kind: str = "thread") -> int:
+    if workers is not None and workers > 0:
+        return workers
+    cpu_count = os.cpu_count() or 1
+    return min(32, cpu_count + 4) if kind == "thread" else cpu_count
+
+
+def _timed_call(func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    started = time.time()
+    return started, func(*args, **kwargs)
+
+
+class WorkerPool:
+
+    def __init__(self, name: str, max_workers: int, kind: str = "thread"):
+        if kind not in ("thread", "process"):
+            raise ValueError(f'不支持的执行池类型: {kind}')
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_histogram = Histogram(POOL_WAIT_BUCKETS_MS)
+        self.run_histogram = Histogram(POOL_RUN_BUCKETS_MS)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "thread":
+                        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+                    else:
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context("spawn")
+                        )
+        return self._executor
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        enqueued = time.time()
+        with self._lock:
+            self.submitted += 1
+
+        call = _timed_call if self.kind == "process" else functools.partial(contextvars.copy_context().run, _timed_call)
+        try:
+            inner = self._get_executor().submit(call, func, args, kwargs)
+        except Exception:
+            with self._lock:
+                self.submitted -= 1
+            raise
+
+        outer = Future()
+        inner.add_done_callback(functools.partial(self._finish, outer, enqueued))
+        return outer
+
+    def _finish(self, outer: Future, enqueued: float, inner: Future):
+        finished = time.time()
+        error = None if inner.cancelled() else inner.exception()
+
+        with self._lock:
+            self.completed += 1
+            if inner.cancelled() or error is not None:
+                self.failed += 1
+
+        if outer.cancelled():
+            return
+        if inner.cancelled():
+            outer.cancel()
+            outer.set_running_or_notify_cancel()
+            return
+        if error is not None:
+            outer.set_exception(error)
+            return
+
+        started, result = inner.result()
+        self.wait_histogram.observe(max(0.0, started - enqueued) * 1000)
+        self.run_histogram.observe(max(0.0, finished - started) * 1000)
+        outer.set_result(result)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        return await asyncio.wrap_future(self.submit(func, *args, **kwargs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self.submitted - self.completed
+            stats = {
+                'kind': self.kind,
+                'max_workers': self.max_workers,
+                'active': min(in_flight, self.max_workers),
+                'queued': max(0, in_flight - self.max_workers),
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed
+            }
+
+        stats['saturation'] = stats['active'] / self.max_workers
+        stats['queue_wait_ms'] = self.wait_histogram.snapshot()
+        stats['run_ms'] = self.run_histogram.snapshot()
+        return stats
+
+    def shutdown(self, wait: bool = False, cancel_futures: bool = True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
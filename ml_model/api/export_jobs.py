@@ -0,0 +1,152 @@
+import os
+import time
+import uuid
+import logging
+import threading
+from typing import Dict, List, Any, Optional, Union
+
+import pandas as pd
+
+from models.exporter import export_file_extension
+from api.executors import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+def process_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def remove_spool_file(path: str):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning("删除导出文件失败 %s: %s", path, e)
+
+
+class ExportJobManager:
+
+    def __init__(self, spool_dir: str, ttl: float = 3600.0, max_workers: int = 2, store=None):
+        self.spool_dir = spool_dir
+        self.ttl = ttl
+        self.store = store
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.pool = WorkerPool("export", max_workers)
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def spool_path(self, format: str) -> str:
+        return os.path.join(self.spool_dir, f"{uuid.uuid4().hex}.{export_file_extension(format)}")
+
+    def _save(self, job: Dict[str, Any]):
+        if self.store is not None:
+            self.store.put_job(job)
+
+    def submit(self, handle, data: Union[List[Dict[str, Any]], pd.DataFrame], format: str,
+               include_input: bool = True, source: Optional[str] = None) -> Dict[str, Any]:
+        self.cleanup()
+
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'status': 'pending',
+            'format': format,
+            'model_name': handle.model_name,
+            'rows': len(data),
+            'source': source,
+            'path': os.path.join(self.spool_dir, f"{job_id}.{export_file_extension(format)}"),
+            'filename': f"predictions.{export_file_extension(format)}",
+            'created_at': time.time(),
+            'finished_at': None,
+            'pid': os.getpid(),
+            'message': None
+        }
+        with self._lock:
+            self.jobs[job_id] = job
+        self._save(job)
+
+        self.pool.submit(self._run, job, handle, data, include_input)
+        return self.describe(job)
+
+    def _run(self, job: Dict[str, Any], handle, data, include_input: bool):
+        job['status'] = 'running'
+        self._save(job)
+        started = time.perf_counter()
+
+        try:
+            result = handle.export_predictions(data, job['path'], job['format'], include_input=include_input)
+        except Exception as e:
+            result = {'success': False, 'message': f'导出预测结果失败: {str(e)}'}
+
+        job['elapsed_ms'] = (time.perf_counter() - started) * 1000
+        if result['success']:
+            job['count'] = result['count']
+            job['size_bytes'] = os.path.getsize(job['path'])
+            job['message'] = f"导出完成: {result['count']} 行"
+            job['status'] = 'done'
+        else:
+            job['message'] = result['message']
+            job['status'] = 'failed'
+            remove_spool_file(job['path'])
+            logger.error("导出任务失败 %s: %s", job['job_id'], result['message'])
+        job['finished_at'] = time.time()
+        self._save(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        self.cleanup()
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None and self.store is not None:
+            job = self.store.get_job(job_id)
+            if job is not None and job['finished_at'] is None and not process_alive(job.get('pid')):
+                self._abandon(job, '导出任务所在的进程已退出')
+        return job
+
+    def _abandon(self, job: Dict[str, Any], message: str):
+        job['status'] = 'failed'
+        job['message'] = message
+        job['finished_at'] = time.time()
+        self._save(job)
+
+    def describe(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        info = {key: value for key, value in job.items() if key not in ('path', 'pid')}
+        info['status_url'] = f"/predict/export/{job['job_id']}"
+        if job['status'] == 'done':
+            info['download_url'] = f"/predict/export/{job['job_id']}/download"
+            info['expires_at'] = job['finished_at'] + self.ttl
+        return info
+
+    def cleanup(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [
+                job for job in self.jobs.values()
+                if job['finished_at'] is not None and now - job['finished_at'] > self.ttl
+            ]
+            for job in expired:
+                del self.jobs[job['job_id']]
+
+        if self.store is not None:
+            expired_ids = {job['job_id'] for job in expired}
+            expired += [job for job in self.store.expire_jobs(now - self.ttl) if job['job_id'] not in expired_ids]
+
+        for job in expired:
+            remove_spool_file(job['path'])
+        return len(expired)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            unfinished = [job for job in self.jobs.values() if job['finished_at'] is None]
+        for job in unfinished:
+            self._abandon(job, '服务关闭, 导出任务未完成')
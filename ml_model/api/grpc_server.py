@@ -0,0 +1,181 @@
+import time
+import uuid
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Callable, List, Optional, Tuple
+
+import grpc
+import numpy as np
+import pandas as pd
+
+from api.executors import WorkerPool
+from api.protos import inference_pb2, inference_pb2_grpc
+from models.model_handle import ModelHandle
+from utils.metrics import REGISTRY, REQUEST_BUCKETS_SECONDS, phase_timer
+from utils.profiling import valid_request_id
+from utils.logging_setup import set_request_id, reset_request_id
+
+logger = logging.getLogger(__name__)
+
+GRPC_REQUESTS = REGISTRY.counter("ml_grpc_requests_total", "gRPC调用数", ["method", "code"])
+GRPC_SECONDS = REGISTRY.histogram(
+    "ml_grpc_request_duration_seconds", "gRPC调用耗时（流式调用计到流结束为止）",
+    REQUEST_BUCKETS_SECONDS, ["method"]
+)
+
+
+def _as_float_array(values: Any) -> np.ndarray:
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        raise ValueError('gRPC接口只支持数值型预测结果')
+
+
+def batch_response(model_name: str, sequence: int, predictions: np.ndarray,
+                   probabilities: Optional[np.ndarray] = None) -> inference_pb2.BatchRes:
+    predictions = _as_float_array(predictions)
+    response = inference_pb2.BatchRes(
+        model_name=model_name,
+        sequence=sequence,
+        count=len(predictions),
+        predictions=predictions.tolist()
+    )
+    if probabilities is not None:
+        probabilities = _as_float_array(probabilities)
+        response.probabilities.extend(probabilities.ravel().tolist())
+        response.proba_columns = probabilities.shape[1]
+    return response
+
+
+class BatchStream:
+
+    def __init__(self, resolve_handle: Callable[[Optional[str]], ModelHandle]):
+        self.resolve_handle = resolve_handle
+        self.handle: Optional[ModelHandle] = None
+        self.feature_names: Optional[List[str]] = None
+        self.chunks = 0
+
+    def _bind(self, request: inference_pb2.BatchReq):
+        handle = self.resolve_handle(request.model_name or None)
+        feature_names = list(request.feature_names) or handle.feature_names
+        if not feature_names:
+            raise ValueError('请求未提供feature_names, 且模型没有记录特征顺序')
+        self.handle = handle
+        self.feature_names = feature_names
+
+    def predict(self, request: inference_pb2.BatchReq) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        if self.handle is None:
+            self._bind(request)
+        self.chunks += 1
+
+        values = np.asarray(request.values, dtype=np.float64)
+        n_features = len(self.feature_names)
+        if values.size % n_features:
+            raise ValueError(f'分块{request.sequence}有{values.size}个值, 不是特征数{n_features}的整数倍')
+        if values.size == 0:
+            return np.empty(0), None
+
+        df = pd.DataFrame(values.reshape(-1, n_features), columns=self.feature_names, copy=False)
+        result = self.handle.batch_predict(df, serialize=False)
+        if not result['success']:
+            raise ValueError(result['message'])
+        return result['predictions'], result['predictions_proba']
+
+    def predict_response(self, request: inference_pb2.BatchReq) -> inference_pb2.BatchRes:
+        predictions, probabilities = self.predict(request)
+        with phase_timer("serialize"):
+            return batch_response(self.handle.model_name, request.sequence, predictions, probabilities)
+
+    def merge_response(self, parts: List[Tuple[np.ndarray, Optional[np.ndarray]]]) -> inference_pb2.BatchRes:
+        if self.handle is None:
+            return inference_pb2.BatchRes()
+
+        predictions = np.concatenate([_as_float_array(part[0]) for part in parts])
+        probabilities = [part[1] for part in parts if part[1] is not None]
+        with phase_timer("serialize"):
+            return batch_response(
+                self.handle.model_name, self.chunks, predictions,
+                np.concatenate(probabilities) if probabilities else None
+            )
+
+
+class InferenceServicer(inference_pb2_grpc.InferenceServicer):
+
+    def __init__(self, resolve_handle: Callable[[Optional[str]], ModelHandle], pool: WorkerPool):
+        self.resolve_handle = resolve_handle
+        self.pool = pool
+
+    @asynccontextmanager
+    async def _call(self, method: str, context):
+        started = time.perf_counter()
+        request_id = dict(context.invocation_metadata() or ()).get("x-request-id", "")
+        if not valid_request_id(request_id):
+            request_id = uuid.uuid4().hex
+        request_token = set_request_id(request_id)
+        context.set_trailing_metadata((("x-request-id", request_id),))
+
+        code = grpc.StatusCode.OK
+        try:
+            yield
+        except asyncio.CancelledError:
+            code = grpc.StatusCode.CANCELLED
+            raise
+        except ValueError as e:
+            code = grpc.StatusCode.INVALID_ARGUMENT
+            await context.abort(code, str(e))
+        except Exception as e:
+            code = grpc.StatusCode.INTERNAL
+            logger.error("gRPC调用失败 %s: %s", method, e)
+            await context.abort(code, f"预测失败: {str(e)}")
+        finally:
+            GRPC_SECONDS.observe(time.perf_counter() - started, method=method)
+            GRPC_REQUESTS.inc(method=method, code=code.name)
+            reset_request_id(request_token)
+
+    def _predict_row(self, request: inference_pb2.PredictReq) -> inference_pb2.PredictRes:
+        handle = self.resolve_handle(request.model_name or None)
+        feature_names = list(request.feature_names) or handle.feature_names
+        if not feature_names:
+            raise ValueError('请求未提供feature_names, 且模型没有记录特征顺序')
+        if len(request.values) != len(feature_names):
+            raise ValueError(f'收到{len(request.values)}个特征值, 但有{len(feature_names)}个特征')
+
+        result = handle.predict(dict(zip(feature_names, request.values)))
+        if not result['success']:
+            raise ValueError(result['message'])
+
+        return inference_pb2.PredictRes(
+            model_name=result['model_name'],
+            prediction=float(_as_float_array(result['prediction'])),
+            probabilities=result.get('prediction_proba') or []
+        )
+
+    async def Predict(self, request, context):
+        async with self._call("Predict", context):
+            return await self.pool.run(self._predict_row, request)
+
+    async def PredictBatches(self, request_iterator, context):
+        async with self._call("PredictBatches", context):
+            stream = BatchStream(self.resolve_handle)
+            parts = []
+            async for request in request_iterator:
+                parts.append(await self.pool.run(stream.predict, request))
+            return await self.pool.run(stream.merge_response, parts)
+
+    async def StreamPredict(self, request_iterator, context):
+        async with self._call("StreamPredict", context):
+            stream = BatchStream(self.resolve_handle)
+            async for request in request_iterator:
+                yield await self.pool.run(stream.predict_response, request)
+
+
+def create_grpc_server(servicer: InferenceServicer, host: str = "0.0.0.0", port: int = 50051,
+                       max_message_bytes: int = 64 * 1024 * 1024) -> Tuple[grpc.aio.Server, int]:
+    server = grpc.aio.server(options=[
+        ("grpc.max_receive_message_length", max_message_bytes),
+        ("grpc.max_send_message_length", max_message_bytes)
+    ])
+    inference_pb2_grpc.add_InferenceServicer_to_server(servicer, server)
+    bound_port = server.add_insecure_port(f"{host}:{port}")
+    return server, bound_port
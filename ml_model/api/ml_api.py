@@ -1,27 +1,146 @@
 import os
 import json
+import time
+import uuid
+import random
+import asyncio
+import pickle
+import base64
 import tempfile
 import shutil
-from typing import Dict, List, Any, Optional
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, BackgroundTasks
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Optional, Union
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, BackgroundTasks, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from fastapi.responses import FileResponse, StreamingResponse, Response, JSONResponse, PlainTextResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, ValidationError
 import uvicorn
 import logging
+import pandas as pd
 
 from data.data_processor import DataProcessor
-from models.model_trainer import ModelTrainer
+from data.dataset_registry import DatasetRegistry, new_dataset_id
+from models.model_trainer import ModelTrainer, run_model_comparison
 from models.predictor import Predictor
-from utils.helpers import serialize_numpy_pandas
+from models.model_handle import ModelHandle
+from models.exporter import export_file_extension
+from api.batcher import MicroBatcher
+from api.executors import WorkerPool, resolve_pool_size
+from api.scheduler import TrainingScheduler, resolve_training_cores, resolve_worker_count
+from api.export_jobs import ExportJobManager, remove_spool_file
+from api.encodings import (
+    JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, NPY_MEDIA_TYPE, BINARY_MEDIA_TYPES,
+    EncodingUnavailable, media_type, negotiate, decode_frame, encode_predictions, predictions_to_columns
+)
+from api.compression import CompressionMiddleware
+from api.responses import NumpyJSONResponse, ORIENTS, records_to_columns
+from utils.state_store import StateStore
+from utils.metrics import REGISTRY, REQUEST_BUCKETS_SECONDS, phase_timer
+from utils.profiling import RequestProfiler, valid_request_id
+from utils.logging_setup import configure_logging, get_logging_stats, set_request_id, reset_request_id
+from config.settings import (
+    API_CONFIG, PREDICTION_CONFIG, DATA_CONFIG, EXECUTION_CONFIG, DATABASE_CONFIG, PROFILING_CONFIG, GRPC_CONFIG,
+    LOGGING_CONFIG, COMPRESSION_CONFIG
+)
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
+access_logger = logging.getLogger("api.access")
+
+def _restore_current_model():
+    current_model_name = state_store.get("current_model_name")
+    if current_model_name and current_model_name in predictor.available_models:
+        predictor.set_current_model(current_model_name)
+    else:
+        state_store.update({
+            "model_trained": True,
+            "current_model": predictor.current_model_name,
+            "current_model_name": predictor.current_model_name
+        })
+
+async def warmup_models():
+    started = time.perf_counter()
+    try:
+        if PREDICTION_CONFIG['warmup_enabled']:
+            result = await inference_pool.run(
+                predictor.warmup,
+                PREDICTION_CONFIG['warmup_models'] or None,
+                PREDICTION_CONFIG['warmup_top_n']
+            )
+            system_status["warmup"] = result
+            if result['loaded_count'] > 0:
+                await inference_pool.run(_restore_current_model)
+    except Exception as e:
+        logger.error("模型预热失败: %s", e)
+    finally:
+        system_status["ready"] = True
+        logger.info("启动预热阶段完成, 耗时 %.1fms", (time.perf_counter() - started) * 1000)
+
+async def cleanup_export_jobs():
+    while True:
+        await asyncio.sleep(PREDICTION_CONFIG['export_cleanup_interval'])
+        try:
+            removed = export_jobs.cleanup()
+            if removed:
+                logger.info("已清理过期导出文件: %s 个", removed)
+        except Exception as e:
+            logger.error("清理导出文件失败: %s", e)
+
+def _grpc_handle(model_name: Optional[str]) -> ModelHandle:
+    try:
+        return _resolve_handle(model_name)
+    except HTTPException as e:
+        raise ValueError(e.detail)
+
+async def start_grpc_server():
+    if not GRPC_CONFIG['enabled']:
+        return None
+    
+    try:
+        from api.grpc_server import InferenceServicer, create_grpc_server
+    except ImportError as e:
+        logger.error("gRPC服务未启动, 需要安装grpcio和protobuf: %s", e)
+        return None
+    
+    try:
+        server, port = create_grpc_server(
+            InferenceServicer(_grpc_handle, inference_pool),
+            GRPC_CONFIG['host'],
+            GRPC_CONFIG['port'],
+            GRPC_CONFIG['max_message_mb'] * 1024 * 1024
+        )
+        await server.start()
+    except Exception as e:
+        logger.error("gRPC服务启动失败: %s", e)
+        return None
+    
+    logger.info("gRPC服务已启动: %s:%s", GRPC_CONFIG['host'], port)
+    return server
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_task = asyncio.create_task(warmup_models())
+    cleanup_task = asyncio.create_task(cleanup_export_jobs())
+    grpc_server = await start_grpc_server()
+    yield
+    if grpc_server is not None:
+        await grpc_server.stop(GRPC_CONFIG['shutdown_grace'])
+    if not warmup_task.done():
+        warmup_task.cancel()
+    cleanup_task.cancel()
+    export_jobs.shutdown()
+    for pool in worker_pools.values():
+        pool.shutdown()
 
 app = FastAPI(
     title="机器学习数据分析与统计系统",
     description="基于机器学习的数据分析与统计系统API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=NumpyJSONResponse
 )
 
 app.add_middleware(
@@ -32,20 +151,211 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+state_store = StateStore.from_url(DATABASE_CONFIG['url'])
 data_processor = DataProcessor()
-model_trainer = ModelTrainer()
-predictor = Predictor()
+loaded_data = {"path": None}
+data_lock = threading.RLock()
+dataset_registry = DatasetRegistry(max_datasets=DATA_CONFIG['max_datasets'], store=state_store)
+model_trainer = ModelTrainer(name_sequence=state_store.next_sequence)
+predictor = Predictor(scan_on_init=False)
 
-system_status = {
+inference_pool = WorkerPool("inference", resolve_pool_size(EXECUTION_CONFIG['inference_workers']))
+training_pool = WorkerPool("training", resolve_pool_size(EXECUTION_CONFIG['training_workers']))
+training_process_pool = WorkerPool(
+    "training_process",
+    resolve_pool_size(EXECUTION_CONFIG['training_processes'], "process"),
+    kind="process"
+)
+worker_pools = {
+    "inference": inference_pool,
+    "training": training_pool,
+    "training_process": training_process_pool
+}
+
+if COMPRESSION_CONFIG['enabled']:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_CONFIG['minimum_size'],
+        gzip_level=COMPRESSION_CONFIG['gzip_level'],
+        brotli_quality=COMPRESSION_CONFIG['brotli_quality'],
+        offload_size=COMPRESSION_CONFIG['offload_size'],
+        offload=inference_pool.run
+    )
+
+training_scheduler = TrainingScheduler(
+    resolve_training_cores(
+        EXECUTION_CONFIG['total_cores'],
+        EXECUTION_CONFIG['inference_reserved_cores'],
+        resolve_worker_count(API_CONFIG['workers'])
+    ),
+    max_queued=EXECUTION_CONFIG['training_max_queued'],
+    max_job_cores=EXECUTION_CONFIG['training_max_job_cores']
+)
+
+micro_batcher = MicroBatcher(
+    predictor,
+    max_wait_ms=PREDICTION_CONFIG['batch_max_wait_ms'],
+    max_batch_size=PREDICTION_CONFIG['batch_max_size'],
+    pool=inference_pool
+) if PREDICTION_CONFIG['micro_batching'] else None
+
+SHARED_STATUS = {
     "data_uploaded": False,
     "model_trained": False,
     "current_step": "数据上传",
     "current_model": "线性回归模型（默认）",
-    "available_models": model_trainer.get_available_models()
+    "current_model_name": None
+}
+
+system_status = {
+    "available_models": model_trainer.get_available_models(),
+    "ready": False
 }
 
 temp_dir = tempfile.mkdtemp()
-current_data_file = None
+export_jobs = ExportJobManager(
+    PREDICTION_CONFIG['export_spool_dir'],
+    ttl=PREDICTION_CONFIG['export_job_ttl'],
+    max_workers=PREDICTION_CONFIG['export_job_workers'],
+    store=state_store
+)
+
+REQUESTS_TOTAL = REGISTRY.counter("ml_http_requests_total", "HTTP请求数", ["method", "route", "status"])
+REQUEST_ERRORS = REGISTRY.counter("ml_http_request_errors_total", "HTTP错误响应数（4xx为client, 5xx为server）", ["method", "route", "kind"])
+REQUEST_SECONDS = REGISTRY.histogram(
+    "ml_http_request_duration_seconds", "HTTP请求耗时（流式响应计到响应头发出为止）",
+    REQUEST_BUCKETS_SECONDS, ["method", "route"]
+)
+processor_memory = {"df_id": None, "bytes": 0}
+request_profiler = RequestProfiler(
+    PROFILING_CONFIG['output_dir'],
+    max_profiles=PROFILING_CONFIG['max_profiles'],
+    top_n=PROFILING_CONFIG['top_n']
+)
+in_flight = {"count": 0}
+
+def _cache_samples(key: str):
+    cache = predictor.prediction_cache
+    return cache.get_stats()[key] if cache is not None else None
+
+def _all_pool_stats() -> Dict[str, Dict[str, Any]]:
+    pools = {name: pool.get_stats() for name, pool in worker_pools.items()}
+    pools["export"] = export_jobs.pool.get_stats()
+    return pools
+
+def _pool_samples(key: str):
+    return [({"pool": name}, stats[key]) for name, stats in _all_pool_stats().items()]
+
+def _dataset_memory_samples():
+    df = data_processor.df
+    if df is None:
+        processor_memory.update({"df_id": None, "bytes": 0})
+    elif processor_memory["df_id"] != id(df):
+        processor_memory.update({"df_id": id(df), "bytes": int(df.memory_usage(deep=True).sum())})
+    return [
+        ({"scope": "registry"}, dataset_registry.memory_usage()),
+        ({"scope": "processor"}, processor_memory["bytes"])
+    ]
+
+REGISTRY.callback("ml_worker_info", "处理本次采集的工作进程", lambda: [({"pid": str(os.getpid())}, 1)])
+REGISTRY.callback("ml_prediction_cache_hits_total", "预测缓存命中行数", lambda: _cache_samples('hits'), kind="counter")
+REGISTRY.callback("ml_prediction_cache_misses_total", "预测缓存未命中行数", lambda: _cache_samples('misses'), kind="counter")
+REGISTRY.callback("ml_prediction_cache_hit_ratio", "预测缓存命中率", lambda: _cache_samples('hit_ratio'))
+REGISTRY.callback("ml_prediction_cache_entries", "预测缓存条目数", lambda: _cache_samples('entries'))
+REGISTRY.callback("ml_pool_active", "工作池正在执行的任务数", lambda: _pool_samples('active'))
+REGISTRY.callback("ml_pool_queued", "工作池排队中的任务数", lambda: _pool_samples('queued'))
+REGISTRY.callback("ml_pool_saturation", "工作池饱和度（活跃数/上限）", lambda: _pool_samples('saturation'))
+REGISTRY.callback("ml_training_cores_in_use", "训练任务占用的核数", lambda: training_scheduler.cores_in_use)
+REGISTRY.callback("ml_training_cores_capacity", "训练任务可用的核数上限", lambda: training_scheduler.capacity)
+REGISTRY.callback("ml_training_queued", "等待准入的训练任务数", lambda: len(training_scheduler.waiters))
+REGISTRY.callback("ml_training_rejected_total", "因队列已满被拒绝（429）的训练任务数", lambda: training_scheduler.rejected, kind="counter")
+REGISTRY.callback(
+    "ml_batcher_pending", "微批处理队列中等待的请求数",
+    lambda: micro_batcher.get_stats()['pending'] if micro_batcher is not None else None
+)
+REGISTRY.callback(
+    "ml_loaded_model_bytes", "已加载模型的大小（序列化字节数）",
+    lambda: [({"model": name}, size) for name, size in predictor.get_memory_usage().items()]
+)
+REGISTRY.callback("ml_dataset_memory_bytes", "内存中数据集占用的字节数", _dataset_memory_samples)
+REGISTRY.callback("ml_log_queue_depth", "等待写出的日志记录数", lambda: get_logging_stats()['queued'])
+REGISTRY.callback("ml_log_records_dropped_total", "日志队列已满而丢弃的记录数", lambda: get_logging_stats()['dropped'], kind="counter")
+REGISTRY.callback("ml_log_records_suppressed_total", "重复日志被采样丢弃的记录数", lambda: get_logging_stats()['suppressed'], kind="counter")
+
+def _profile_reason(request: Request) -> Optional[str]:
+    if not PROFILING_CONFIG['enabled']:
+        return None
+    
+    flag = request.headers.get(PROFILING_CONFIG['header']) or request.query_params.get(PROFILING_CONFIG['query_param'])
+    if flag:
+        token = PROFILING_CONFIG['token']
+        if token is None:
+            return "requested" if flag.lower() in ("1", "true", "yes") else None
+        return "requested" if flag == token else None
+    
+    sample_rate = PROFILING_CONFIG['sample_rate']
+    if sample_rate > 0 and not request.url.path.startswith(("/profiles", "/metrics")) and random.random() < sample_rate:
+        return "sampled"
+    return None
+
+def _stop_profile(session, status: int):
+    request_profiler.stop(session, status)
+    inference_pool.submit(request_profiler.save, session)
+
+async def _profiled_body(body_iterator, session, status: int):
+    try:
+        async for chunk in body_iterator:
+            yield chunk
+    finally:
+        _stop_profile(session, status)
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    started = time.perf_counter()
+    request_id = request.headers.get("X-Request-ID", "")
+    if not valid_request_id(request_id):
+        request_id = uuid.uuid4().hex
+    
+    request_token = set_request_id(request_id)
+    in_flight["count"] += 1
+    request_profiler.note_request()
+    reason = _profile_reason(request)
+    session = request_profiler.start(
+        request.method, request.url.path, reason, in_flight["count"] - 1, request_id=request_id
+    ) if reason else None
+    
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = request_id
+        if session is not None:
+            response.headers["X-Profile-ID"] = session.profile_id
+            response.body_iterator = _profiled_body(response.body_iterator, session, status)
+            session = None
+        elif reason:
+            response.headers["X-Profile-Status"] = "busy"
+        return response
+    finally:
+        in_flight["count"] -= 1
+        if session is not None:
+            _stop_profile(session, status)
+        route = request.scope.get("route")
+        labels = {"method": request.method, "route": route.path if route is not None else "unmatched"}
+        elapsed = time.perf_counter() - started
+        REQUEST_SECONDS.observe(elapsed, **labels)
+        REQUESTS_TOTAL.inc(status=status, **labels)
+        if status >= 400:
+            REQUEST_ERRORS.inc(kind="server" if status >= 500 else "client", **labels)
+        if LOGGING_CONFIG['access_log']:
+            access_logger.info(
+                "%s %s %s %.1fms", request.method, request.url.path, status, elapsed * 1000,
+                extra={**labels, "status": status, "duration_ms": elapsed * 1000}
+            )
+        reset_request_id(request_token)
+
+def _shared_status() -> Dict[str, Any]:
+    return {**SHARED_STATUS, **state_store.get_many(list(SHARED_STATUS))}
 
 class PredictionRequest(BaseModel):
     data: Dict[str, Any]
@@ -59,13 +369,26 @@ class ModelTrainRequest(BaseModel):
     test_size: float = 0.2
     tune_hyperparameters: bool = False
     return_model: bool = True
+    max_model_bytes: Optional[int] = None
+    max_latency_ms: Optional[float] = None
+
+class ModelCompactRequest(BaseModel):
+    model_name: str
+    max_model_bytes: Optional[int] = None
+    max_latency_ms: Optional[float] = None
+    test_size: float = 0.2
+
+class DatasetScoreRequest(BaseModel):
+    model_name: Optional[str] = None
+    format: str = PREDICTION_CONFIG['default_export_format']
+    include_input: bool = True
 
 class DataProcessRequest(BaseModel):
     handle_missing: str = "drop"
     target_column: Optional[str] = None
 
 class BatchPredictionRequest(BaseModel):
-    data: List[Dict[str, Any]]
+    data: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
     model_name: Optional[str] = None
     model_data: Optional[str] = None
     model_info_data: Optional[str] = None
@@ -76,6 +399,7 @@ class ExportPredictionsRequest(BaseModel):
     model_name: Optional[str] = None
     model_data: Optional[str] = None
     model_info_data: Optional[str] = None
+    background: Optional[bool] = None
 
 @app.get("/")
 async def root():
@@ -89,84 +413,246 @@ async def root():
 async def get_system_status():
     return {
         "success": True,
-        "status": system_status
+        "status": {**_shared_status(), **system_status, "worker_pid": os.getpid()}
     }
 
+@app.get("/system/ready")
+async def get_system_ready():
+    if not system_status["ready"]:
+        raise HTTPException(status_code=503, detail="模型预热中")
+    
+    return NumpyJSONResponse({
+        "success": True,
+        "ready": True,
+        "warmup": system_status.get("warmup")
+    })
+
+@app.get("/system/batching")
+async def get_batching_stats():
+    return {
+        "success": True,
+        "enabled": micro_batcher is not None,
+        "stats": micro_batcher.get_stats() if micro_batcher is not None else None
+    }
+
+@app.get("/system/cache")
+async def get_cache_stats():
+    cache = predictor.prediction_cache
+    return {
+        "success": True,
+        "enabled": cache is not None,
+        "stats": cache.get_stats() if cache is not None else None
+    }
+
+@app.get("/system/pools")
+async def get_pool_stats():
+    return {
+        "success": True,
+        "pools": _all_pool_stats(),
+        "training_scheduler": training_scheduler.get_stats()
+    }
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/profiles")
+async def list_profiles():
+    return {
+        "success": True,
+        "enabled": PROFILING_CONFIG['enabled'],
+        "profiles": await inference_pool.run(request_profiler.list_profiles)
+    }
+
+@app.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str):
+    profile = await inference_pool.run(request_profiler.get, profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"请求分析结果不存在: {profile_id}")
+    
+    return {
+        "success": True,
+        "profile": profile,
+        "download_url": f"/profiles/{profile_id}/download"
+    }
+
+@app.get("/profiles/{profile_id}/download")
+async def download_profile(profile_id: str):
+    path = request_profiler.stats_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"请求分析结果不存在: {profile_id}")
+    
+    return FileResponse(
+        path=path,
+        filename=f"{profile_id}.prof",
+        media_type='application/octet-stream'
+    )
+
+def _spool_upload(file: UploadFile, file_path: str):
+    with open(file_path, "wb") as buffer:
+        shutil.copyfileobj(file.file, buffer)
+
+def _load_upload(file: UploadFile) -> Dict[str, Any]:
+    dataset_id = new_dataset_id()
+    file_path = os.path.join(DATA_CONFIG['upload_dir'], dataset_id, os.path.basename(file.filename))
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    _spool_upload(file, file_path)
+    
+    with data_lock:
+        with phase_timer("csv_parse"):
+            result = data_processor.load_csv(file_path)
+        if not result['success']:
+            loaded_data["path"] = None
+            shutil.rmtree(os.path.dirname(file_path), ignore_errors=True)
+            return result
+        
+        loaded_data["path"] = file_path
+        result['dataset_id'] = dataset_registry.register(data_processor.df, file.filename, path=file_path, dataset_id=dataset_id)
+    state_store.update({
+        "data_uploaded": True,
+        "current_step": "模型训练",
+        "target_column": data_processor.target_column
+    })
+    return result
+
+def _sync_data_processor() -> bool:
+    dataset_id = state_store.get("current_dataset")
+    dataset = state_store.get_dataset(dataset_id) if dataset_id else None
+    if dataset is None or not os.path.exists(dataset['path']):
+        return False
+    
+    if loaded_data["path"] != dataset['path']:
+        with phase_timer("csv_parse"):
+            loaded = data_processor.load_csv(dataset['path'])['success']
+        if not loaded:
+            return False
+        loaded_data["path"] = dataset['path']
+    
+    target_column = state_store.get("target_column")
+    if target_column and target_column != data_processor.target_column:
+        data_processor.set_target_column(target_column)
+    return True
+
+def _require_data():
+    if not _sync_data_processor():
+        raise HTTPException(status_code=400, detail="没有上传的数据")
+
+def _preprocess(handle_missing: str = 'drop', target_column: Optional[str] = None):
+    with data_lock:
+        _require_data()
+        with phase_timer("preprocess"):
+            X, y = data_processor.preprocess_data(handle_missing=handle_missing, target_column=target_column)
+        target_column = data_processor.target_column
+    state_store.set("target_column", target_column)
+    return X, y
+
 @app.post("/data/upload")
 async def upload_data(file: UploadFile = File(...)):
-    global current_data_file
-    
     try:
         if not file.filename.endswith('.csv'):
             raise HTTPException(status_code=400, detail="只支持CSV文件")
         
-        file_path = os.path.join(temp_dir, file.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        current_data_file = file_path
-        
-        result = data_processor.load_csv(file_path)
+        result = await training_pool.run(_load_upload, file)
         
         if result['success']:
-            system_status["data_uploaded"] = True
-            system_status["current_step"] = "模型训练"
-            
-            return serialize_numpy_pandas(result)
+            return NumpyJSONResponse(result)
         else:
             raise HTTPException(status_code=400, detail=result['message'])
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"上传数据失败: {str(e)}")
+        logger.error("上传数据失败: %s", e)
         raise HTTPException(status_code=500, detail=f"上传数据失败: {str(e)}")
 
+@app.get("/datasets")
+async def list_datasets():
+    return {
+        "success": True,
+        "datasets": dataset_registry.list_datasets()
+    }
+
+@app.post("/datasets/{dataset_id}/score")
+async def score_dataset(dataset_id: str, request: DatasetScoreRequest):
+    try:
+        dataset = await inference_pool.run(dataset_registry.get, dataset_id)
+        if dataset is None:
+            raise HTTPException(status_code=404, detail=f"数据集不存在: {dataset_id}")
+        
+        if request.format not in PREDICTION_CONFIG['export_formats']:
+            raise HTTPException(status_code=400, detail=f"不支持的导出格式: {request.format}")
+        
+        handle = await inference_pool.run(_resolve_handle, request.model_name)
+        _, missing_features = handle.select_features(dataset['df'].head(0))
+        if missing_features:
+            raise HTTPException(status_code=400, detail=f"缺少特征: {missing_features}")
+        
+        job = export_jobs.submit(
+            handle, dataset['df'], request.format,
+            include_input=request.include_input,
+            source=dataset['dataset_id']
+        )
+        return JSONResponse(status_code=202, content={"success": True, **job})
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("数据集评分失败: %s", e)
+        raise HTTPException(status_code=500, detail=f"数据集评分失败: {str(e)}")
+
+def _check_orient(orient: str):
+    if orient not in ORIENTS:
+        raise HTTPException(status_code=400, detail=f"不支持的数据形状: {orient}, 可选 {list(ORIENTS)}")
+
+def _current_data(read, *args):
+    with data_lock:
+        _require_data()
+        return read(*args)
+
 @app.get("/data/info")
 async def get_data_info():
     try:
-        data_info = data_processor.get_data_info()
+        data_info = await inference_pool.run(_current_data, data_processor.get_data_info)
         
-        if not data_info['file_name']:
-            raise HTTPException(status_code=400, detail="没有上传的数据")
-        
-        return {
+        return NumpyJSONResponse({
             "success": True,
-            "data_info": serialize_numpy_pandas(data_info)
-        }
+            "data_info": data_info
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"获取数据信息失败: {str(e)}")
+        logger.error("获取数据信息失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取数据信息失败: {str(e)}")
 
 @app.get("/data/preview")
-async def get_data_preview(rows: int = 20):
+async def get_data_preview(rows: int = 20, orient: str = "records"):
     try:
-        preview = data_processor.get_data_preview(rows)
+        _check_orient(orient)
+        preview = await inference_pool.run(_current_data, data_processor.get_data_preview, rows)
         
         if not preview:
             raise HTTPException(status_code=400, detail="没有上传的数据")
         
-        return {
+        return NumpyJSONResponse({
             "success": True,
-            "preview": serialize_numpy_pandas(preview)
-        }
+            "preview": records_to_columns(preview) if orient == "columns" else preview
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"获取数据预览失败: {str(e)}")
+        logger.error("获取数据预览失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取数据预览失败: {str(e)}")
 
 @app.post("/data/process")
 async def process_data(request: DataProcessRequest):
     try:
-        if not system_status["data_uploaded"]:
+        if not state_store.get("data_uploaded", False):
             raise HTTPException(status_code=400, detail="没有上传的数据")
         
-        X, y = data_processor.preprocess_data(
+        X, y = await training_pool.run(
+            _preprocess,
             handle_missing=request.handle_missing,
             target_column=request.target_column
         )
@@ -176,24 +662,52 @@ async def process_data(request: DataProcessRequest):
             "message": "数据处理成功",
             "feature_count": len(X.columns),
             "sample_count": len(X),
-            "target_column": data_processor.get_data_info()['target_column']
+            "target_column": y.name
         }
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"数据处理失败: {str(e)}")
+        logger.error("数据处理失败: %s", e)
         raise HTTPException(status_code=500, detail=f"数据处理失败: {str(e)}")
 
+def _train(request: ModelTrainRequest, n_jobs: int = 1) -> Dict[str, Any]:
+    X, y = _preprocess(handle_missing='drop', target_column=request.target_column)
+    
+    result = model_trainer.train_model(
+        X=X,
+        y=y,
+        model_type=request.model_type,
+        test_size=request.test_size,
+        tune_hyperparameters=request.tune_hyperparameters,
+        return_model=True,
+        max_model_bytes=request.max_model_bytes,
+        max_latency_ms=request.max_latency_ms,
+        n_jobs=n_jobs
+    )
+    
+    if result['success']:
+        model_name = result['model_name']
+        
+        if result['model_path'].startswith("memory://"):
+            result['model_path'] = model_trainer.save_model(model_name, model_trainer.trained_models[model_name], result['model_info'])
+        state_store.add_model(model_name, {'model_type': request.model_type, 'model_path': result['model_path']})
+        state_store.update({
+            "model_trained": True,
+            "current_step": "预测",
+            "current_model": request.model_type,
+            "current_model_name": model_name
+        })
+        
+        predictor.refresh_models(force=True)
+        predictor.set_current_model(model_name)
+    
+    return result
+
 @app.post("/model/train")
 async def train_model(request: ModelTrainRequest, background_tasks: BackgroundTasks):
-    import tempfile
-    import os
-    import pickle
-    import base64
-    
     try:
-        if not system_status["data_uploaded"]:
+        if not state_store.get("data_uploaded", False):
             raise HTTPException(status_code=400, detail="没有上传的数据")
         
         if request.model_type not in model_trainer.get_available_models():
@@ -201,56 +715,24 @@ async def train_model(request: ModelTrainRequest, background_tasks: BackgroundTa
         
         try:
             os.makedirs(model_trainer.model_dir, exist_ok=True)
-            logger.info(f"模型保存目录已确认存在: {model_trainer.model_dir}")
+            logger.info("模型保存目录已确认存在: %s", model_trainer.model_dir)
         except Exception as e:
-            logger.error(f"创建模型保存目录失败: {str(e)}")
+            logger.error("创建模型保存目录失败: %s", e)
             raise HTTPException(status_code=500, detail=f"创建模型保存目录失败: {str(e)}")
         
-        X, y = data_processor.preprocess_data(
-            handle_missing='drop',
-            target_column=request.target_column
-        )
-        
-        result = model_trainer.train_model(
-            X=X,
-            y=y,
-            model_type=request.model_type,
-            test_size=request.test_size,
-            tune_hyperparameters=request.tune_hyperparameters,
-            return_model=True
-        )
+        cores = training_scheduler.max_job_cores if request.tune_hyperparameters else 1
+        async with training_scheduler.reserve(training_pool, cores) as n_jobs:
+            result = await training_pool.run(_train, request, n_jobs)
         
         if result['success']:
-            system_status["model_trained"] = True
-            system_status["current_step"] = "预测"
-            system_status["current_model"] = request.model_type
-            
-            model_name = result['model_name']
-            
-            if 'model_data' in result:
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.pkl') as temp_file:
-                    model_bytes = base64.b64decode(result['model_data'])
-                    temp_file.write(model_bytes)
-                    temp_file_path = temp_file.name
-                
-                try:
-                    predictor.load_model(temp_file_path)
-                    predictor.set_current_model(model_name)
-                finally:
-                    if os.path.exists(temp_file_path):
-                        os.unlink(temp_file_path)
-            else:
-                predictor.load_model(result['model_path'])
-                predictor.set_current_model(model_name)
-            
-            return serialize_numpy_pandas(result)
+            return NumpyJSONResponse(result)
         else:
             raise HTTPException(status_code=400, detail=result['message'])
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"模型训练失败: {str(e)}")
+        logger.error("模型训练失败: %s", e)
         raise HTTPException(status_code=500, detail=f"模型训练失败: {str(e)}")
 
 @app.get("/model/available")
@@ -264,293 +746,443 @@ async def get_available_models():
 async def get_trained_models():
     return {
         "success": True,
-        "models": model_trainer.get_trained_models()
+        "models": state_store.list_models()
     }
 
 @app.get("/model/metrics/{model_name}")
 async def get_model_metrics(model_name: str):
     try:
-        result = model_trainer.get_model_metrics(model_name)
+        result = await inference_pool.run(model_trainer.get_model_metrics, model_name)
         
         if not result['success']:
             raise HTTPException(status_code=404, detail=result['message'])
         
-        return serialize_numpy_pandas(result)
+        return NumpyJSONResponse(result)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"获取模型指标失败: {str(e)}")
+        logger.error("获取模型指标失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取模型指标失败: {str(e)}")
 
-@app.post("/model/compare")
-async def compare_models(test_size: float = 0.2):
+def _compact(request: ModelCompactRequest, target_column: Optional[str]) -> Dict[str, Any]:
+    X, y = _preprocess(handle_missing='drop', target_column=target_column)
+    
+    result = model_trainer.compact_model(
+        request.model_name,
+        X,
+        y,
+        test_size=request.test_size,
+        max_model_bytes=request.max_model_bytes,
+        max_latency_ms=request.max_latency_ms
+    )
+    if result['success']:
+        state_store.add_model(result['model_name'], {'compacted_from': request.model_name, 'model_path': result['model_path']})
+    return result
+
+@app.post("/model/compact")
+async def compact_model(request: ModelCompactRequest):
     try:
-        if not system_status["data_uploaded"]:
+        if not state_store.get("data_uploaded", False):
             raise HTTPException(status_code=400, detail="没有上传的数据")
         
-        X, y = data_processor.preprocess_data(handle_missing='drop')
+        if request.max_model_bytes is None and request.max_latency_ms is None:
+            raise HTTPException(status_code=400, detail="需要指定 max_model_bytes 或 max_latency_ms")
         
-        result = model_trainer.compare_models(X, y, test_size)
+        model_info = model_trainer.model_metrics.get(request.model_name) or model_trainer.load_model_info(request.model_name)
+        if model_info is None:
+            raise HTTPException(status_code=404, detail=f"模型 {request.model_name} 不存在")
+        
+        async with training_scheduler.reserve(training_pool):
+            result = await training_pool.run(_compact, request, model_info.get('target_name'))
         
         if result['success']:
-            return serialize_numpy_pandas(result)
+            return NumpyJSONResponse(result)
+        else:
+            raise HTTPException(status_code=400, detail=result['message'])
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("模型压缩失败: %s", e)
+        raise HTTPException(status_code=500, detail=f"模型压缩失败: {str(e)}")
+
+def _comparison_columns(result: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "success": True,
+        "best_model": result['best_model'],
+        "results": records_to_columns([
+            {"model": model_name, **metrics} for model_name, metrics in result['sorted_results']
+        ])
+    }
+
+@app.post("/model/compare")
+async def compare_models(test_size: float = 0.2, orient: str = "records"):
+    try:
+        _check_orient(orient)
+        if not state_store.get("data_uploaded", False):
+            raise HTTPException(status_code=400, detail="没有上传的数据")
+        
+        async with training_scheduler.reserve(training_process_pool):
+            X, y = await training_pool.run(_preprocess, handle_missing='drop')
+            result = await training_process_pool.run(run_model_comparison, X, y, test_size)
+        
+        if result['success']:
+            return NumpyJSONResponse(_comparison_columns(result) if orient == "columns" else result)
         else:
             raise HTTPException(status_code=400, detail="模型比较失败")
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"模型比较失败: {str(e)}")
+        logger.error("模型比较失败: %s", e)
         raise HTTPException(status_code=500, detail=f"模型比较失败: {str(e)}")
 
+def _request_model_info(request) -> Dict[str, Any]:
+    if request.model_info_data:
+        try:
+            return pickle.loads(base64.b64decode(request.model_info_data))
+        except Exception as e:
+            logger.error("加载模型信息失败: %s", e)
+    
+    if request.model_name and predictor.has_model(request.model_name):
+        return dict(predictor.available_models.get(request.model_name) or {})
+    
+    return {}
+
+def _resolve_handle(model_name: Optional[str]) -> ModelHandle:
+    status = state_store.get_many(["model_trained", "current_model_name"])
+    if not status.get("model_trained"):
+        raise HTTPException(status_code=400, detail="没有训练的模型")
+    
+    try:
+        if model_name and predictor.has_model(model_name):
+            return predictor.get_handle(model_name)
+        
+        current_model_name = status.get("current_model_name")
+        if current_model_name and current_model_name != predictor.current_model_name and predictor.has_model(current_model_name):
+            predictor.set_current_model(current_model_name)
+        return predictor.get_handle()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _request_handle(request) -> ModelHandle:
+    if request.model_data:
+        model = pickle.loads(base64.b64decode(request.model_data))
+        return ModelHandle(request.model_name or "temp_model", model, _request_model_info(request))
+    
+    return _resolve_handle(request.model_name)
+
+def _predict_request(request: PredictionRequest) -> Dict[str, Any]:
+    return _request_handle(request).predict(request.data)
+
 @app.post("/predict")
 async def predict(request: PredictionRequest):
     try:
-        if request.model_data:
-            import tempfile
-            import os
-            import pickle
-            import base64
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pkl') as temp_file:
-                model_bytes = base64.b64decode(request.model_data)
-                temp_file.write(model_bytes)
-                temp_file_path = temp_file.name
-            
-            try:
-                with open(temp_file_path, 'rb') as f:
-                    model = pickle.load(f)
-                
-                temp_predictor = Predictor()
-                temp_predictor.current_model = model
-                temp_predictor.current_model_name = request.model_name or "temp_model"
-                
-                if request.model_info_data:
-                    try:
-                        model_info_bytes = base64.b64decode(request.model_info_data)
-                        model_info = pickle.loads(model_info_bytes)
-                        temp_predictor.model_info = model_info
-                    except Exception as e:
-                        logger.error(f"加载模型信息失败: {str(e)}")
-                        if request.model_name:
-                            for model_name, model_info in model_trainer.model_metrics.items():
-                                if request.model_name in model_name or model_name in request.model_name:
-                                    temp_predictor.model_info = model_info
-                                    break
-                else:
-                    if request.model_name:
-                        for model_name, model_info in model_trainer.model_metrics.items():
-                            if request.model_name in model_name or model_name in request.model_name:
-                                temp_predictor.model_info = model_info
-                                break
-                
-                result = temp_predictor.predict(request.data)
-                
-                if result['success']:
-                    return serialize_numpy_pandas(result)
-                else:
-                    raise HTTPException(status_code=400, detail=result['message'])
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+        if micro_batcher is not None and not request.model_data:
+            handle = await inference_pool.run(_resolve_handle, request.model_name)
+            result = await micro_batcher.submit(handle, request.data)
         else:
-            if not system_status["model_trained"]:
-                raise HTTPException(status_code=400, detail="没有训练的模型")
-            
-            if request.model_name and request.model_name in predictor.get_available_models():
-                predictor.set_current_model(request.model_name)
-            
-            result = predictor.predict(request.data)
-            
-            if result['success']:
-                return serialize_numpy_pandas(result)
-            else:
-                raise HTTPException(status_code=400, detail=result['message'])
+            result = await inference_pool.run(_predict_request, request)
+        
+        if result['success']:
+            return NumpyJSONResponse(result)
+        else:
+            raise HTTPException(status_code=400, detail=result['message'])
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"预测失败: {str(e)}")
+        logger.error("预测失败: %s", e)
         raise HTTPException(status_code=500, detail=f"预测失败: {str(e)}")
 
-@app.post("/predict/batch")
-async def batch_predict(request: BatchPredictionRequest):
+BATCH_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        JSON_MEDIA_TYPE: {"schema": BatchPredictionRequest.model_json_schema()},
+        ARROW_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        MSGPACK_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        NPY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}
+    }
+}
+
+def _batch_response(result: Dict[str, Any], accept: str, orient: str = "records"):
+    if accept == JSON_MEDIA_TYPE:
+        if orient == "columns":
+            result = {
+                "success": True,
+                "model_name": result['model_name'],
+                "count": result['count'],
+                "predictions": predictions_to_columns(result['predictions'], result['predictions_proba'])
+            }
+        return NumpyJSONResponse(result)
+    
     try:
-        if request.model_data:
-            import tempfile
-            import os
-            import pickle
-            import base64
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pkl') as temp_file:
-                model_bytes = base64.b64decode(request.model_data)
-                temp_file.write(model_bytes)
-                temp_file_path = temp_file.name
-            
-            try:
-                with open(temp_file_path, 'rb') as f:
-                    model = pickle.load(f)
-                
-                temp_predictor = Predictor()
-                temp_predictor.current_model = model
-                temp_predictor.current_model_name = request.model_name or "temp_model"
-                
-                if request.model_info_data:
-                    try:
-                        model_info_bytes = base64.b64decode(request.model_info_data)
-                        model_info = pickle.loads(model_info_bytes)
-                        temp_predictor.model_info = model_info
-                    except Exception as e:
-                        logger.error(f"加载模型信息失败: {str(e)}")
-                        if request.model_name:
-                            for model_name, model_info in model_trainer.model_metrics.items():
-                                if request.model_name in model_name or model_name in request.model_name:
-                                    temp_predictor.model_info = model_info
-                                    break
-                else:
-                    if request.model_name:
-                        for model_name, model_info in model_trainer.model_metrics.items():
-                            if request.model_name in model_name or model_name in request.model_name:
-                                temp_predictor.model_info = model_info
-                                break
-                
-                result = temp_predictor.batch_predict(request.data)
-                
-                if result['success']:
-                    return serialize_numpy_pandas(result)
-                else:
-                    raise HTTPException(status_code=400, detail=result['message'])
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-        else:
-            if not system_status["model_trained"]:
-                raise HTTPException(status_code=400, detail="没有训练的模型")
-            
-            if request.model_name and request.model_name in predictor.get_available_models():
-                predictor.set_current_model(request.model_name)
-            
-            result = predictor.batch_predict(request.data)
-            
-            if result['success']:
-                return serialize_numpy_pandas(result)
-            else:
-                raise HTTPException(status_code=400, detail=result['message'])
-            
-    except HTTPException:
+        with phase_timer("serialize"):
+            content = encode_predictions(accept, result)
+    except EncodingUnavailable as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    
+    return Response(
+        content=content,
+        media_type=accept,
+        headers={
+            "X-Model-Name": str(result.get('model_name') or ''),
+            "X-Prediction-Count": str(result['count'])
+        }
+    )
+
+def _binary_batch_predict(body: bytes, content_type: str, accept: str,
+                          model_name: Optional[str], columns: Optional[str], orient: str):
+    handle = _resolve_handle(model_name)
+    
+    feature_names = [column.strip() for column in columns.split(',')] if columns else None
+    if content_type == NPY_MEDIA_TYPE and feature_names is None:
+        feature_names = handle.feature_names
+    
+    try:
+        df, body_model_name = decode_frame(content_type, body, feature_names)
+    except EncodingUnavailable as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"请求体解析失败: {str(e)}")
+    
+    if not model_name and body_model_name:
+        handle = _resolve_handle(body_model_name)
+    
+    result = handle.batch_predict(df, serialize=False)
+    
+    if result['success']:
+        return _batch_response(result, accept, orient)
+    else:
+        raise HTTPException(status_code=400, detail=result['message'])
+
+def _json_batch_predict(body: bytes, accept: str, orient: str):
+    try:
+        request = BatchPredictionRequest.model_validate_json(body)
+    except ValidationError as e:
+        errors = [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        raise RequestValidationError(errors, body=body)
+    
+    result = _request_handle(request).batch_predict(request.data, serialize=False)
+    
+    if result['success']:
+        return _batch_response(result, accept, orient)
+    else:
+        raise HTTPException(status_code=400, detail=result['message'])
+
+@app.post("/predict/batch", openapi_extra={"requestBody": BATCH_REQUEST_BODY})
+async def batch_predict(http_request: Request, model_name: Optional[str] = None, columns: Optional[str] = None,
+                        orient: str = "records"):
+    _check_orient(orient)
+    content_type = media_type(http_request.headers.get("content-type"))
+    accept = negotiate(http_request.headers.get("accept"))
+    body = await http_request.body()
+    
+    if content_type in BINARY_MEDIA_TYPES:
+        try:
+            return await inference_pool.run(_binary_batch_predict, body, content_type, accept, model_name, columns, orient)
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error("批量预测失败: %s", e)
+            raise HTTPException(status_code=500, detail=f"批量预测失败: {str(e)}")
+    
+    if content_type != JSON_MEDIA_TYPE:
+        raise HTTPException(status_code=415, detail=f"不支持的请求格式: {content_type}")
+    
+    try:
+        return await inference_pool.run(_json_batch_predict, body, accept, orient)
+    except (HTTPException, RequestValidationError):
         raise
     except Exception as e:
-        logger.error(f"批量预测失败: {str(e)}")
+        logger.error("批量预测失败: %s", e)
         raise HTTPException(status_code=500, detail=f"批量预测失败: {str(e)}")
 
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv"
+}
+
+def _stream_error_line(format: str, message: str) -> bytes:
+    if format == "csv":
+        return f"#error: {message}\n".encode('utf-8')
+    return (json.dumps({'error': message}, ensure_ascii=False) + '\n').encode('utf-8')
+
+def _stream_with_cleanup(stream, reader, cleanup_path: Optional[str], format: str = "ndjson"):
+    try:
+        yield from stream
+    except Exception as e:
+        logger.error("流式预测中断: %s", e)
+        yield _stream_error_line(format, f"流式预测中断: {str(e)}")
+    finally:
+        if reader is not None:
+            reader.close()
+        if cleanup_path and os.path.exists(cleanup_path):
+            os.unlink(cleanup_path)
+
+async def _iterate_in_pool(iterator):
+    try:
+        while True:
+            chunk = await inference_pool.run(next, iterator, None)
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        await inference_pool.run(iterator.close)
+
+@app.post("/predict/stream")
+async def stream_predict(
+    file: Optional[UploadFile] = File(None),
+    dataset: Optional[str] = Form(None),
+    model_name: Optional[str] = Form(None),
+    format: str = Form("ndjson"),
+    chunk_size: int = Form(PREDICTION_CONFIG['stream_chunk_size']),
+    include_input: bool = Form(False)
+):
+    cleanup_path = None
+    reader = None
+    entry = None
+    
+    try:
+        if format not in STREAM_MEDIA_TYPES:
+            raise HTTPException(status_code=400, detail=f"不支持的流式输出格式: {format}")
+        
+        handle = await inference_pool.run(_resolve_handle, model_name)
+        
+        if file is not None:
+            if not file.filename.endswith('.csv'):
+                raise HTTPException(status_code=400, detail="只支持CSV文件")
+            
+            fd, source_path = tempfile.mkstemp(suffix='.csv', dir=temp_dir)
+            os.close(fd)
+            cleanup_path = source_path
+            await inference_pool.run(_spool_upload, file, source_path)
+        elif dataset:
+            entry = await inference_pool.run(dataset_registry.get, dataset)
+        
+        if file is None and entry is None:
+            raise HTTPException(status_code=400, detail="需要上传CSV文件或指定数据集")
+        
+        chunk_size = max(1, chunk_size)
+        if entry is not None:
+            df = entry['df']
+            chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+        else:
+            reader = chunks = pd.read_csv(source_path, chunksize=chunk_size)
+        stream = handle.stream_predict(chunks, format, include_input)
+        
+        return StreamingResponse(
+            _iterate_in_pool(_stream_with_cleanup(stream, reader, cleanup_path, format)),
+            media_type=STREAM_MEDIA_TYPES[format]
+        )
+        
+    except Exception as e:
+        if reader is not None:
+            reader.close()
+        if cleanup_path and os.path.exists(cleanup_path):
+            os.unlink(cleanup_path)
+        
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, ValueError):
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        logger.error("流式预测失败: %s", e)
+        raise HTTPException(status_code=500, detail=f"流式预测失败: {str(e)}")
+
 @app.post("/predict/export")
 async def export_predictions(request: ExportPredictionsRequest):
     try:
-        if request.model_data:
-            import tempfile
-            import os
-            import pickle
-            import base64
-            
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pkl') as temp_file:
-                model_bytes = base64.b64decode(request.model_data)
-                temp_file.write(model_bytes)
-                temp_file_path = temp_file.name
-            
-            try:
-                with open(temp_file_path, 'rb') as f:
-                    model = pickle.load(f)
-                
-                temp_predictor = Predictor()
-                temp_predictor.current_model = model
-                temp_predictor.current_model_name = request.model_name or "temp_model"
-                
-                if request.model_info_data:
-                    try:
-                        model_info_bytes = base64.b64decode(request.model_info_data)
-                        model_info = pickle.loads(model_info_bytes)
-                        temp_predictor.model_info = model_info
-                    except Exception as e:
-                        logger.error(f"加载模型信息失败: {str(e)}")
-                        if request.model_name:
-                            for model_name, model_info in model_trainer.model_metrics.items():
-                                if request.model_name in model_name or model_name in request.model_name:
-                                    temp_predictor.model_info = model_info
-                                    break
-                else:
-                    if request.model_name:
-                        for model_name, model_info in model_trainer.model_metrics.items():
-                            if request.model_name in model_name or model_name in request.model_name:
-                                temp_predictor.model_info = model_info
-                                break
-                
-                output_filename = f"predictions.{request.format}"
-                output_path = os.path.join(temp_dir, output_filename)
-                
-                result = temp_predictor.export_predictions(request.data, output_path, request.format)
-                
-                if result['success']:
-                    return FileResponse(
-                        path=output_path,
-                        filename=output_filename,
-                        media_type='application/octet-stream'
-                    )
-                else:
-                    raise HTTPException(status_code=400, detail=result['message'])
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+        if request.format not in PREDICTION_CONFIG['export_formats']:
+            raise HTTPException(status_code=400, detail=f"不支持的导出格式: {request.format}")
+        
+        handle = await inference_pool.run(_request_handle, request)
+        
+        background = request.background
+        if background is None:
+            background = len(request.data) > PREDICTION_CONFIG['export_direct_max_rows']
+        
+        if background:
+            job = export_jobs.submit(handle, request.data, request.format)
+            return JSONResponse(status_code=202, content={"success": True, **job})
+        
+        output_path = export_jobs.spool_path(request.format)
+        result = await inference_pool.run(handle.export_predictions, request.data, output_path, request.format)
+        
+        if result['success']:
+            return FileResponse(
+                path=output_path,
+                filename=f"predictions.{export_file_extension(request.format)}",
+                media_type='application/octet-stream',
+                background=BackgroundTask(remove_spool_file, output_path)
+            )
         else:
-            if not system_status["model_trained"]:
-                raise HTTPException(status_code=400, detail="没有训练的模型")
-            
-            if request.model_name and request.model_name in predictor.get_available_models():
-                predictor.set_current_model(request.model_name)
-            
-            output_filename = f"predictions.{request.format}"
-            output_path = os.path.join(temp_dir, output_filename)
-            
-            result = predictor.export_predictions(request.data, output_path, request.format)
-            
-            if result['success']:
-                return FileResponse(
-                    path=output_path,
-                    filename=output_filename,
-                    media_type='application/octet-stream'
-                )
-            else:
-                raise HTTPException(status_code=400, detail=result['message'])
+            remove_spool_file(output_path)
+            raise HTTPException(status_code=400, detail=result['message'])
             
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"导出预测结果失败: {str(e)}")
+        logger.error("导出预测结果失败: %s", e)
         raise HTTPException(status_code=500, detail=f"导出预测结果失败: {str(e)}")
 
+@app.get("/predict/export/{job_id}")
+async def get_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"导出任务不存在或已过期: {job_id}")
+    
+    return {"success": True, **export_jobs.describe(job)}
+
+@app.get("/predict/export/{job_id}/download")
+async def download_export_job(job_id: str):
+    job = export_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"导出任务不存在或已过期: {job_id}")
+    
+    if job['status'] == 'failed':
+        raise HTTPException(status_code=400, detail=job['message'])
+    if job['status'] != 'done':
+        raise HTTPException(status_code=409, detail=f"导出任务尚未完成: {job['status']}")
+    
+    return FileResponse(
+        path=job['path'],
+        filename=job['filename'],
+        media_type='application/octet-stream'
+    )
+
 @app.get("/model/info")
 async def get_model_info(model_name: Optional[str] = None):
     try:
-        result = predictor.get_model_info(model_name)
+        result = await inference_pool.run(predictor.get_model_info, model_name)
         
         if not result['success']:
             raise HTTPException(status_code=404, detail=result['message'])
         
-        return serialize_numpy_pandas(result)
+        return NumpyJSONResponse(result)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"获取模型信息失败: {str(e)}")
+        logger.error("获取模型信息失败: %s", e)
         raise HTTPException(status_code=500, detail=f"获取模型信息失败: {str(e)}")
 
-def run_api(host: str = "0.0.0.0", port: int = 8000, debug: bool = False):
+def run_api(host: str = "0.0.0.0", port: int = 8000, debug: bool = False, workers: int = 1):
+    if debug and workers > 1:
+        logger.warning("调试模式下自动重载不支持多进程, 将只启动1个工作进程")
+        workers = 1
+    
+    os.environ['WEB_CONCURRENCY'] = str(workers)
     uvicorn.run(
         "api.ml_api:app",
         host=host,
         port=port,
         reload=debug,
-        log_level="info"
+        workers=workers,
+        log_level="info",
+        log_config=None,
+        access_log=False
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# NO CHECKED-IN PROTOBUF GENCODE
+# source: api/protos/inference.proto
+# Protobuf Python Version: 7.35.1
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import runtime_version as _runtime_version
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+_runtime_version.ValidateProtobufRuntimeVersion(
+    _runtime_version.Domain.PUBLIC,
+    7,
+    35,
+    1,
+    '',
+    'api/protos/inference.proto'
+)
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1a\x61pi/protos/inference.proto\x12\nmlModel.v1\"G\n\nPredictReq\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x15\n\rfeature_names\x18\x02 \x03(\t\x12\x0e\n\x06values\x18\x03 \x03(\x01\"K\n\nPredictRes\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x12\n\nprediction\x18\x02 \x01(\x01\x12\x15\n\rprobabilities\x18\x03 \x03(\x01\"W\n\x08\x42\x61tchReq\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x15\n\rfeature_names\x18\x02 \x03(\t\x12\x0e\n\x06values\x18\x03 \x03(\x01\x12\x10\n\x08sequence\x18\x04 \x01(\x04\"\x82\x01\n\x08\x42\x61tchRes\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x10\n\x08sequence\x18\x02 \x01(\x04\x12\r\n\x05\x63ount\x18\x03 \x01(\r\x12\x13\n\x0bpredictions\x18\x04 \x03(\x01\x12\x15\n\rprobabilities\x18\x05 \x03(\x01\x12\x15\n\rproba_columns\x18\x06 \x01(\r2\xc7\x01\n\tInference\x12\x39\n\x07Predict\x12\x16.mlModel.v1.PredictReq\x1a\x16.mlModel.v1.PredictRes\x12>\n\x0ePredictBatches\x12\x14.mlModel.v1.BatchReq\x1a\x14.mlModel.v1.BatchRes(\x01\x12?\n\rStreamPredict\x12\x14.mlModel.v1.BatchReq\x1a\x14.mlModel.v1.BatchRes(\x01\x30\x01\x42\x15Z\x13\x61pi/grpc/mlModel/v1b\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'api.protos.inference_pb2', _globals)
+if not _descriptor._USE_C_DESCRIPTORS:
+  _globals['DESCRIPTOR']._loaded_options = None
+  _globals['DESCRIPTOR']._serialized_options = b'Z\023api/grpc/mlModel/v1'
+  _globals['_PREDICTREQ']._serialized_start=42
+  _globals['_PREDICTREQ']._serialized_end=113
+  _globals['_PREDICTRES']._serialized_start=115
+  _globals['_PREDICTRES']._serialized_end=190
+  _globals['_BATCHREQ']._serialized_start=192
+  _globals['_BATCHREQ']._serialized_end=279
+  _globals['_BATCHRES']._serialized_start=282
+  _globals['_BATCHRES']._serialized_end=412
+  _globals['_INFERENCE']._serialized_start=415
+  _globals['_INFERENCE']._serialized_end=614
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,189 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+import warnings
+
+from api.protos import inference_pb2 as api_dot_protos_dot_inference__pb2
+
+GRPC_GENERATED_VERSION = '1.84.0'
+GRPC_VERSION = grpc.__version__
+_version_not_supported = False
+
+try:
+    from grpc._utilities import first_version_is_lower
+    _version_not_supported = first_version_is_lower(GRPC_VERSION, GRPC_GENERATED_VERSION)
+except ImportError:
+    _version_not_supported = True
+
+if _version_not_supported:
+    raise RuntimeError(
+        f'The grpc package installed is at version {GRPC_VERSION},'
+        + ' but the generated code in api/protos/inference_pb2_grpc.py depends on'
+        + f' grpcio>={GRPC_GENERATED_VERSION}.'
+        + f' Please upgrade your grpc module to grpcio>={GRPC_GENERATED_VERSION}'
+        + f' or downgrade your generated code using grpcio-tools<={GRPC_VERSION}.'
+    )
+
+
+class InferenceStub:
+    """与HTTP接口共用同一个Predictor加载的模型
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.Predict = channel.unary_unary(
+                '/mlModel.v1.Inference/Predict',
+                request_serializer=api_dot_protos_dot_inference__pb2.PredictReq.SerializeToString,
+                response_deserializer=api_dot_protos_dot_inference__pb2.PredictRes.FromString,
+                _registered_method=True)
+        self.PredictBatches = channel.stream_unary(
+                '/mlModel.v1.Inference/PredictBatches',
+                request_serializer=api_dot_protos_dot_inference__pb2.BatchReq.SerializeToString,
+                response_deserializer=api_dot_protos_dot_inference__pb2.BatchRes.FromString,
+                _registered_method=True)
+        self.StreamPredict = channel.stream_stream(
+                '/mlModel.v1.Inference/StreamPredict',
+                request_serializer=api_dot_protos_dot_inference__pb2.BatchReq.SerializeToString,
+                response_deserializer=api_dot_protos_dot_inference__pb2.BatchRes.FromString,
+                _registered_method=True)
+
+
+class InferenceServicer:
+    """与HTTP接口共用同一个Predictor加载的模型
+    """
+
+    def Predict(self, request, context):
+        """单行预测
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PredictBatches(self, request_iterator, context):
+        """客户端流: 分块上传, 全部结束后一次返回所有预测
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamPredict(self, request_iterator, context):
+        """双向流: 每收到一个分块返回一个对应的预测分块
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_InferenceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'Predict': grpc.unary_unary_rpc_method_handler(
+                    servicer.Predict,
+                    request_deserializer=api_dot_protos_dot_inference__pb2.PredictReq.FromString,
+                    response_serializer=api_dot_protos_dot_inference__pb2.PredictRes.SerializeToString,
+            ),
+            'PredictBatches': grpc.stream_unary_rpc_method_handler(
+                    servicer.PredictBatches,
+                    request_deserializer=api_dot_protos_dot_inference__pb2.BatchReq.FromString,
+                    response_serializer=api_dot_protos_dot_inference__pb2.BatchRes.SerializeToString,
+            ),
+            'StreamPredict': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamPredict,
+                    request_deserializer=api_dot_protos_dot_inference__pb2.BatchReq.FromString,
+                    response_serializer=api_dot_protos_dot_inference__pb2.BatchRes.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'mlModel.v1.Inference', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('mlModel.v1.Inference', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Inference:
+    """与HTTP接口共用同一个Predictor加载的模型
+    """
+
+    @staticmethod
+    def Predict(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/mlModel.v1.Inference/Predict',
+            api_dot_protos_dot_inference__pb2.PredictReq.SerializeToString,
+            api_dot_protos_dot_inference__pb2.PredictRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PredictBatches(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/mlModel.v1.Inference/PredictBatches',
+            api_dot_protos_dot_inference__pb2.BatchReq.SerializeToString,
+            api_dot_protos_dot_inference__pb2.BatchRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StreamPredict(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/mlModel.v1.Inference/StreamPredict',
+            api_dot_protos_dot_inference__pb2.BatchReq.SerializeToString,
+            api_dot_protos_dot_inference__pb2.BatchRes.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,94 @@
+import json
+import math
+import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+from utils.metrics import phase_timer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+ORIENTS = ("records", "columns")
+
+
+def encode_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.bool_):
+        return bool(obj)
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        return obj.to_dict()
+    if isinstance(obj, (pd.Timestamp, datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, (pd.Timedelta, np.dtype)):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'dtype'):
+        return str(obj)
+    raise TypeError(f'无法序列化为JSON的类型: {type(obj).__name__}')
+
+
+def records_to_columns(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    columns = list(dict.fromkeys(key for record in records for key in record))
+    return {
+        'columns': columns,
+        'data': {column: [record.get(column) for record in records] for column in columns}
+    }
+
+
+def finite_or_none(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {key: finite_or_none(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [finite_or_none(value) for value in obj]
+    if isinstance(obj, np.ndarray) and obj.dtype.kind == 'f':
+        return np.where(np.isfinite(obj), obj, None).tolist()
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        return finite_or_none(encode_default(obj))
+    if isinstance(obj, (float, np.floating)) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        default=encode_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=encode_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+
+    try:
+        return _stdlib_dumps(content)
+    except ValueError:
+        return _stdlib_dumps(finite_or_none(content))
+
+
+class NumpyJSONResponse(JSONResponse):
+
+    def render(self, content: Any) -> bytes:
+        with phase_timer("serialize"):
+            return dumps(content)
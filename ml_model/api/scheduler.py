@@ -0,0 +1,135 @@
+import os
+import math
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, AsyncIterator, Optional
+
+from fastapi import HTTPException
+
+from api.executors import WorkerPool
+
+DEFAULT_JOB_SECONDS = 10.0
+DURATION_SMOOTHING = 0.2
+MAX_RETRY_AFTER = 3600
+
+
+class AdmissionRejected(HTTPException):
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(status_code=429, detail=message, headers={"Retry-After": str(retry_after)})
+        self.retry_after = retry_after
+
+
+def resolve_worker_count(configured: int = 1) -> int:
+    try:
+        return max(1, int(os.environ.get('WEB_CONCURRENCY', configured)))
+    except ValueError:
+        return max(1, configured)
+
+
+def resolve_training_cores(total_cores: Optional[int], reserved_cores: int, workers: int = 1) -> int:
+    total_cores = total_cores if total_cores is not None and total_cores > 0 else (os.cpu_count() or 1)
+    return max(1, total_cores // max(1, workers) - max(0, reserved_cores))
+
+
+class _Waiter:
+
+    def __init__(self, pool: WorkerPool, cores: int, future: asyncio.Future):
+        self.pool = pool
+        self.cores = cores
+        self.future = future
+
+
+class TrainingScheduler:
+
+    def __init__(self, capacity: int, max_queued: int = 4, max_job_cores: Optional[int] = None):
+        self.capacity = capacity
+        self.max_job_cores = min(max_job_cores, capacity) if max_job_cores else capacity
+        self.max_queued = max_queued
+        self.cores_in_use = 0
+        self.running: Dict[str, int] = {}
+        self.waiters: deque = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.avg_job_seconds: Optional[float] = None
+
+    def _can_start(self, pool: WorkerPool) -> bool:
+        return self.cores_in_use < self.capacity and self.running.get(pool.name, 0) < pool.max_workers
+
+    def _queued_for(self, pool: WorkerPool) -> bool:
+        return any(waiter.pool.name == pool.name for waiter in self.waiters)
+
+    def _grant(self, pool: WorkerPool, cores: int) -> int:
+        granted = max(1, min(cores, self.max_job_cores, self.capacity - self.cores_in_use))
+        self.cores_in_use += granted
+        self.running[pool.name] = self.running.get(pool.name, 0) + 1
+        return granted
+
+    def _release(self, pool: WorkerPool, granted: int, elapsed: Optional[float]):
+        self.cores_in_use -= granted
+        self.running[pool.name] -= 1
+        if elapsed is not None:
+            previous = self.avg_job_seconds
+            self.avg_job_seconds = elapsed if previous is None else previous + DURATION_SMOOTHING * (elapsed - previous)
+        self._wake()
+
+    def _wake(self):
+        for waiter in list(self.waiters):
+            if self.cores_in_use >= self.capacity:
+                break
+            if waiter.future.done() or not self._can_start(waiter.pool):
+                continue
+            self.waiters.remove(waiter)
+            waiter.future.set_result(self._grant(waiter.pool, waiter.cores))
+
+    def retry_after(self) -> int:
+        job_seconds = self.avg_job_seconds if self.avg_job_seconds is not None else DEFAULT_JOB_SECONDS
+        running = max(1, sum(self.running.values()))
+        estimate = job_seconds * (len(self.waiters) + running) / running
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(estimate)))
+
+    @asynccontextmanager
+    async def reserve(self, pool: WorkerPool, cores: int = 1) -> AsyncIterator[int]:
+        if self._can_start(pool) and not self._queued_for(pool):
+            granted = self._grant(pool, cores)
+        else:
+            if len(self.waiters) >= self.max_queued:
+                self.rejected += 1
+                raise AdmissionRejected(
+                    f'训练任务队列已满（{len(self.waiters)}/{self.max_queued}），请稍后重试',
+                    self.retry_after()
+                )
+
+            waiter = _Waiter(pool, cores, asyncio.get_running_loop().create_future())
+            self.waiters.append(waiter)
+            try:
+                granted = await waiter.future
+            except asyncio.CancelledError:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    self._release(pool, waiter.future.result(), None)
+                raise
+
+        self.admitted += 1
+        started = time.perf_counter()
+        try:
+            yield granted
+        finally:
+            self._release(pool, granted, time.perf_counter() - started)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'capacity': self.capacity,
+            'max_job_cores': self.max_job_cores,
+            'cores_in_use': self.cores_in_use,
+            'running': dict(self.running),
+            'queued': len(self.waiters),
+            'max_queued': self.max_queued,
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'avg_job_seconds': self.avg_job_seconds,
+            'retry_after': self.retry_after()
+        }
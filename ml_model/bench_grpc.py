@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import json
+import pickle
+import argparse
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+import httpx
+import grpc
+import uvicorn
+from sklearn.linear_model import Ridge
+
+from api.protos import inference_pb2, inference_pb2_grpc
+from config.settings import GRPC_CONFIG, PREDICTION_CONFIG
+
+MODEL_NAME = "ridge_1"
+
+
+def make_data(rows: int, features: int):
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"feature{i}" for i in range(features)])
+    y = pd.Series(X.to_numpy() @ rng.normal(size=features) + rng.normal(0, 0.1, rows), name='target')
+    return X, y
+
+
+def save_model(features: int):
+    X, y = make_data(2000, features)
+    os.makedirs("saved_models", exist_ok=True)
+    with open(os.path.join("saved_models", f"{MODEL_NAME}.pkl"), 'wb') as f:
+        pickle.dump(Ridge().fit(X, y), f)
+    with open(os.path.join("saved_models", f"{MODEL_NAME}_info.json"), 'w') as f:
+        json.dump({'feature_names': list(X.columns), 'target_name': 'target'}, f)
+
+
+def start_servers(http_port: int, grpc_port: int):
+    GRPC_CONFIG.update({"enabled": True, "host": "127.0.0.1", "port": grpc_port})
+    PREDICTION_CONFIG.update({"warmup_models": [MODEL_NAME]})
+
+    from api import ml_api
+    ml_api.state_store.update({"model_trained": True, "current_model_name": MODEL_NAME})
+
+    server = uvicorn.Server(uvicorn.Config(ml_api.app, host="127.0.0.1", port=http_port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    while not ml_api.system_status["ready"]:
+        time.sleep(0.05)
+    return server, thread
+
+
+def latency_stats(timings):
+    timings = np.asarray(timings) * 1000
+    return np.median(timings), np.percentile(timings, 99)
+
+
+def bench_single_row(http_port: int, grpc_port: int, row: dict, requests: int, concurrency: int):
+    values = list(row.values())
+    local = threading.local()
+
+    def http_call():
+        client = getattr(local, 'http', None)
+        if client is None:
+            client = local.http = httpx.Client(base_url=f"http://127.0.0.1:{http_port}")
+        response = client.post("/predict", json={"data": row, "model_name": MODEL_NAME})
+        response.raise_for_status()
+        return response.json()['prediction']
+
+    channel = grpc.insecure_channel(f"127.0.0.1:{grpc_port}")
+    stub = inference_pb2_grpc.InferenceStub(channel)
+    request = inference_pb2.PredictReq(model_name=MODEL_NAME, values=values)
+
+    def grpc_call():
+        return stub.Predict(request).prediction
+
+    assert abs(http_call() - grpc_call()) < 1e-9
+
+    print(f"\n单条预测（{requests}次请求）")
+    print(f"{'协议':<10}{'p50':>10}{'p99':>10}{'串行吞吐':>14}{f'{concurrency}并发吞吐':>16}")
+    for name, call in (("HTTP JSON", http_call), ("gRPC", grpc_call)):
+        for _ in range(50):
+            call()
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+        p50, p99 = latency_stats(timings)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            started = time.perf_counter()
+            list(executor.map(lambda _: call(), range(requests)))
+            concurrent_elapsed = time.perf_counter() - started
+
+        print(f"{name:<10}{p50:>8.2f}ms{p99:>8.2f}ms{requests / sum(timings):>11.0f}/s{requests / concurrent_elapsed:>13.0f}/s")
+
+    channel.close()
+
+
+def bench_batch(http_port: int, grpc_port: int, X: pd.DataFrame, chunk_rows: int, repeats: int):
+    records = X.to_dict(orient='records')
+    feature_names = list(X.columns)
+    matrix = X.to_numpy()
+    channel = grpc.insecure_channel(
+        f"127.0.0.1:{grpc_port}",
+        options=[("grpc.max_receive_message_length", GRPC_CONFIG['max_message_mb'] * 1024 * 1024)]
+    )
+    stub = inference_pb2_grpc.InferenceStub(channel)
+    http = httpx.Client(base_url=f"http://127.0.0.1:{http_port}", timeout=300)
+
+    def chunks():
+        for sequence, start in enumerate(range(0, len(matrix), chunk_rows)):
+            yield inference_pb2.BatchReq(
+                model_name=MODEL_NAME if sequence == 0 else "",
+                feature_names=feature_names if sequence == 0 else [],
+                values=matrix[start:start + chunk_rows].ravel().tolist(),
+                sequence=sequence
+            )
+
+    def http_batch():
+        response = http.post("/predict/batch", json={"data": records, "model_name": MODEL_NAME})
+        response.raise_for_status()
+        return np.asarray(response.json()['predictions'])
+
+    def client_stream():
+        return np.asarray(stub.PredictBatches(chunks()).predictions)
+
+    def bidi_stream():
+        return np.concatenate([np.asarray(reply.predictions) for reply in stub.StreamPredict(chunks())])
+
+    expected = http_batch()
+    request_bytes = len(json.dumps({"data": records, "model_name": MODEL_NAME}).encode())
+    grpc_bytes = sum(chunk.ByteSize() for chunk in chunks())
+
+    print(f"\n批量预测（{len(X)}行 x {len(feature_names)}特征, gRPC分块{chunk_rows}行）")
+    print(f"请求体大小: HTTP JSON {request_bytes / 1e6:.1f}MB, gRPC {grpc_bytes / 1e6:.1f}MB")
+    print(f"{'方式':<16}{'耗时':>10}{'吞吐':>16}")
+    for name, call in (("HTTP JSON", http_batch), ("gRPC客户端流", client_stream), ("gRPC双向流", bidi_stream)):
+        np.testing.assert_allclose(call(), expected)
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+        elapsed = float(np.median(timings))
+        print(f"{name:<16}{elapsed * 1000:>8.0f}ms{len(X) / elapsed:>12.0f}行/s")
+
+    http.close()
+    channel.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="gRPC与HTTP JSON预测接口的吞吐和延迟对比")
+    parser.add_argument("--features", type=int, default=20, help="特征数")
+    parser.add_argument("--requests", type=int, default=2000, help="单条预测请求数")
+    parser.add_argument("--concurrency", type=int, default=8, help="并发客户端数")
+    parser.add_argument("--rows", type=int, default=100000, help="批量预测行数")
+    parser.add_argument("--chunk-rows", type=int, default=10000, help="gRPC流式分块行数")
+    parser.add_argument("--repeats", type=int, default=5, help="批量预测重复次数")
+    parser.add_argument("--http-port", type=int, default=18000, help="基准使用的HTTP端口")
+    parser.add_argument("--grpc-port", type=int, default=50061, help="基准使用的gRPC端口")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.chdir(work_dir)
+        save_model(args.features)
+        server, thread = start_servers(args.http_port, args.grpc_port)
+
+        X, _ = make_data(args.rows, args.features)
+        bench_single_row(args.http_port, args.grpc_port, X.iloc[0].to_dict(), args.requests, args.concurrency)
+        bench_batch(args.http_port, args.grpc_port, X, args.chunk_rows, args.repeats)
+
+        server.should_exit = True
+        thread.join()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from sklearn.svm import SVR
+from sklearn.ensemble import RandomForestRegressor
+
+from models.parallel import parallel_predict, resolve_backend
+
+
+def make_data(rows: int, features: int = 10):
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"feature{i}" for i in range(features)])
+    y = pd.Series(X.to_numpy() @ rng.normal(size=features) + rng.normal(0, 0.1, rows), name='target')
+    return X, y
+
+
+def measure_s(func) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def benchmark_parallel(rows: int, chunk_size: int, max_workers: int):
+    X_train, y_train = make_data(2000)
+    X, _ = make_data(rows)
+    models = {
+        'svr': SVR(),
+        'random_forest': RandomForestRegressor(n_estimators=100, max_depth=None, n_jobs=1, random_state=42)
+    }
+
+    workers = [1]
+    while workers[-1] * 2 <= max_workers:
+        workers.append(workers[-1] * 2)
+
+    print(f"行数: {rows}, 分块大小: {chunk_size}, CPU核数: {os.cpu_count()}")
+    print(f"{'模型':<16}{'后端':<12}{'进程/线程数':>10}{'耗时':>12}{'加速比':>10}{'效率':>10}")
+
+    for model_name, model in models.items():
+        model.fit(X_train, y_train)
+        backend = resolve_backend(model)
+        baseline = None
+
+        for n_jobs in workers:
+            elapsed = measure_s(lambda: parallel_predict(model.predict, X, chunk_size, n_jobs=n_jobs, backend=backend))
+            baseline = baseline or elapsed
+            speedup = baseline / elapsed
+            print(f"{model_name:<16}{backend:<12}{n_jobs:>10}{elapsed:>11.2f}s{speedup:>9.2f}x{speedup / n_jobs:>9.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="并行分块批量预测基准")
+    parser.add_argument("--rows", type=int, default=200000, help="预测行数")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="分块大小")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="最大工作线程/进程数")
+    args = parser.parse_args()
+
+    benchmark_parallel(args.rows, args.chunk_size, args.max_workers)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+import json
+import pickle
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.ensemble import RandomForestRegressor
+
+from models.predictor import Predictor
+
+
+def make_data(rows: int = 2000, features: int = 10):
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(rows, features)), columns=[f"feature{i}" for i in range(features)])
+    y = pd.Series(X.to_numpy() @ rng.normal(size=features) + rng.normal(0, 0.1, rows), name='target')
+    return X, y
+
+
+def measure_us(func, repeats: int = 2000) -> float:
+    for _ in range(50):
+        func()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings) * 1e6)
+
+
+def benchmark_single_row():
+    X, y = make_data()
+    models = {
+        'linear_regression': LinearRegression(),
+        'ridge': Ridge(),
+        'random_forest': RandomForestRegressor(n_estimators=100, random_state=42)
+    }
+
+    row = X.iloc[0].to_dict()
+    row['target'] = 0.0
+
+    print(f"{'模型':<20}{'sklearn':>14}{'DataFrame路径':>16}{'快速路径':>12}{'加速比':>10}")
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        for model_name, model in models.items():
+            model.fit(X, y)
+            with open(os.path.join(models_dir, f"{model_name}.pkl"), 'wb') as f:
+                pickle.dump(model, f)
+            with open(os.path.join(models_dir, f"{model_name}_info.json"), 'w') as f:
+                json.dump({'feature_names': list(X.columns), 'target_name': 'target'}, f)
+
+            predictor = Predictor(models_dir=models_dir)
+            predictor.set_current_model(model_name)
+
+            sklearn_us = measure_us(lambda: model.predict(pd.DataFrame([row])[list(X.columns)]), repeats=300)
+            fast_us = measure_us(lambda: predictor.predict(row))
+
+            slow_handle = predictor.get_handle(model_name).replace(input_plan=None)
+            slow_us = measure_us(lambda: slow_handle.predict(row), repeats=300)
+
+            print(f"{model_name:<20}{sklearn_us:>12.1f}us{slow_us:>14.1f}us{fast_us:>10.1f}us{slow_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    benchmark_single_row()
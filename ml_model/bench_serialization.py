@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from api.responses import NumpyJSONResponse, JSON_BACKEND
+from utils.helpers import serialize_numpy_pandas
+
+
+def make_payloads():
+    rng = np.random.default_rng(42)
+    preview = pd.DataFrame(rng.normal(size=(1000, 20)), columns=[f"feature{i}" for i in range(20)])
+    return {
+        'batch_10k': {
+            'success': True,
+            'predictions': rng.normal(size=10000),
+            'predictions_proba': None,
+            'model_name': 'random_forest_1',
+            'count': 10000
+        },
+        'batch_1m': {
+            'success': True,
+            'predictions': rng.normal(size=1000000),
+            'predictions_proba': None,
+            'model_name': 'random_forest_1',
+            'count': 1000000
+        },
+        'proba_100k': {
+            'success': True,
+            'predictions': rng.integers(0, 3, 100000),
+            'predictions_proba': rng.dirichlet(np.ones(3), 100000),
+            'model_name': 'logistic_regression_1',
+            'count': 100000
+        },
+        'preview_1k': {
+            'success': True,
+            'preview': preview.to_dict('records')
+        }
+    }
+
+
+def measure_ms(func, repeats: int) -> float:
+    func()
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings) * 1000)
+
+
+def benchmark_serialization():
+    print(f"JSON后端: {JSON_BACKEND}")
+    print(f"{'负载':<14}{'原方案':>12}{'NumpyJSONResponse':>20}{'加速比':>10}{'响应大小':>12}")
+
+    for name, payload in make_payloads().items():
+        repeats = 3 if name == 'batch_1m' else 20
+        baseline_ms = measure_ms(lambda: JSONResponse(jsonable_encoder(serialize_numpy_pandas(payload))).body, repeats)
+        native_ms = measure_ms(lambda: NumpyJSONResponse(payload).body, repeats)
+        size_kb = len(NumpyJSONResponse(payload).body) / 1024
+        print(f"{name:<14}{baseline_ms:>10.1f}ms{native_ms:>18.1f}ms{baseline_ms / native_ms:>9.1f}x{size_kb:>10.0f}KB")
+
+
+if __name__ == "__main__":
+    benchmark_serialization()
@@ -7,6 +7,10 @@ from .settings import (
     DATA_CONFIG,
     API_CONFIG,
     PREDICTION_CONFIG,
+    EXECUTION_CONFIG,
+    GRPC_CONFIG,
+    COMPRESSION_CONFIG,
+    PROFILING_CONFIG,
     SYSTEM_CONFIG,
     LOGGING_CONFIG,
     DATABASE_CONFIG
@@ -17,6 +21,10 @@ __all__ = [
     'DATA_CONFIG',
     'API_CONFIG',
     'PREDICTION_CONFIG',
+    'EXECUTION_CONFIG',
+    'GRPC_CONFIG',
+    'COMPRESSION_CONFIG',
+    'PROFILING_CONFIG',
     'SYSTEM_CONFIG',
     'LOGGING_CONFIG',
     'DATABASE_CONFIG'
@@ -23,13 +23,15 @@ DATA_CONFIG = {
     "upload_dir": os.path.join(BASE_DIR, "uploads"),
     "supported_formats": [".csv"],
     "max_file_size": 100 * 1024 * 1024,
-    "preview_rows": 20
+    "preview_rows": 20,
+    "max_datasets": 10
 }
 
 API_CONFIG = {
     "host": "0.0.0.0",
     "port": 8000,
     "debug": False,
+    "workers": 1,
     "cors_origins": ["*"],
     "title": "机器学习数据分析与统计系统",
     "description": "基于机器学习的数据分析与统计系统API",
@@ -38,8 +40,70 @@ API_CONFIG = {
 
 PREDICTION_CONFIG = {
     "batch_size": 100,
-    "export_formats": ["csv", "excel", "json"],
-    "default_export_format": "csv"
+    "export_formats": ["csv", "excel", "json", "parquet", "arrow"],
+    "export_chunk_size": 50000,
+    "default_export_format": "csv",
+    "export_direct_max_rows": 10000,
+    "export_job_ttl": 3600.0,
+    "export_job_workers": 2,
+    "export_cleanup_interval": 60.0,
+    "export_spool_dir": os.path.join(BASE_DIR, "exports"),
+    "reduced_precision": False,
+    "precision_tolerance": 1e-4,
+    "validation_sample_size": 200,
+    "warmup_enabled": True,
+    "warmup_models": [],
+    "warmup_top_n": 3,
+    "model_poll_interval": 2.0,
+    "model_rescan_interval": 1.0,
+    "micro_batching": False,
+    "batch_max_wait_ms": 2.0,
+    "batch_max_size": 64,
+    "stream_chunk_size": 10000,
+    "cache_enabled": False,
+    "cache_max_entries": 100000,
+    "cache_ttl": 300.0,
+    "parallel_min_rows": 100000,
+    "parallel_chunk_size": 50000,
+    "parallel_workers": -1,
+    "parallel_backend": "auto"
+}
+
+EXECUTION_CONFIG = {
+    "inference_workers": None,
+    "training_workers": 1,
+    "training_processes": 2,
+    "total_cores": None,
+    "inference_reserved_cores": 1,
+    "training_max_job_cores": None,
+    "training_max_queued": 4
+}
+
+GRPC_CONFIG = {
+    "enabled": False,
+    "host": "0.0.0.0",
+    "port": 50051,
+    "max_message_mb": 64,
+    "shutdown_grace": 5.0
+}
+
+COMPRESSION_CONFIG = {
+    "enabled": True,
+    "minimum_size": 1024,
+    "gzip_level": 6,
+    "brotli_quality": 4,
+    "offload_size": 1024 * 1024
+}
+
+PROFILING_CONFIG = {
+    "enabled": False,
+    "header": "X-Profile",
+    "query_param": "profile",
+    "token": None,
+    "sample_rate": 0.0,
+    "output_dir": os.path.join(BASE_DIR, "profiles"),
+    "max_profiles": 50,
+    "top_n": 30
 }
 
 SYSTEM_CONFIG = {
@@ -51,8 +115,17 @@ SYSTEM_CONFIG = {
 
 LOGGING_CONFIG = {
     "level": "INFO",
-    "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    "file": os.path.join(BASE_DIR, "logs", "ml_system.log")
+    "format": "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s",
+    "file": os.path.join(BASE_DIR, "logs", "ml_system.{worker}.log"),
+    "json": True,
+    "console": True,
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "queue_size": 10000,
+    "sample_level": "WARNING",
+    "sample_window": 60.0,
+    "sample_burst": 10,
+    "access_log": True
 }
 
 DATABASE_CONFIG = {
@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import json
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from models.predictor import Predictor
+
+
+@pytest.fixture
+def make_data():
+    def _make_data(rows: int = 300, seed: int = 42):
+        rng = np.random.default_rng(seed)
+        X = pd.DataFrame({
+            'area': rng.normal(100, 30, rows),
+            'rooms': rng.integers(1, 6, rows).astype(float),
+            'age': rng.uniform(0, 50, rows)
+        })
+        y = pd.Series(3 * X['area'] + 10 * X['rooms'] - 0.5 * X['age'] + rng.normal(0, 5, rows), name='price')
+        return X, y
+
+    return _make_data
+
+
+@pytest.fixture
+def save_model(tmp_path):
+    def _save_model(model_name, model, feature_names):
+        model_path = tmp_path / f"{model_name}.pkl"
+        with open(f"{model_path}.tmp", 'wb') as f:
+            pickle.dump(model, f)
+        os.replace(f"{model_path}.tmp", model_path)
+
+        info_path = tmp_path / f"{model_name}_info.json"
+        with open(f"{info_path}.tmp", 'w') as f:
+            json.dump({'model_name': model_name, 'feature_names': feature_names, 'target_name': 'price'}, f)
+        os.replace(f"{info_path}.tmp", info_path)
+        return str(tmp_path)
+
+    return _save_model
+
+
+@pytest.fixture
+def make_predictor(tmp_path, save_model):
+    def _make_predictor(X, y, model_name='linear_regression_1'):
+        model = LinearRegression().fit(X, y)
+        save_model(model_name, model, list(X.columns))
+
+        predictor = Predictor(models_dir=str(tmp_path))
+        predictor.set_current_model(model_name)
+        return predictor, model
+
+    return _make_predictor
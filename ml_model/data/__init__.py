@@ -0,0 +1,8 @@
+from utils.startup import lazy_exports
+
+__all__ = ['DataProcessor', 'DatasetRegistry']
+
+__getattr__ = lazy_exports(__name__, {
+    'DataProcessor': '.data_processor',
+    'DatasetRegistry': '.dataset_registry'
+})
@@ -0,0 +1,129 @@
+import os
+import time
+import uuid
+import shutil
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+
+from utils.metrics import phase_timer
+
+logger = logging.getLogger(__name__)
+
+
+def new_dataset_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+class DatasetRegistry:
+
+    def __init__(self, max_datasets: int = 10, store=None):
+        self.max_datasets = max_datasets
+        self.store = store
+        self.datasets: OrderedDict = OrderedDict()
+        self.latest_id: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def register(self, df: pd.DataFrame, file_name: str = '', path: Optional[str] = None,
+                 dataset_id: Optional[str] = None) -> str:
+        dataset_id = dataset_id or new_dataset_id()
+        entry = {
+            'dataset_id': dataset_id,
+            'file_name': file_name,
+            'df': df,
+            'path': path,
+            'rows_count': len(df),
+            'columns': [str(column) for column in df.columns],
+            'created_at': time.time()
+        }
+
+        self._cache(entry)
+        with self._lock:
+            self.latest_id = dataset_id
+
+        if self.store is not None:
+            record = {key: value for key, value in entry.items() if key != 'df'}
+            for evicted in self.store.add_dataset(record, self.max_datasets):
+                self._discard(evicted)
+            self.store.set('current_dataset', dataset_id)
+
+        return dataset_id
+
+    def _cache(self, entry: Dict[str, Any]):
+        entry['memory_bytes'] = int(entry['df'].memory_usage(deep=True).sum())
+        with self._lock:
+            self.datasets[entry['dataset_id']] = entry
+            while len(self.datasets) > self.max_datasets:
+                self.datasets.popitem(last=False)
+
+    def _discard(self, record: Dict[str, Any]):
+        with self._lock:
+            self.datasets.pop(record['dataset_id'], None)
+        if record.get('path'):
+            shutil.rmtree(os.path.dirname(record['path']), ignore_errors=True)
+
+    def current_id(self) -> Optional[str]:
+        if self.store is not None:
+            return self.store.get('current_dataset')
+        return self.latest_id
+
+    def get(self, dataset_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        if dataset_id == 'current':
+            dataset_id = self.current_id()
+        if dataset_id is None:
+            return None
+
+        with self._lock:
+            entry = self.datasets.get(dataset_id)
+        if self.store is None:
+            return entry
+
+        record = self.store.get_dataset(dataset_id)
+        if record is None:
+            with self._lock:
+                self.datasets.pop(dataset_id, None)
+            return None
+        if entry is not None:
+            return entry
+        if not record.get('path') or not os.path.exists(record['path']):
+            return None
+
+        try:
+            with phase_timer("csv_parse"):
+                df = pd.read_csv(record['path'])
+        except Exception as e:
+            logger.error("加载数据集失败 %s: %s", dataset_id, e)
+            return None
+
+        entry = {**record, 'df': df}
+        self._cache(entry)
+        return entry
+
+    def remove(self, dataset_id: str) -> bool:
+        with self._lock:
+            entry = self.datasets.pop(dataset_id, None)
+
+        if self.store is not None:
+            record = self.store.remove_dataset(dataset_id)
+            if record is not None:
+                self._discard(record)
+                return True
+        return entry is not None
+
+    def memory_usage(self) -> int:
+        with self._lock:
+            return sum(entry['memory_bytes'] for entry in self.datasets.values())
+
+    def describe(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in entry.items() if key not in ('df', 'path')}
+
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        if self.store is not None:
+            entries = self.store.list_datasets()
+        else:
+            with self._lock:
+                entries = list(self.datasets.values())
+        return [self.describe(entry) for entry in entries]
@@ -0,0 +1,8 @@
+from utils.startup import lazy_exports
+
+__all__ = ['ModelTrainer', 'Predictor']
+
+__getattr__ = lazy_exports(__name__, {
+    'ModelTrainer': '.model_trainer',
+    'Predictor': '.predictor'
+})
@@ -0,0 +1,121 @@
+import copy
+import time
+import pickle
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+
+from models.compiled import compile_model, forest_model_types
+
+LATENCY_REPEATS = 20
+
+
+def model_size_bytes(model) -> int:
+    return len(pickle.dumps(model))
+
+
+def is_compactable(model) -> bool:
+    return isinstance(model, forest_model_types()) and hasattr(model, 'estimators_')
+
+
+def _subset_forest(model, n_trees: int):
+    compacted = copy.copy(model)
+    compacted.estimators_ = model.estimators_[:n_trees]
+    compacted.n_estimators = n_trees
+    return compacted
+
+
+def _holdout_metrics(model, X: pd.DataFrame, y: pd.Series) -> Dict[str, float]:
+    from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+
+    y_pred = model.predict(X)
+    return {
+        'r2': r2_score(y, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y, y_pred)),
+        'mae': mean_absolute_error(y, y_pred)
+    }
+
+
+def _single_row_latency_ms(model, row: pd.DataFrame) -> float:
+    compiled = compile_model(model)
+    if compiled is not None:
+        X = row.to_numpy(dtype=np.float64)
+        predict = lambda: compiled.predict(X)
+    else:
+        predict = lambda: model.predict(row)
+
+    predict()
+    timings = []
+    for _ in range(LATENCY_REPEATS):
+        started = time.perf_counter()
+        predict()
+        timings.append(time.perf_counter() - started)
+    return float(np.median(timings) * 1000)
+
+
+def _trees_for_bytes(model, max_bytes: int) -> int:
+    base_size = model_size_bytes(_subset_forest(model, 0))
+    tree_sizes = np.cumsum([model_size_bytes(tree) for tree in model.estimators_])
+    return int(np.searchsorted(tree_sizes, max_bytes - base_size, side='right'))
+
+
+def _trees_for_latency(model, row: pd.DataFrame, max_latency_ms: float) -> int:
+    n_trees = len(model.estimators_)
+    latency = _single_row_latency_ms(model, row)
+
+    while n_trees > 1 and latency > max_latency_ms:
+        n_trees = max(1, min(n_trees - 1, int(n_trees * max_latency_ms / latency)))
+        latency = _single_row_latency_ms(_subset_forest(model, n_trees), row)
+
+    return n_trees if latency <= max_latency_ms else 0
+
+
+def compact_forest(model, X_holdout: pd.DataFrame, y_holdout: pd.Series, max_bytes: Optional[int] = None,
+                   max_latency_ms: Optional[float] = None) -> Tuple[Any, Dict[str, Any]]:
+    if not is_compactable(model):
+        return model, {
+            'success': False,
+            'message': f'模型类型不支持压缩: {type(model).__name__}'
+        }
+
+    if max_bytes is None and max_latency_ms is None:
+        return model, {
+            'success': False,
+            'message': '未指定大小或延迟预算'
+        }
+
+    original_trees = len(model.estimators_)
+    n_trees = original_trees
+
+    if max_bytes is not None:
+        n_trees = min(n_trees, _trees_for_bytes(model, max_bytes))
+
+    if max_latency_ms is not None and n_trees > 0:
+        n_trees = min(n_trees, _trees_for_latency(_subset_forest(model, n_trees), X_holdout.head(1), max_latency_ms))
+
+    if n_trees < 1:
+        return model, {
+            'success': False,
+            'message': '即使只保留一棵树也无法满足预算'
+        }
+
+    compacted = _subset_forest(model, n_trees) if n_trees < original_trees else model
+
+    original_metrics = _holdout_metrics(model, X_holdout, y_holdout)
+    compacted_metrics = _holdout_metrics(compacted, X_holdout, y_holdout)
+
+    return compacted, {
+        'success': True,
+        'message': f'模型已压缩: {original_trees} -> {n_trees} 棵树',
+        'original_trees': original_trees,
+        'compacted_trees': n_trees,
+        'original_size_bytes': model_size_bytes(model),
+        'compacted_size_bytes': model_size_bytes(compacted),
+        'original_latency_ms': _single_row_latency_ms(model, X_holdout.head(1)),
+        'compacted_latency_ms': _single_row_latency_ms(compacted, X_holdout.head(1)),
+        'max_bytes': max_bytes,
+        'max_latency_ms': max_latency_ms,
+        'original_metrics': original_metrics,
+        'compacted_metrics': compacted_metrics,
+        'r2_change': compacted_metrics['r2'] - original_metrics['r2']
+    }
@@ -0,0 +1,237 @@
+import os
+import numpy as np
+from typing import Dict, List, Any, Optional, Tuple
+
+TREE_BLOCK_CELLS = 1 << 18
+
+
+def linear_model_types() -> Tuple[type, ...]:
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
+    return (LinearRegression, Ridge, Lasso, ElasticNet)
+
+
+def forest_model_types() -> Tuple[type, ...]:
+    from sklearn.ensemble import RandomForestRegressor, ExtraTreesRegressor
+    return (RandomForestRegressor, ExtraTreesRegressor)
+
+
+class CompiledLinearModel:
+
+    kind = 'linear'
+
+    def __init__(self, coef: np.ndarray, intercept: float, feature_names: Optional[List[str]] = None):
+        self.coef = coef
+        self.intercept = intercept
+        self.feature_names = feature_names
+        self.n_features = len(coef)
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.coef.nbytes)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.asarray(X, dtype=self.coef.dtype) @ self.coef + self.intercept
+
+    def astype(self, dtype) -> 'CompiledLinearModel':
+        return CompiledLinearModel(self.coef.astype(dtype), self.intercept, self.feature_names)
+
+
+class CompiledTreeEnsemble:
+
+    kind = 'tree_ensemble'
+
+    def __init__(self, left: np.ndarray, right: np.ndarray, feature: np.ndarray, threshold: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, depth: int, scale: float = 1.0, offset: float = 0.0,
+                 n_features: int = 0, feature_names: Optional[List[str]] = None):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.scale = scale
+        self.offset = offset
+        self.n_features = n_features
+        self.feature_names = feature_names
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def nbytes(self) -> int:
+        return int(sum(a.nbytes for a in (self.left, self.right, self.feature, self.threshold, self.value, self.roots)))
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        n_rows = X.shape[0]
+        block = max(1, TREE_BLOCK_CELLS // self.n_trees)
+
+        output = np.empty(n_rows, dtype=np.float64)
+        for start in range(0, n_rows, block):
+            X_block = X[start:start + block]
+            rows = np.arange(X_block.shape[0])[:, None]
+            nodes = np.repeat(self.roots[None, :], X_block.shape[0], axis=0)
+
+            for _ in range(self.depth):
+                go_left = X_block[rows, self.feature[nodes]] <= self.threshold[nodes]
+                nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+
+            output[start:start + block] = self.value[nodes].sum(axis=1, dtype=np.float64)
+
+        return output * self.scale + self.offset
+
+    def astype(self, dtype) -> 'CompiledTreeEnsemble':
+        index_dtype = np.int32 if np.dtype(dtype).itemsize < 8 else np.intp
+        return CompiledTreeEnsemble(
+            left=self.left.astype(index_dtype),
+            right=self.right.astype(index_dtype),
+            feature=self.feature.astype(index_dtype),
+            threshold=self.threshold.astype(dtype),
+            value=self.value.astype(dtype),
+            roots=self.roots.astype(index_dtype),
+            depth=self.depth,
+            scale=self.scale,
+            offset=self.offset,
+            n_features=self.n_features,
+            feature_names=self.feature_names
+        )
+
+
+def _flatten_trees(trees) -> Optional[dict]:
+    lefts, rights, features, thresholds, values, roots = [], [], [], [], [], []
+    offset = 0
+    depth = 0
+
+    for tree in trees:
+        tree_ = tree.tree_
+        if tree_.n_outputs != 1 or tree_.value.shape[2] != 1:
+            return None
+
+        n_nodes = tree_.node_count
+        node_ids = np.arange(n_nodes, dtype=np.intp)
+        is_leaf = tree_.children_left == -1
+
+        lefts.append(np.where(is_leaf, node_ids, tree_.children_left) + offset)
+        rights.append(np.where(is_leaf, node_ids, tree_.children_right) + offset)
+        features.append(np.where(is_leaf, 0, tree_.feature))
+        thresholds.append(tree_.threshold)
+        values.append(tree_.value[:, 0, 0])
+        roots.append(offset)
+
+        depth = max(depth, tree_.max_depth)
+        offset += n_nodes
+
+    return {
+        'left': np.concatenate(lefts).astype(np.intp),
+        'right': np.concatenate(rights).astype(np.intp),
+        'feature': np.concatenate(features).astype(np.intp),
+        'threshold': np.concatenate(thresholds).astype(np.float64),
+        'value': np.concatenate(values).astype(np.float64),
+        'roots': np.asarray(roots, dtype=np.intp),
+        'depth': depth
+    }
+
+
+def _feature_names(model) -> Optional[List[str]]:
+    if hasattr(model, 'feature_names_in_'):
+        return [str(name) for name in model.feature_names_in_]
+    return None
+
+
+def validation_sample_path(model_path: str) -> str:
+    return model_path.replace('.pkl', '_validation.npy')
+
+
+def load_validation_sample(model_path: str) -> Optional[np.ndarray]:
+    sample_path = validation_sample_path(model_path)
+    if not os.path.exists(sample_path):
+        return None
+    return np.load(sample_path, allow_pickle=False)
+
+
+def compile_model(model):
+    from sklearn.tree import DecisionTreeRegressor
+    from sklearn.ensemble import GradientBoostingRegressor
+    from sklearn.dummy import DummyRegressor
+
+    try:
+        if isinstance(model, linear_model_types()):
+            coef = np.asarray(model.coef_, dtype=np.float64)
+            if coef.ndim != 1:
+                return None
+            return CompiledLinearModel(coef, float(model.intercept_), _feature_names(model))
+
+        if isinstance(model, DecisionTreeRegressor):
+            trees, scale, offset = [model], 1.0, 0.0
+        elif isinstance(model, forest_model_types()):
+            trees, scale, offset = model.estimators_, 1.0 / len(model.estimators_), 0.0
+        elif isinstance(model, GradientBoostingRegressor):
+            if model.init_ == 'zero':
+                offset = 0.0
+            elif isinstance(model.init_, DummyRegressor):
+                offset = float(np.ravel(model.init_.constant_)[0])
+            else:
+                return None
+            trees, scale = model.estimators_[:, 0], float(model.learning_rate)
+        else:
+            return None
+
+        flat = _flatten_trees(trees)
+        if flat is None:
+            return None
+
+        return CompiledTreeEnsemble(
+            scale=scale,
+            offset=offset,
+            n_features=int(model.n_features_in_),
+            feature_names=_feature_names(model),
+            **flat
+        )
+
+    except AttributeError:
+        return None
+
+
+def reduce_precision(compiled, X_validation: Optional[np.ndarray], tolerance: float,
+                     dtype=np.float32) -> Tuple[Any, Dict[str, Any]]:
+    report = {
+        'dtype': np.dtype(dtype).name,
+        'tolerance': tolerance,
+        'accepted': False
+    }
+
+    if compiled is None:
+        report['message'] = '模型不支持降低精度'
+        return None, report
+
+    if X_validation is None or len(X_validation) == 0:
+        report['message'] = '缺少验证样本，无法评估精度损失'
+        return None, report
+
+    reduced = compiled.astype(dtype)
+    X_validation = np.asarray(X_validation, dtype=np.float64)
+
+    reference = compiled.predict(X_validation)
+    candidate = reduced.predict(X_validation)
+
+    max_abs_deviation = float(np.max(np.abs(candidate - reference)))
+    scale = float(np.max(np.abs(reference)))
+    max_relative_deviation = max_abs_deviation / scale if scale > 0 else max_abs_deviation
+
+    report.update({
+        'original_bytes': compiled.nbytes,
+        'reduced_bytes': reduced.nbytes,
+        'validation_rows': int(X_validation.shape[0]),
+        'max_abs_deviation': max_abs_deviation,
+        'max_relative_deviation': max_relative_deviation
+    })
+
+    if max_relative_deviation > tolerance:
+        report['message'] = f'预测偏差 {max_relative_deviation:.3g} 超过容差 {tolerance:.3g}，保留原始精度'
+        return None, report
+
+    report['accepted'] = True
+    report['message'] = '已启用降低精度推理'
+    return reduced, report
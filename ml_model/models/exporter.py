@@ -0,0 +1,117 @@
+import pandas as pd
+from pandas.api.types import is_integer_dtype
+from typing import Optional
+
+
+class CsvPredictionWriter:
+
+    def __init__(self, output_path: str):
+        self.file = open(output_path, 'w', encoding='utf-8', newline='')
+        self.header = True
+
+    def write(self, df: pd.DataFrame):
+        df.to_csv(self.file, index=False, header=self.header)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class JsonPredictionWriter:
+
+    def __init__(self, output_path: str):
+        self.file = open(output_path, 'w', encoding='utf-8')
+        self.file.write('[')
+        self.first = True
+
+    def write(self, df: pd.DataFrame):
+        if df.empty:
+            return
+        records = df.to_json(orient='records', indent=2)[1:-1]
+        if not self.first:
+            self.file.write(',')
+        self.file.write(records)
+        self.first = False
+
+    def close(self):
+        self.file.write(']')
+        self.file.close()
+
+
+class ExcelPredictionWriter:
+
+    def __init__(self, output_path: str):
+        self.writer = pd.ExcelWriter(output_path, engine='openpyxl')
+        self.next_row = 0
+
+    def write(self, df: pd.DataFrame):
+        header = self.next_row == 0
+        df.to_excel(self.writer, index=False, header=header, startrow=self.next_row)
+        self.next_row += len(df) + (1 if header else 0)
+
+    def close(self):
+        if self.next_row == 0:
+            self.write(pd.DataFrame())
+        self.writer.close()
+
+
+class ArrowPredictionWriter:
+
+    def __init__(self, output_path: str, parquet: bool = False):
+        try:
+            import pyarrow
+        except ImportError:
+            raise ValueError('导出Parquet/Arrow格式需要安装pyarrow')
+
+        self.pa = pyarrow
+        self.output_path = output_path
+        self.parquet = parquet
+        self.writer = None
+        self.schema: Optional[pyarrow.Schema] = None
+
+    def write(self, df: pd.DataFrame):
+        integer_columns = [column for column in df.columns if is_integer_dtype(df[column])]
+        if integer_columns:
+            df = df.astype({column: 'float64' for column in integer_columns})
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+
+        if self.writer is None:
+            self.schema = table.schema
+            if self.parquet:
+                import pyarrow.parquet as pq
+                self.writer = pq.ParquetWriter(self.output_path, self.schema)
+            else:
+                import pyarrow.ipc as ipc
+                self.writer = ipc.new_file(self.output_path, self.schema)
+        elif not table.schema.equals(self.schema):
+            table = table.cast(self.schema)
+
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is None:
+            self.write(pd.DataFrame())
+        self.writer.close()
+
+
+EXPORT_WRITERS = {
+    'csv': CsvPredictionWriter,
+    'json': JsonPredictionWriter,
+    'excel': ExcelPredictionWriter,
+    'parquet': lambda output_path: ArrowPredictionWriter(output_path, parquet=True),
+    'arrow': ArrowPredictionWriter
+}
+
+EXPORT_EXTENSIONS = {
+    'excel': 'xlsx'
+}
+
+
+def export_file_extension(format: str) -> str:
+    return EXPORT_EXTENSIONS.get(format, format)
+
+
+def open_prediction_writer(format: str, output_path: str):
+    if format not in EXPORT_WRITERS:
+        raise ValueError(f'不支持的导出格式: {format}')
+    return EXPORT_WRITERS[format](output_path)
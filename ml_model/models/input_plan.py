@@ -0,0 +1,40 @@
+import numpy as np
+from typing import Dict, List, Any, Optional
+
+
+class InputPlan:
+
+    def __init__(self, feature_names: List[str]):
+        self.feature_names = list(feature_names)
+        self.feature_set = frozenset(self.feature_names)
+        self.n_features = len(self.feature_names)
+
+    @classmethod
+    def from_model_info(cls, model_info: Dict[str, Any], compiled_model=None) -> Optional['InputPlan']:
+        feature_names = model_info.get('feature_names') or model_info.get('feature_columns')
+        if not feature_names:
+            return None
+
+        if compiled_model is not None:
+            if compiled_model.n_features != len(feature_names):
+                return None
+            if compiled_model.feature_names is not None and compiled_model.feature_names != list(feature_names):
+                return None
+
+        return cls(feature_names)
+
+    def missing_features(self, data: Dict[str, Any]) -> List[str]:
+        if data.keys() >= self.feature_set:
+            return []
+        return [name for name in self.feature_names if name not in data]
+
+    def build_row(self, data: Dict[str, Any]) -> Optional[np.ndarray]:
+        try:
+            row = np.fromiter((data[name] for name in self.feature_names), dtype=np.float64, count=self.n_features)
+        except (TypeError, ValueError):
+            return None
+
+        if np.isnan(row).any():
+            return None
+
+        return row.reshape(1, -1)
@@ -0,0 +1,383 @@
+import json
+import logging
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional, Union, Tuple, Iterator
+from utils.helpers import serialize_numpy_pandas
+from models.compiled import compile_model, reduce_precision
+from models.compaction import model_size_bytes
+from models.input_plan import InputPlan
+from models.exporter import open_prediction_writer
+from models.parallel import parallel_predict, resolve_backend
+from utils.metrics import phase_timer
+from config.settings import PREDICTION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+def _ndjson_lines(output: pd.DataFrame) -> bytes:
+    finite = output.notna() & ~output.isin([np.inf, -np.inf])
+    records = output.astype(object).where(finite, None).to_dict(orient='records')
+    return ''.join(json.dumps(record, ensure_ascii=False, default=str, separators=(',', ':')) + '\n' for record in records).encode('utf-8')
+
+
+def _resident_bytes(model, model_info: Dict[str, Any], compiled_model, reduced_model, release_model: bool) -> Dict[str, Any]:
+    estimator_bytes = int(model_info.get('model_size_bytes') or model_size_bytes(model))
+    before = estimator_bytes + compiled_model.nbytes
+    after = reduced_model.nbytes + (0 if release_model else estimator_bytes)
+    return {
+        'estimator_bytes': estimator_bytes,
+        'estimator_released': release_model,
+        'resident_bytes_before': before,
+        'resident_bytes_after': after,
+        'memory_saved_bytes': before - after
+    }
+
+
+class ModelHandle:
+
+    __slots__ = (
+        'model_name', '_model', 'model_loader', 'model_info', 'version', 'compiled_model', 'input_plan',
+        'precision_report', 'prediction_cache', 'feature_names', 'with_proba'
+    )
+
+    def __init__(self, model_name: str, model, model_info: Dict[str, Any], version: Optional[int] = None,
+                 compiled_model=None, input_plan: Optional[InputPlan] = None,
+                 precision_report: Optional[Dict[str, Any]] = None, prediction_cache=None, model_loader=None):
+        feature_names = model_info.get('feature_names') or model_info.get('feature_columns')
+        if not feature_names and hasattr(model, 'feature_names_in_'):
+            feature_names = [str(name) for name in model.feature_names_in_]
+        if not feature_names and compiled_model is not None:
+            feature_names = compiled_model.feature_names
+
+        values = {
+            'model_name': model_name,
+            '_model': model,
+            'model_loader': model_loader,
+            'model_info': model_info,
+            'version': version,
+            'compiled_model': compiled_model,
+            'input_plan': input_plan,
+            'precision_report': precision_report,
+            'prediction_cache': prediction_cache,
+            'feature_names': list(feature_names) if feature_names else None,
+            'with_proba': hasattr(model, 'predict_proba') and model_info.get('problem_type') == 'classification'
+        }
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f'模型句柄不可修改: {name}')
+
+    @property
+    def model(self):
+        if self._model is None and self.model_loader is not None:
+            return self.model_loader()
+        return self._model
+
+    @classmethod
+    def build(cls, model_name: str, model, model_info: Dict[str, Any], version: Optional[int] = None,
+              reduced_precision: bool = False, precision_tolerance: float = 1e-4,
+              prediction_cache=None, validation_sample: Optional[np.ndarray] = None,
+              model_loader=None) -> 'ModelHandle':
+        compiled_model = compile_model(model)
+        precision_report = None
+        release_model = False
+        if reduced_precision:
+            reduced_model, precision_report = reduce_precision(
+                compiled_model,
+                validation_sample,
+                precision_tolerance
+            )
+            if reduced_model is not None:
+                release_model = model_loader is not None
+                precision_report.update(_resident_bytes(model, model_info, compiled_model, reduced_model, release_model))
+                compiled_model = reduced_model
+
+        handle = cls(model_name, None if release_model else model, model_info, version=version,
+                     compiled_model=compiled_model, precision_report=precision_report,
+                     prediction_cache=prediction_cache, model_loader=model_loader)
+        if compiled_model is None or handle.feature_names is None:
+            return handle
+
+        return handle.replace(input_plan=InputPlan.from_model_info({'feature_names': handle.feature_names}, compiled_model))
+
+    def replace(self, **changes) -> 'ModelHandle':
+        values = {
+            'version': self.version,
+            'compiled_model': self.compiled_model,
+            'input_plan': self.input_plan,
+            'precision_report': self.precision_report,
+            'prediction_cache': self.prediction_cache,
+            'model_loader': self.model_loader
+        }
+        values.update(changes)
+        return ModelHandle(
+            values.pop('model_name', self.model_name),
+            values.pop('model', self._model),
+            values.pop('model_info', self.model_info),
+            **values
+        )
+
+    def dummy_input(self) -> Optional[Dict[str, Any]]:
+        if not self.feature_names:
+            return None
+        return {name: 0.0 for name in self.feature_names}
+
+    def select_features(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[str]]:
+        if not self.feature_names:
+            return df, []
+
+        missing_features = list(set(self.feature_names) - set(df.columns))
+        if missing_features:
+            return df, missing_features
+
+        return df[self.feature_names], []
+
+    def _model_predict(self, df: pd.DataFrame) -> np.ndarray:
+        with phase_timer("predict"):
+            return self._run_model(df)
+
+    def _run_model(self, df: pd.DataFrame) -> np.ndarray:
+        compiled = self.compiled_model
+        if compiled is not None and df.shape[1] == compiled.n_features:
+            if compiled.feature_names is None or list(df.columns) == compiled.feature_names:
+                try:
+                    X = df.to_numpy(dtype=np.float64)
+                except (TypeError, ValueError):
+                    X = None
+
+                if X is not None and not np.isnan(X).any():
+                    return self._chunked_predict(compiled.predict, X, "threading")
+
+        return self._chunked_predict(self.model.predict, df, resolve_backend(self.model, PREDICTION_CONFIG['parallel_backend']))
+
+    def _chunked_predict(self, predict_func, X: Union[np.ndarray, pd.DataFrame], backend: str) -> np.ndarray:
+        if len(X) < PREDICTION_CONFIG['parallel_min_rows']:
+            return predict_func(X)
+
+        return parallel_predict(
+            predict_func, X,
+            chunk_size=PREDICTION_CONFIG['parallel_chunk_size'],
+            n_jobs=PREDICTION_CONFIG['parallel_workers'],
+            backend=backend
+        )
+
+    def _cache_key(self) -> Optional[Tuple[str, int]]:
+        if self.prediction_cache is None or self.version is None:
+            return None
+        return (self.model_name, self.version)
+
+    def _cached_predict(self, X: np.ndarray, predict_rows) -> np.ndarray:
+        cache_key = self._cache_key()
+        if cache_key is None:
+            return predict_rows(None)
+
+        values, found, keys = self.prediction_cache.lookup(cache_key, X)
+        if found.all():
+            return values
+
+        missing = ~found
+        computed = predict_rows(None if not found.any() else np.flatnonzero(missing))
+        values[missing] = computed
+        self.prediction_cache.store(cache_key, keys[missing], computed)
+        return values
+
+    def _cached_frame_predict(self, df: pd.DataFrame) -> np.ndarray:
+        if self._cache_key() is None:
+            return self._model_predict(df)
+
+        try:
+            X = df.to_numpy(dtype=np.float64)
+        except (TypeError, ValueError):
+            return self._model_predict(df)
+
+        if np.isnan(X).any():
+            return self._model_predict(df)
+
+        return self._cached_predict(X, lambda rows: self._model_predict(df if rows is None else df.iloc[rows]))
+
+    def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        plan = self.input_plan
+        if plan is not None:
+            missing_features = plan.missing_features(data)
+            if missing_features:
+                return {
+                    'success': False,
+                    'message': f'缺少特征: {missing_features}'
+                }
+
+            row = plan.build_row(data)
+            if row is not None:
+                with phase_timer("predict"):
+                    prediction = float(self._cached_predict(row, lambda rows: self.compiled_model.predict(row))[0])
+                return {
+                    'success': True,
+                    'prediction': prediction,
+                    'prediction_proba': None,
+                    'model_name': self.model_name
+                }
+
+        try:
+            df, missing_features = self.select_features(pd.DataFrame([data]))
+            if missing_features:
+                return {
+                    'success': False,
+                    'message': f'缺少特征: {missing_features}'
+                }
+
+            prediction = serialize_numpy_pandas(self._model_predict(df)[0])
+
+            prediction_proba = None
+            if self.with_proba:
+                prediction_proba = serialize_numpy_pandas(self.model.predict_proba(df)[0])
+
+            return {
+                'success': True,
+                'prediction': prediction,
+                'prediction_proba': prediction_proba,
+                'model_name': self.model_name
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'预测失败: {str(e)}'
+            }
+
+    def batch_predict(self, data: Union[List[Dict[str, Any]], pd.DataFrame], serialize: bool = True) -> Dict[str, Any]:
+        try:
+            df, missing_features = self.select_features(pd.DataFrame(data))
+            if missing_features:
+                return {
+                    'success': False,
+                    'message': f'缺少特征: {missing_features}'
+                }
+
+            predictions_proba = None
+            if self.with_proba:
+                predictions = self._model_predict(df)
+                predictions_proba = self._chunked_predict(
+                    self.model.predict_proba, df,
+                    resolve_backend(self.model, PREDICTION_CONFIG['parallel_backend'])
+                )
+            else:
+                predictions = self._cached_frame_predict(df)
+
+            if serialize:
+                predictions = serialize_numpy_pandas(predictions)
+                predictions_proba = serialize_numpy_pandas(predictions_proba)
+
+            return {
+                'success': True,
+                'predictions': predictions,
+                'predictions_proba': predictions_proba,
+                'model_name': self.model_name,
+                'count': len(predictions)
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'批量预测失败: {str(e)}'
+            }
+
+    def _attach_predictions(self, output: pd.DataFrame, features: pd.DataFrame) -> pd.DataFrame:
+        output['prediction'] = self._model_predict(features)
+        if self.with_proba:
+            probabilities = self.model.predict_proba(features)
+            for j in range(probabilities.shape[1]):
+                output[f'probability_class_{j}'] = probabilities[:, j]
+        return output
+
+    def stream_predict(self, chunks: Iterator[pd.DataFrame], format: str = "ndjson",
+                       include_input: bool = False) -> Iterator[bytes]:
+        if format not in ("ndjson", "csv"):
+            raise ValueError(f'不支持的流式输出格式: {format}')
+
+        chunks = iter(chunks)
+        first_chunk = next(chunks, None)
+        if first_chunk is not None:
+            _, missing_features = self.select_features(first_chunk)
+            if missing_features:
+                raise ValueError(f'缺少特征: {missing_features}')
+
+        def generate() -> Iterator[bytes]:
+            row_index = 0
+            chunk = first_chunk
+            while chunk is not None:
+                features, missing_features = self.select_features(chunk)
+                if missing_features:
+                    raise ValueError(f'缺少特征: {missing_features}')
+
+                output = chunk.copy() if include_input else pd.DataFrame(index=chunk.index)
+                output.insert(0, 'row_index', np.arange(row_index, row_index + len(chunk)))
+                output = self._attach_predictions(output, features)
+
+                if format == "csv":
+                    yield output.to_csv(index=False, header=row_index == 0).encode('utf-8')
+                else:
+                    yield _ndjson_lines(output)
+
+                row_index += len(chunk)
+                chunk = next(chunks, None)
+
+            logger.info("流式预测完成: 模型 %s, 共 %s 行", self.model_name, row_index)
+
+        return generate()
+
+    def export_predictions(self, data: Union[List[Dict[str, Any]], pd.DataFrame], output_path: str, format: str = "csv",
+                           chunk_size: Optional[int] = None, include_input: bool = True) -> Dict[str, Any]:
+        chunk_size = chunk_size or PREDICTION_CONFIG['export_chunk_size']
+        writer = None
+
+        try:
+            writer = open_prediction_writer(format, output_path)
+            columns = None
+            count = 0
+
+            for start in range(0, len(data), chunk_size):
+                if isinstance(data, pd.DataFrame):
+                    chunk = data.iloc[start:start + chunk_size]
+                    if include_input:
+                        chunk = chunk.copy()
+                else:
+                    chunk = pd.DataFrame(data[start:start + chunk_size], columns=columns)
+                    columns = chunk.columns
+
+                features, missing_features = self.select_features(chunk)
+                if missing_features:
+                    return {
+                        'success': False,
+                        'message': f'缺少特征: {missing_features}'
+                    }
+
+                output = chunk if include_input else pd.DataFrame(index=chunk.index)
+                writer.write(self._attach_predictions(output, features))
+                count += len(chunk)
+
+            if count == 0:
+                columns = list(pd.DataFrame(data).columns) if include_input else []
+                writer.write(pd.DataFrame(columns=columns).assign(prediction=pd.Series(dtype=np.float64)))
+
+            writer.close()
+            writer = None
+
+            return {
+                'success': True,
+                'message': f'预测结果已导出到: {output_path}',
+                'output_path': output_path,
+                'count': count
+            }
+
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'导出预测结果失败: {str(e)}'
+            }
+        finally:
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception as e:
+                    logger.warning("关闭导出文件失败: %s", e)
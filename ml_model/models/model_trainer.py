@@ -0,0 +1,398 @@
+import os
+import pickle
+import json
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Tuple, Callable
+import logging
+from config.settings import PREDICTION_CONFIG
+from models.compaction import compact_forest
+from models.compiled import validation_sample_path
+from utils.metrics import phase_timer
+
+logger = logging.getLogger(__name__)
+
+MODEL_TYPES = ["linear_regression", "ridge", "lasso", "random_forest", "gradient_boosting", "svr"]
+
+
+def build_estimators() -> Dict[str, Any]:
+    from sklearn.linear_model import LinearRegression, Ridge, Lasso
+    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+    from sklearn.svm import SVR
+
+    return {
+        "linear_regression": LinearRegression(),
+        "ridge": Ridge(),
+        "lasso": Lasso(),
+        "random_forest": RandomForestRegressor(random_state=42),
+        "gradient_boosting": GradientBoostingRegressor(random_state=42),
+        "svr": SVR()
+    }
+
+
+def regression_metrics(y_true, y_pred) -> Dict[str, float]:
+    from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+
+    return {
+        'r2': r2_score(y_true, y_pred),
+        'rmse': np.sqrt(mean_squared_error(y_true, y_pred)),
+        'mae': mean_absolute_error(y_true, y_pred)
+    }
+
+
+class ModelTrainer:
+    
+    def __init__(self, name_sequence: Optional[Callable[[str], int]] = None):
+        self.name_sequence = name_sequence
+        self._models = None
+        self.trained_models = {}
+        self.model_metrics = {}
+        self.validation_samples: Dict[str, np.ndarray] = {}
+        self.feature_names = []
+        self.target_name = ""
+        
+        self.model_dir = "saved_models"
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            logger.info("模型保存目录已创建或已存在: %s", self.model_dir)
+        except Exception as e:
+            logger.error("创建模型保存目录失败: %s", e)
+            raise
+    
+    @property
+    def models(self) -> Dict[str, Any]:
+        if self._models is None:
+            self._models = build_estimators()
+        return self._models
+    
+    def get_available_models(self) -> List[str]:
+        return list(MODEL_TYPES)
+    
+    def get_trained_models(self) -> List[str]:
+        return list(self.trained_models.keys())
+    
+    def train_model(self, X: pd.DataFrame, y: pd.Series, model_type: str = "linear_regression",
+                   test_size: float = 0.2, tune_hyperparameters: bool = False, return_model: bool = True,
+                   max_model_bytes: Optional[int] = None, max_latency_ms: Optional[float] = None,
+                   n_jobs: Optional[int] = None) -> Dict[str, Any]:
+        try:
+            if model_type not in MODEL_TYPES:
+                return {
+                    'success': False,
+                    'message': f'不支持的模型类型: {model_type}'
+                }
+            
+            from sklearn.model_selection import train_test_split, cross_val_score
+            
+            self.feature_names = list(X.columns)
+            self.target_name = y.name if y.name else "target"
+            
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=test_size, random_state=42
+            )
+            
+            model = self.models[model_type]
+            
+            if tune_hyperparameters:
+                with phase_timer("tuning"):
+                    model = self._tune_hyperparameters(model, model_type, X_train, y_train, n_jobs=n_jobs)
+            
+            with phase_timer("fit"):
+                model.fit(X_train, y_train)
+            
+            compaction = None
+            if max_model_bytes is not None or max_latency_ms is not None:
+                model, compaction = compact_forest(model, X_test, y_test, max_model_bytes, max_latency_ms)
+                if not compaction['success']:
+                    return {
+                        'success': False,
+                        'message': f"模型无法满足指定的大小或延迟预算: {compaction['message']}",
+                        'compaction': compaction
+                    }
+            
+            y_train_pred = model.predict(X_train)
+            y_test_pred = model.predict(X_test)
+            
+            train_metrics = regression_metrics(y_train, y_train_pred)
+            test_metrics = regression_metrics(y_test, y_test_pred)
+            
+            with phase_timer("cv"):
+                cv_scores = cross_val_score(model, X, y, cv=5, scoring='r2', n_jobs=n_jobs)
+            cv_metrics = {
+                'mean': cv_scores.mean(),
+                'std': cv_scores.std(),
+                'scores': cv_scores.tolist()
+            }
+            
+            model_name = self._next_model_name(model_type)
+            model_pickle = pickle.dumps(model)
+            
+            model_info = {
+                'model_name': model_name,
+                'model_type': model_type,
+                'feature_names': self.feature_names,
+                'target_name': self.target_name,
+                'train_metrics': train_metrics,
+                'test_metrics': test_metrics,
+                'cv_metrics': cv_metrics,
+                'tuned': tune_hyperparameters,
+                'model_size_bytes': len(model_pickle)
+            }
+            if compaction is not None:
+                model_info['compaction'] = compaction
+            
+            model_data = None
+            model_info_data = None
+            if return_model:
+                import base64
+                from io import BytesIO
+                
+                model_data = base64.b64encode(model_pickle).decode('utf-8')
+                
+                info_bytes = BytesIO()
+                pickle.dump(model_info, info_bytes)
+                info_bytes.seek(0)
+                model_info_data = base64.b64encode(info_bytes.read()).decode('utf-8')
+            
+            self.trained_models[model_name] = model
+            self.model_metrics[model_name] = model_info
+            self.validation_samples[model_name] = self._validation_sample(X_test)
+            
+            result = {
+                'success': True,
+                'message': f'模型 {model_name} 训练成功',
+                'model_name': model_name,
+                'train_metrics': train_metrics,
+                'test_metrics': test_metrics,
+                'cv_metrics': cv_metrics,
+                'feature_names': self.feature_names,
+                'target_name': self.target_name,
+                'model_info': model_info
+            }
+            
+            if return_model:
+                result['model_data'] = model_data
+                result['model_info_data'] = model_info_data
+                result['model_path'] = f"memory://{model_name}"
+            
+            if not return_model:
+                result['model_path'] = self.save_model(model_name, model, model_info)
+            
+            return result
+            
+        except Exception as e:
+            logger.error("模型训练失败: %s", e)
+            return {
+                'success': False,
+                'message': f'模型训练失败: {str(e)}'
+            }
+    
+    def _next_model_name(self, model_type: str) -> str:
+        if self.name_sequence is None:
+            return f"{model_type}_{len(self.trained_models) + 1}"
+        
+        while True:
+            model_name = f"{model_type}_{self.name_sequence(model_type)}"
+            if not os.path.exists(os.path.join(self.model_dir, f"{model_name}.pkl")):
+                return model_name
+    
+    def _validation_sample(self, X_test: pd.DataFrame) -> np.ndarray:
+        return X_test.head(PREDICTION_CONFIG['validation_sample_size']).to_numpy(dtype=float)
+    
+    def save_model(self, model_name: str, model, model_info: Dict[str, Any]) -> str:
+        model_path = os.path.join(self.model_dir, f"{model_name}.pkl")
+        with open(f"{model_path}.tmp", 'wb') as f:
+            pickle.dump(model, f)
+        os.replace(f"{model_path}.tmp", model_path)
+        
+        validation_sample = self.validation_samples.get(model_name)
+        if validation_sample is not None:
+            sample_path = validation_sample_path(model_path)
+            with open(f"{sample_path}.tmp", 'wb') as f:
+                np.save(f, validation_sample, allow_pickle=False)
+            os.replace(f"{sample_path}.tmp", sample_path)
+        
+        model_info['model_path'] = model_path
+        info_path = os.path.join(self.model_dir, f"{model_name}_info.json")
+        with open(f"{info_path}.tmp", 'w') as f:
+            json.dump(model_info, f, indent=2)
+        os.replace(f"{info_path}.tmp", info_path)
+        
+        return model_path
+    
+    def compact_model(self, model_name: str, X: pd.DataFrame, y: pd.Series, test_size: float = 0.2,
+                      max_model_bytes: Optional[int] = None, max_latency_ms: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            model = self.trained_models.get(model_name)
+            model_info = self.model_metrics.get(model_name)
+            if model is None:
+                model = self.load_model(os.path.join(self.model_dir, f"{model_name}.pkl"))
+                model_info = self.load_model_info(model_name)
+            
+            if model is None or model_info is None:
+                return {
+                    'success': False,
+                    'message': f'模型 {model_name} 不存在'
+                }
+            
+            from sklearn.model_selection import train_test_split
+            
+            feature_names = model_info.get('feature_names', list(X.columns))
+            missing_features = set(feature_names) - set(X.columns)
+            if missing_features:
+                return {
+                    'success': False,
+                    'message': f'缺少特征: {list(missing_features)}'
+                }
+            
+            _, X_test, _, y_test = train_test_split(
+                X[feature_names], y, test_size=test_size, random_state=42
+            )
+            
+            compacted, compaction = compact_forest(model, X_test, y_test, max_model_bytes, max_latency_ms)
+            if not compaction['success']:
+                return compaction
+            
+            compact_name = f"{model_name}_compact"
+            compact_info = dict(model_info)
+            compact_info.update({
+                'model_name': compact_name,
+                'model_size_bytes': compaction['compacted_size_bytes'],
+                'test_metrics': compaction['compacted_metrics'],
+                'compaction': compaction,
+                'compacted_from': model_name
+            })
+            
+            self.validation_samples[compact_name] = self._validation_sample(X_test)
+            model_path = self.save_model(compact_name, compacted, compact_info)
+            self.trained_models[compact_name] = compacted
+            self.model_metrics[compact_name] = compact_info
+            
+            return {
+                'success': True,
+                'message': f'模型 {model_name} 已压缩为 {compact_name}',
+                'model_name': compact_name,
+                'model_path': model_path,
+                'compaction': compaction
+            }
+            
+        except Exception as e:
+            logger.error("模型压缩失败: %s", e)
+            return {
+                'success': False,
+                'message': f'模型压缩失败: {str(e)}'
+            }
+    
+    def _tune_hyperparameters(self, model, model_type: str, X: pd.DataFrame, y: pd.Series,
+                              n_jobs: Optional[int] = None):
+        param_grids = {
+            "ridge": {'alpha': [0.1, 1.0, 10.0, 100.0]},
+            "lasso": {'alpha': [0.1, 1.0, 10.0, 100.0]},
+            "random_forest": {
+                'n_estimators': [50, 100, 200],
+                'max_depth': [None, 10, 20, 30],
+                'min_samples_split': [2, 5, 10]
+            },
+            "gradient_boosting": {
+                'n_estimators': [50, 100, 200],
+                'learning_rate': [0.01, 0.1, 0.2],
+                'max_depth': [3, 5, 7]
+            },
+            "svr": {
+                'C': [0.1, 1, 10],
+                'gamma': ['scale', 'auto', 0.1, 1]
+            }
+        }
+        
+        if model_type in param_grids:
+            from sklearn.model_selection import GridSearchCV
+            
+            grid_search = GridSearchCV(
+                model, param_grids[model_type], cv=5, scoring='r2', n_jobs=n_jobs
+            )
+            grid_search.fit(X, y)
+            return grid_search.best_estimator_
+        
+        return model
+    
+    def get_model_metrics(self, model_name: str) -> Dict[str, Any]:
+        model_info = self.model_metrics.get(model_name)
+        if model_info is None and os.path.exists(os.path.join(self.model_dir, f"{model_name}_info.json")):
+            model_info = self.load_model_info(model_name)
+        
+        if model_info is None:
+            return {
+                'success': False,
+                'message': f'模型 {model_name} 不存在'
+            }
+        
+        return {
+            'success': True,
+            'model_metrics': model_info
+        }
+    
+    def compare_models(self, X: pd.DataFrame, y: pd.Series, test_size: float = 0.2) -> Dict[str, Any]:
+        try:
+            from sklearn.model_selection import train_test_split
+            
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=test_size, random_state=42
+            )
+            
+            comparison_results = {}
+            
+            for model_name, model in self.models.items():
+                try:
+                    model.fit(X_train, y_train)
+                    
+                    y_pred = model.predict(X_test)
+                    
+                    comparison_results[model_name] = regression_metrics(y_test, y_pred)
+                    
+                except Exception as e:
+                    logger.error("模型 %s 训练失败: %s", model_name, e)
+                    comparison_results[model_name] = {
+                        'error': str(e)
+                    }
+            
+            sorted_results = sorted(
+                comparison_results.items(),
+                key=lambda x: x[1].get('r2', float('-inf')),
+                reverse=True
+            )
+            
+            return {
+                'success': True,
+                'comparison_results': comparison_results,
+                'best_model': sorted_results[0][0] if sorted_results else None,
+                'sorted_results': sorted_results
+            }
+            
+        except Exception as e:
+            logger.error("模型比较失败: %s", e)
+            return {
+                'success': False,
+                'message': f'模型比较失败: {str(e)}'
+            }
+    
+    def load_model(self, model_path: str) -> Any:
+        try:
+            with open(model_path, 'rb') as f:
+                model = pickle.load(f)
+            return model
+        except Exception as e:
+            logger.error("加载模型失败: %s", e)
+            return None
+    
+    def load_model_info(self, model_name: str) -> Optional[Dict[str, Any]]:
+        info_path = os.path.join(self.model_dir, f"{model_name}_info.json")
+        try:
+            with open(info_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error("加载模型信息失败: %s", e)
+            return None
+
+
+def run_model_comparison(X: pd.DataFrame, y: pd.Series, test_size: float = 0.2) -> Dict[str, Any]:
+    return ModelTrainer().compare_models(X, y, test_size)
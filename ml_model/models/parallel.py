@@ -0,0 +1,53 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Tuple, Union
+
+GIL_RELEASING_MODULES = (
+    'sklearn.tree',
+    'sklearn.ensemble._forest',
+    'sklearn.ensemble._gb',
+    'sklearn.ensemble._hist_gradient_boosting',
+    'sklearn.linear_model',
+    'sklearn.svm',
+    'sklearn.neighbors'
+)
+
+
+def resolve_n_jobs(n_jobs: int) -> int:
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None or n_jobs == 0:
+        return 1
+    if n_jobs < 0:
+        return max(cpu_count + 1 + n_jobs, 1)
+    return n_jobs
+
+
+def resolve_backend(model, backend: str = "auto") -> str:
+    if backend != "auto":
+        return backend
+    if type(model).__module__.startswith(GIL_RELEASING_MODULES):
+        return "threading"
+    return "loky"
+
+
+def chunk_ranges(n_rows: int, chunk_size: int) -> List[Tuple[int, int]]:
+    chunk_size = max(int(chunk_size), 1)
+    return [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+
+
+def parallel_predict(predict_func: Callable, X: Union[np.ndarray, pd.DataFrame], chunk_size: int,
+                     n_jobs: int = -1, backend: str = "threading") -> np.ndarray:
+    ranges = chunk_ranges(len(X), chunk_size)
+    n_jobs = min(resolve_n_jobs(n_jobs), len(ranges))
+    if n_jobs <= 1:
+        return np.asarray(predict_func(X))
+
+    if isinstance(X, pd.DataFrame):
+        chunks = [X.iloc[start:end] for start, end in ranges]
+    else:
+        chunks = [X[start:end] for start, end in ranges]
+
+    from joblib import Parallel, delayed
+    results = Parallel(n_jobs=n_jobs, backend=backend)(delayed(predict_func)(chunk) for chunk in chunks)
+    return np.concatenate([np.asarray(result) for result in results])
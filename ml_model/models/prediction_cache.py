@@ -0,0 +1,107 @@
+import time
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, Tuple
+
+
+class PredictionCache:
+
+    def __init__(self, max_entries: int = 100000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._buckets: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def row_keys(X: np.ndarray) -> np.ndarray:
+        X = np.ascontiguousarray(X, dtype=np.float64) + 0.0
+        return X.view(np.dtype((np.void, X.dtype.itemsize * X.shape[1]))).ravel()
+
+    def lookup(self, model_key: Hashable, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        keys = self.row_keys(X)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        key_list = unique_keys.tolist()
+        unique_values = np.full(len(key_list), np.nan)
+        unique_found = np.zeros(len(key_list), dtype=bool)
+        now = time.monotonic()
+
+        with self._lock:
+            bucket = self._buckets.get(model_key)
+            if bucket is not None:
+                self._buckets.move_to_end(model_key)
+                for i, key in enumerate(key_list):
+                    entry = bucket.get(key)
+                    if entry is None:
+                        continue
+                    if entry[1] < now:
+                        del bucket[key]
+                        self._size -= 1
+                        continue
+                    bucket.move_to_end(key)
+                    unique_values[i] = entry[0]
+                    unique_found[i] = True
+
+        found = unique_found[inverse]
+        hits = int(found.sum())
+        with self._lock:
+            self.hits += hits
+            self.misses += len(found) - hits
+
+        return unique_values[inverse], found, keys
+
+    def store(self, model_key: Hashable, keys: np.ndarray, values: np.ndarray):
+        expires_at = time.monotonic() + self.ttl
+        items = list(zip(keys.tolist(), np.asarray(values, dtype=np.float64).tolist()))
+
+        with self._lock:
+            bucket = self._buckets.get(model_key)
+            if bucket is None:
+                bucket = self._buckets[model_key] = OrderedDict()
+            else:
+                self._buckets.move_to_end(model_key)
+
+            for key, value in items:
+                if key in bucket:
+                    bucket.move_to_end(key)
+                else:
+                    self._size += 1
+                bucket[key] = (value, expires_at)
+
+            while self._size > self.max_entries:
+                oldest_key, oldest = next(iter(self._buckets.items()))
+                if not oldest:
+                    del self._buckets[oldest_key]
+                    continue
+                oldest.popitem(last=False)
+                self._size -= 1
+                self.evictions += 1
+
+    def invalidate(self, model_name: str) -> int:
+        with self._lock:
+            stale = [model_key for model_key in self._buckets if model_key[0] == model_name]
+            removed = sum(len(self._buckets.pop(model_key)) for model_key in stale)
+            self._size -= removed
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': self._size,
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / total if total else 0.0
+            }
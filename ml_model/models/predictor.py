@@ -0,0 +1,475 @@
+import os
+import time
+import functools
+import pickle
+import json
+import logging
+import threading
+import pandas as pd
+from typing import Dict, List, Any, Optional, Union, Iterator
+from utils.helpers import serialize_numpy_pandas
+from models.model_handle import ModelHandle
+from models.compiled import load_validation_sample
+from models.prediction_cache import PredictionCache
+from utils.metrics import phase_timer
+from config.settings import PREDICTION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+USAGE_FILE = "model_usage.json"
+USAGE_FLUSH_INTERVAL = 60.0
+
+
+def _load_pickle(model_path: str):
+    with open(model_path, 'rb') as f:
+        return pickle.load(f)
+
+
+class Predictor:
+    
+    def __init__(self, models_dir: str = "saved_models", reduced_precision: Optional[bool] = None,
+                 precision_tolerance: Optional[float] = None, poll_interval: Optional[float] = None,
+                 cache_enabled: Optional[bool] = None, scan_on_init: bool = True,
+                 rescan_interval: Optional[float] = None):
+        self.models_dir = models_dir
+        self.reduced_precision = PREDICTION_CONFIG['reduced_precision'] if reduced_precision is None else reduced_precision
+        self.precision_tolerance = PREDICTION_CONFIG['precision_tolerance'] if precision_tolerance is None else precision_tolerance
+        self.current_handle: Optional[ModelHandle] = None
+        self.available_models = {}
+        self.loaded_models: Dict[str, ModelHandle] = {}
+        self.model_usage = {}
+        self._usage_flushed_at = 0.0
+        self.poll_interval = PREDICTION_CONFIG['model_poll_interval'] if poll_interval is None else poll_interval
+        self.rescan_interval = PREDICTION_CONFIG['model_rescan_interval'] if rescan_interval is None else rescan_interval
+        self._model_mtimes = {}
+        self.prediction_cache = PredictionCache(
+            max_entries=PREDICTION_CONFIG['cache_max_entries'],
+            ttl=PREDICTION_CONFIG['cache_ttl']
+        ) if (PREDICTION_CONFIG['cache_enabled'] if cache_enabled is None else cache_enabled) else None
+        self._dir_mtime = None
+        self._last_poll = 0.0
+        self._last_rescan = None
+        self._load_lock = threading.Lock()
+        self._models_lock = threading.Lock()
+        self._usage_lock = threading.Lock()
+        
+        try:
+            os.makedirs(self.models_dir, exist_ok=True)
+        except Exception as e:
+            logger.error("创建模型目录失败: %s", e)
+        
+        if scan_on_init:
+            self._load_available_models()
+        self._load_model_usage()
+    
+    @property
+    def current_model(self):
+        return self.current_handle.model if self.current_handle is not None else None
+    
+    @property
+    def current_model_name(self) -> Optional[str]:
+        return self.current_handle.model_name if self.current_handle is not None else None
+    
+    @property
+    def compiled_model(self):
+        return self.current_handle.compiled_model if self.current_handle is not None else None
+    
+    @property
+    def input_plan(self):
+        return self.current_handle.input_plan if self.current_handle is not None else None
+    
+    @property
+    def precision_report(self) -> Optional[Dict[str, Any]]:
+        return self.current_handle.precision_report if self.current_handle is not None else None
+    
+    @property
+    def model_info(self) -> Dict[str, Any]:
+        return self.current_handle.model_info if self.current_handle is not None else {}
+        
+    def _load_available_models(self):
+        self.refresh_models(force=True)
+    
+    def _scan_model_files(self) -> Dict[str, int]:
+        infos = {}
+        pickles = {}
+        
+        with os.scandir(self.models_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('_info.json'):
+                    infos[entry.name[:-len('_info.json')]] = entry.stat().st_mtime_ns
+                elif entry.name.endswith('.pkl'):
+                    pickles[entry.name[:-len('.pkl')]] = entry.stat().st_mtime_ns
+        
+        return {
+            model_name: max(mtime, pickles.get(model_name, 0))
+            for model_name, mtime in infos.items()
+        }
+    
+    def refresh_models(self, force: bool = False) -> Dict[str, List[str]]:
+        changes = {'added': [], 'changed': [], 'removed': []}
+        
+        now = time.monotonic()
+        if not force and now - self._last_poll < self.poll_interval:
+            return changes
+        
+        if not self._models_lock.acquire(blocking=force):
+            return changes
+        
+        try:
+            self._last_poll = now
+            
+            try:
+                dir_mtime = os.stat(self.models_dir).st_mtime_ns
+            except OSError:
+                return changes
+            
+            if not force and dir_mtime == self._dir_mtime:
+                return changes
+            
+            try:
+                model_files = self._scan_model_files()
+            except OSError as e:
+                logger.warning("扫描模型目录失败: %s", e)
+                self._dir_mtime = None
+                return changes
+            
+            for model_name in list(self.available_models.keys()):
+                if model_name not in model_files:
+                    del self.available_models[model_name]
+                    self._model_mtimes.pop(model_name, None)
+                    self.loaded_models.pop(model_name, None)
+                    if self.prediction_cache is not None:
+                        self.prediction_cache.invalidate(model_name)
+                    changes['removed'].append(model_name)
+            
+            complete = True
+            for model_name, mtime in model_files.items():
+                previous = self._model_mtimes.get(model_name)
+                if previous == mtime:
+                    continue
+                
+                info_path = os.path.join(self.models_dir, f"{model_name}_info.json")
+                try:
+                    with open(info_path, 'r') as f:
+                        model_info = json.load(f)
+                except Exception as e:
+                    logger.warning("加载模型信息失败 %s: %s", model_name, e)
+                    complete = False
+                    continue
+                
+                self.available_models[model_name] = model_info
+                self._model_mtimes[model_name] = mtime
+                
+                if previous is None:
+                    changes['added'].append(model_name)
+                else:
+                    self.loaded_models.pop(model_name, None)
+                    if self.prediction_cache is not None:
+                        self.prediction_cache.invalidate(model_name)
+                    changes['changed'].append(model_name)
+            
+            self._dir_mtime = dir_mtime if complete else None
+        finally:
+            self._models_lock.release()
+        
+        if self.current_model_name in changes['changed']:
+            try:
+                self.current_handle = self.get_handle(self.current_model_name)
+            except ValueError as e:
+                logger.warning("重新加载当前模型失败: %s", e)
+        
+        if any(changes.values()):
+            logger.info(
+                "模型目录已更新: 新增 %s, 变更 %s, 删除 %s",
+                changes['added'], changes['changed'], changes['removed']
+            )
+        
+        return changes
+    
+    def _load_model_usage(self):
+        usage_path = os.path.join(self.models_dir, USAGE_FILE)
+        if not os.path.exists(usage_path):
+            return
+        
+        try:
+            with open(usage_path, 'r') as f:
+                self.model_usage = json.load(f)
+        except Exception as e:
+            logger.warning("加载模型使用记录失败: %s", e)
+    
+    def _record_usage(self, model_name: str, flush: bool = False):
+        now = time.time()
+        self.model_usage[model_name] = now
+        
+        if not flush and now - self._usage_flushed_at < USAGE_FLUSH_INTERVAL:
+            return
+        
+        if not self._usage_lock.acquire(blocking=False):
+            return
+        
+        try:
+            with open(os.path.join(self.models_dir, USAGE_FILE), 'w') as f:
+                json.dump(dict(self.model_usage), f)
+            self._usage_flushed_at = now
+        except Exception as e:
+            logger.warning("保存模型使用记录失败: %s", e)
+        finally:
+            self._usage_lock.release()
+    
+    def get_available_models(self) -> List[str]:
+        self.refresh_models()
+        return list(self.available_models.keys())
+    
+    def has_model(self, model_name: str) -> bool:
+        if model_name in self.get_available_models():
+            return True
+        
+        now = time.monotonic()
+        if self._last_rescan is not None and now - self._last_rescan < self.rescan_interval:
+            return False
+        self._last_rescan = now
+        
+        self.refresh_models(force=True)
+        return model_name in self.available_models
+    
+    def get_memory_usage(self) -> Dict[str, int]:
+        handles = dict(self.loaded_models)
+        if self.current_handle is not None:
+            handles.setdefault(self.current_handle.model_name, self.current_handle)
+        
+        usage = {}
+        for model_name, handle in handles.items():
+            size = handle.model_info.get('model_size_bytes')
+            if size is None:
+                model_path = os.path.join(self.models_dir, f"{model_name}.pkl")
+                size = os.path.getsize(model_path) if os.path.exists(model_path) else 0
+            usage[model_name] = int(size)
+        return usage
+    
+    def get_recent_models(self, limit: int) -> List[str]:
+        self.refresh_models()
+        models = sorted(
+            list(self.available_models.keys()),
+            key=lambda name: self.model_usage.get(name, 0),
+            reverse=True
+        )
+        return models[:limit]
+    
+    def _build_handle(self, model_name: str, model, model_info: Dict[str, Any], version: Optional[int],
+                      validation_sample=None, model_loader=None) -> ModelHandle:
+        return ModelHandle.build(
+            model_name, model, model_info,
+            version=version,
+            reduced_precision=self.reduced_precision,
+            precision_tolerance=self.precision_tolerance,
+            prediction_cache=self.prediction_cache,
+            validation_sample=validation_sample,
+            model_loader=model_loader
+        )
+    
+    def _load_handle(self, model_path: str, model_name: str, version: Optional[int] = None) -> ModelHandle:
+        with phase_timer("model_load"):
+            model = _load_pickle(model_path)
+            
+            info_path = model_path.replace('.pkl', '_info.json')
+            if os.path.exists(info_path):
+                with open(info_path, 'r') as f:
+                    model_info = json.load(f)
+            else:
+                model_info = {}
+            
+            validation_sample = load_validation_sample(model_path) if self.reduced_precision else None
+            return self._build_handle(model_name, model, model_info, version, validation_sample,
+                                      functools.partial(_load_pickle, model_path))
+    
+    def _load_result(self, handle: ModelHandle) -> Dict[str, Any]:
+        result = {
+            'success': True,
+            'message': f'模型加载成功: {handle.model_name}',
+            'model_name': handle.model_name
+        }
+        if handle.precision_report is not None:
+            result['precision'] = handle.precision_report
+        return result
+    
+    def load_model(self, model_path: str) -> Dict[str, Any]:
+        try:
+            model_name = os.path.basename(model_path).replace('.pkl', '')
+            self.current_handle = self._load_handle(model_path, model_name)
+            return self._load_result(self.current_handle)
+            
+        except Exception as e:
+            return {
+                'success': False,
+                'message': f'模型加载失败: {str(e)}'
+            }
+    
+    def get_handle(self, model_name: Optional[str] = None) -> ModelHandle:
+        self.refresh_models()
+        
+        if model_name is None:
+            handle = self.current_handle
+            if handle is None:
+                raise ValueError('没有加载的模型')
+            return handle
+        
+        handle = self.loaded_models.get(model_name)
+        if handle is not None:
+            self._record_usage(model_name)
+            return handle
+        
+        if model_name not in self.available_models:
+            self.refresh_models()
+        if model_name not in self.available_models:
+            raise ValueError(f'模型不存在: {model_name}')
+        
+        with self._load_lock:
+            handle = self.loaded_models.get(model_name)
+            if handle is None:
+                model_path = os.path.join(self.models_dir, f"{model_name}.pkl")
+                version = self._model_mtimes.get(model_name)
+                try:
+                    handle = self._load_handle(model_path, model_name, version)
+                except Exception as e:
+                    raise ValueError(f'模型加载失败: {str(e)}')
+                with self._models_lock:
+                    if self._model_mtimes.get(model_name) == version:
+                        self.loaded_models[model_name] = handle
+                self._record_usage(model_name, flush=True)
+        
+        return handle
+    
+    def set_current_model(self, model_name: str) -> Dict[str, Any]:
+        try:
+            self.current_handle = self.get_handle(model_name)
+        except ValueError as e:
+            return {
+                'success': False,
+                'message': str(e)
+            }
+        
+        return self._load_result(self.current_handle)
+    
+    def warmup(self, model_names: Optional[List[str]] = None, top_n: Optional[int] = None) -> Dict[str, Any]:
+        if model_names is None:
+            model_names = self.get_recent_models(top_n if top_n is not None else PREDICTION_CONFIG['warmup_top_n'])
+        
+        started = time.perf_counter()
+        report = []
+        
+        for model_name in model_names:
+            item = {'model_name': model_name, 'success': False}
+            
+            phase_started = time.perf_counter()
+            try:
+                handle = self.get_handle(model_name)
+            except ValueError as e:
+                handle = None
+                item['message'] = str(e)
+            item['load_ms'] = (time.perf_counter() - phase_started) * 1000
+            
+            if handle is None:
+                logger.warning("模型预热失败 %s: %s", model_name, item['message'])
+                report.append(item)
+                continue
+            
+            dummy = handle.dummy_input()
+            if dummy is not None:
+                phase_started = time.perf_counter()
+                predict_result = handle.predict(dummy)
+                item['predict_ms'] = (time.perf_counter() - phase_started) * 1000
+                if not predict_result['success']:
+                    item['message'] = predict_result['message']
+            
+            item['success'] = 'message' not in item
+            logger.info(
+                "模型预热 %s: 加载 %.1fms, 首次预测 %.1fms",
+                model_name, item['load_ms'], item.get('predict_ms', 0.0),
+                extra={'model_name': model_name, 'load_ms': item['load_ms'], 'predict_ms': item.get('predict_ms')}
+            )
+            report.append(item)
+            
+            if self.current_handle is None and item['success']:
+                self.current_handle = handle
+        
+        total_ms = (time.perf_counter() - started) * 1000
+        logger.info("模型预热完成: %s 个模型, 总耗时 %.1fms", len(report), total_ms, extra={'duration_ms': total_ms})
+        
+        return {
+            'success': all(item['success'] for item in report),
+            'models': report,
+            'loaded_count': sum(1 for item in report if item['success']),
+            'total_ms': total_ms
+        }
+    
+    def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        handle = self.current_handle
+        if handle is None:
+            return {
+                'success': False,
+                'message': '没有加载的模型'
+            }
+        
+        return handle.predict(data)
+    
+    def batch_predict(self, data: Union[List[Dict[str, Any]], pd.DataFrame], serialize: bool = True) -> Dict[str, Any]:
+        handle = self.current_handle
+        if handle is None:
+            return {
+                'success': False,
+                'message': '没有加载的模型'
+            }
+        
+        return handle.batch_predict(data, serialize)
+    
+    def stream_predict(self, chunks: Iterator[pd.DataFrame], format: str = "ndjson",
+                       include_input: bool = False) -> Iterator[bytes]:
+        handle = self.current_handle
+        if handle is None:
+            raise ValueError('没有加载的模型')
+        
+        return handle.stream_predict(chunks, format, include_input)
+    
+    def export_predictions(self, data: Union[List[Dict[str, Any]], pd.DataFrame], output_path: str, format: str = "csv",
+                           chunk_size: Optional[int] = None) -> Dict[str, Any]:
+        handle = self.current_handle
+        if handle is None:
+            return {
+                'success': False,
+                'message': '没有加载的模型'
+            }
+        
+        return handle.export_predictions(data, output_path, format, chunk_size)
+    
+    def get_model_info(self, model_name: Optional[str] = None) -> Dict[str, Any]:
+        if model_name is None:
+            model_name = self.current_model_name
+        
+        if model_name is None:
+            return {
+                'success': False,
+                'message': '没有指定的模型'
+            }
+        
+        self.refresh_models()
+        if model_name not in self.available_models:
+            return {
+                'success': False,
+                'message': f'模型不存在: {model_name}'
+            }
+        
+        model_info = dict(self.available_models[model_name])
+        if 'model_size_bytes' not in model_info:
+            model_path = os.path.join(self.models_dir, f"{model_name}.pkl")
+            if os.path.exists(model_path):
+                model_info['model_size_bytes'] = os.path.getsize(model_path)
+        
+        result = {
+            'success': True,
+            'model_info': serialize_numpy_pandas(model_info)
+        }
+        handle = self.loaded_models.get(model_name)
+        if handle is not None and handle.precision_report is not None:
+            result['precision'] = handle.precision_report
+        
+        return result
\ No newline at end of file
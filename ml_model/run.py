@@ -1,17 +1,14 @@
 import os
 import sys
+import time
 import argparse
 import logging
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from api import run_api
 from config import API_CONFIG
+from utils.logging_setup import configure_logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 def main():
@@ -19,24 +16,40 @@ def main():
     parser.add_argument('--host', default=API_CONFIG['host'], help='服务器主机地址')
     parser.add_argument('--port', type=int, default=API_CONFIG['port'], help='服务器端口')
     parser.add_argument('--debug', action='store_true', help='启用调试模式')
+    parser.add_argument('--workers', type=int, default=API_CONFIG['workers'], help='工作进程数')
+    parser.add_argument('--profile-imports', nargs='?', type=int, const=20, default=None, metavar='N',
+                        help='分析应用启动时各模块的导入耗时并输出前N项, 不启动服务')
     
     args = parser.parse_args()
     
-    logger.info(f"启动机器学习数据分析与统计系统")
-    logger.info(f"服务地址: http://{args.host}:{args.port}")
-    logger.info(f"调试模式: {'开启' if args.debug else '关闭'}")
+    if args.profile_imports is not None:
+        from utils.startup import profile_imports, format_import_profile
+        report = profile_imports("api.ml_api", top_n=args.profile_imports)
+        print(format_import_profile(report))
+        sys.exit(0 if report['success'] else 1)
+    
+    configure_logging()
+    
+    logger.info("启动机器学习数据分析与统计系统")
+    logger.info("服务地址: http://%s:%s", args.host, args.port)
+    logger.info("调试模式: %s", '开启' if args.debug else '关闭')
+    logger.info("工作进程数: %s", args.workers)
     
     os.makedirs("saved_models", exist_ok=True)
     os.makedirs("uploads", exist_ok=True)
     os.makedirs("logs", exist_ok=True)
     os.makedirs("saved_models",exist_ok=True)
     
+    started = time.perf_counter()
+    from api import run_api
+    logger.info("应用导入耗时: %.1fms", (time.perf_counter() - started) * 1000)
+    
     try:
-        run_api(host=args.host, port=args.port, debug=args.debug)
+        run_api(host=args.host, port=args.port, debug=args.debug, workers=args.workers)
     except KeyboardInterrupt:
         logger.info("服务已停止")
     except Exception as e:
-        logger.error(f"服务启动失败: {str(e)}")
+        logger.error("服务启动失败: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":
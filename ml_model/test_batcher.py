@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.batcher import MicroBatcher
+from api.executors import WorkerPool
+
+
+@pytest.fixture
+def predictor(make_predictor):
+    X = pd.DataFrame({'area': np.arange(50, dtype=float), 'rooms': np.arange(50, dtype=float) % 5})
+    return make_predictor(X, 2 * X['area'] + X['rooms'])[0]
+
+
+def test_concurrent_requests_are_batched(predictor):
+    batcher = MicroBatcher(predictor, max_wait_ms=20, max_batch_size=64)
+    rows = [{'area': float(i), 'rooms': float(i % 5)} for i in range(10)]
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict('linear_regression_1', row) for row in rows))
+
+    results = asyncio.run(run())
+
+    assert all(result['success'] for result in results)
+    assert [result['prediction'] for result in results] == pytest.approx([2 * r['area'] + r['rooms'] for r in rows])
+    stats = batcher.get_stats()
+    assert stats['batch_size']['count'] == 1
+    assert stats['batch_size']['sum'] == 10
+    assert stats['queue_wait_ms']['count'] == 10
+
+
+def test_batch_flushes_at_max_size_and_isolates_bad_rows(predictor):
+    batcher = MicroBatcher(predictor, max_wait_ms=1000, max_batch_size=3)
+    rows = [{'area': 1.0, 'rooms': 1.0}, {'area': 2.0}, {'area': 3.0, 'rooms': 0.0}]
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.predict('linear_regression_1', row) for row in rows)),
+            timeout=0.5
+        )
+
+    results = asyncio.run(run())
+
+    assert [result['success'] for result in results] == [True, False, True]
+    assert '缺少特征' in results[1]['message']
+
+
+def test_batches_run_in_worker_pool(predictor):
+    pool = WorkerPool("inference", 1)
+    batcher = MicroBatcher(predictor, max_wait_ms=5, max_batch_size=64, pool=pool)
+    rows = [{'area': float(i), 'rooms': 1.0} for i in range(5)]
+    resolved_on = []
+    get_handle = predictor.get_handle
+
+    def recording_get_handle(model_name=None):
+        resolved_on.append(threading.current_thread().name)
+        return get_handle(model_name)
+
+    predictor.get_handle = recording_get_handle
+
+    async def run():
+        return await asyncio.gather(*(batcher.predict('linear_regression_1', row) for row in rows))
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        pool.shutdown(wait=True)
+
+    assert [result['prediction'] for result in results] == pytest.approx([2 * r['area'] + 1.0 for r in rows])
+    assert all(name.startswith('inference') for name in resolved_on) and len(resolved_on) == len(rows)
+    assert batcher.get_stats()['batch_size']['sum'] == len(rows)
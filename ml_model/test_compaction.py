@@ -0,0 +1,64 @@
+import os
+import numpy as np
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+
+from models.compaction import compact_forest, model_size_bytes
+from models.model_trainer import ModelTrainer
+from models.compiled import validation_sample_path
+
+
+def test_compact_forest_fits_byte_budget(make_data):
+    X, y = make_data(400)
+    model = RandomForestRegressor(n_estimators=40, random_state=42).fit(X, y)
+    budget = model_size_bytes(model) // 4
+
+    compacted, report = compact_forest(model, X.tail(100), y.tail(100), max_bytes=budget)
+
+    assert report['success']
+    assert report['compacted_trees'] < 40
+    assert model_size_bytes(compacted) <= budget
+    assert report['compacted_size_bytes'] <= budget
+    assert 'r2' in report['compacted_metrics']
+    assert len(model.estimators_) == 40
+
+
+def test_compact_forest_rejects_unsupported_or_impossible_budget(make_data):
+    X, y = make_data(100)
+
+    _, report = compact_forest(LinearRegression().fit(X, y), X, y, max_bytes=1000)
+    assert not report['success']
+
+    model = RandomForestRegressor(n_estimators=5, random_state=42).fit(X, y)
+    compacted, report = compact_forest(model, X, y, max_bytes=10)
+    assert not report['success']
+    assert compacted is model
+
+
+def test_train_model_reports_size_and_compacts(tmp_path, monkeypatch, make_data):
+    monkeypatch.chdir(tmp_path)
+    X, y = make_data(400)
+    trainer = ModelTrainer()
+
+    result = trainer.train_model(X, y, model_type='random_forest', return_model=False)
+    assert result['success']
+    full_size = result['model_info']['model_size_bytes']
+    assert full_size > 0
+    assert 'validation_sample' not in result['model_info']
+    assert np.load(validation_sample_path(result['model_path'])).shape == (len(X) // 5, X.shape[1])
+
+    compact = trainer.compact_model(result['model_name'], X, y, max_model_bytes=full_size // 2)
+    assert compact['success']
+    assert compact['model_name'] == 'random_forest_1_compact'
+    assert os.path.getsize(compact['model_path']) <= full_size // 2
+
+    trained = trainer.train_model(X, y, model_type='random_forest', max_model_bytes=full_size // 2)
+    assert trained['success']
+    assert trained['model_info']['compaction']['success']
+    assert trained['model_info']['model_size_bytes'] <= full_size // 2
+
+    rejected = trainer.train_model(X, y, model_type='linear_regression', max_model_bytes=full_size // 2)
+    assert not rejected['success']
+    assert not rejected['compaction']['success']
+    assert not any(name.startswith('linear_regression') for name in trainer.get_trained_models())
+    assert not any(name.startswith('linear_regression') for name in os.listdir(trainer.model_dir))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge, Lasso
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.svm import SVR
+
+from models.compiled import compile_model
+from models.predictor import Predictor
+
+
+@pytest.mark.parametrize('model', [
+    LinearRegression(),
+    Ridge(alpha=1.0),
+    Lasso(alpha=0.1),
+    DecisionTreeRegressor(random_state=42),
+    RandomForestRegressor(n_estimators=20, random_state=42),
+    GradientBoostingRegressor(n_estimators=30, random_state=42)
+])
+def test_compiled_matches_estimator(model, make_data):
+    X, y = make_data()
+    model.fit(X, y)
+
+    compiled = compile_model(model)
+    assert compiled is not None
+    assert compiled.feature_names == list(X.columns)
+
+    expected = model.predict(X)
+    actual = compiled.predict(X.to_numpy(dtype=np.float64))
+    np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-8)
+
+    single = compiled.predict(X.to_numpy(dtype=np.float64)[:1])
+    np.testing.assert_allclose(single, expected[:1], rtol=1e-10, atol=1e-8)
+
+
+def test_unsupported_model_is_not_compiled(make_data):
+    X, y = make_data(50)
+    assert compile_model(SVR().fit(X, y)) is None
+
+
+def test_predictor_uses_compiled_form(tmp_path, make_data, save_model):
+    X, y = make_data()
+    model = RandomForestRegressor(n_estimators=10, random_state=42).fit(X, y)
+
+    save_model('random_forest_1', model, list(X.columns))
+
+    predictor = Predictor(models_dir=str(tmp_path))
+    assert predictor.set_current_model('random_forest_1')['success']
+    assert predictor.compiled_model is not None
+
+    row = {'area': 120.0, 'rooms': 3, 'age': 10.0, 'price': 500}
+    result = predictor.predict(row)
+    assert result['success']
+    expected = model.predict(pd.DataFrame([row])[list(X.columns)])[0]
+    assert result['prediction'] == pytest.approx(expected)
+
+    batch = predictor.batch_predict(X.head(20).to_dict('records'))
+    np.testing.assert_allclose(batch['predictions'], model.predict(X.head(20)))
+
+
+def test_fast_path_matches_dataframe_path(tmp_path, make_data, save_model):
+    X, y = make_data()
+    model = LinearRegression().fit(X, y)
+
+    save_model('linear_regression_1', model, list(X.columns))
+
+    predictor = Predictor(models_dir=str(tmp_path))
+    predictor.set_current_model('linear_regression_1')
+    assert predictor.input_plan is not None
+
+    row = {'age': 10.0, 'rooms': 3, 'area': 120.0, 'price': 500}
+    fast = predictor.predict(row)
+
+    slow = predictor.get_handle('linear_regression_1').replace(input_plan=None).predict(row)
+
+    assert fast['prediction'] == pytest.approx(slow['prediction'], rel=1e-12)
+    assert fast['model_name'] == slow['model_name']
+
+    missing = predictor.predict({'area': 120.0})
+    assert not missing['success']
+    assert 'rooms' in missing['message']
+
+    fallback = predictor.predict({'area': 120.0, 'rooms': 3, 'age': None})
+    assert not fallback['success']
+    assert '预测失败' in fallback['message']
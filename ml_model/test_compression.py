@@ -0,0 +1,79 @@
+import gzip
+import json
+import numpy as np
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.compression import CompressionMiddleware, negotiate_encoding
+from api.encodings import predictions_to_columns
+from api.responses import NumpyJSONResponse, records_to_columns
+
+
+def make_client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/rows")
+    async def rows(n: int):
+        return NumpyJSONResponse({"values": np.arange(n, dtype=np.float64)})
+
+    @app.get("/stream")
+    async def stream():
+        return StreamingResponse(
+            (json.dumps({"row_index": i}).encode() + b'\n' for i in range(500)),
+            media_type="application/x-ndjson"
+        )
+
+    return TestClient(app)
+
+
+async def _run_inline(func, *args):
+    return func(*args)
+
+
+def test_negotiate_encoding_respects_quality():
+    assert negotiate_encoding(None, ["br", "gzip"]) == "identity"
+    assert negotiate_encoding("gzip, deflate", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=1.0, br;q=0.5", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("br, gzip", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("*;q=0.3, br;q=0", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("gzip;q=0", ["gzip"]) == "identity"
+
+
+def test_compresses_above_threshold_and_streams():
+    client = make_client(minimum_size=1024, offload_size=0, offload=_run_inline)
+
+    small = client.get("/rows", params={"n": 3}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert small.json() == {"values": [0.0, 1.0, 2.0]}
+
+    large = client.get("/rows", params={"n": 5000}, headers={"Accept-Encoding": "gzip"})
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["vary"] == "Accept-Encoding"
+    assert int(large.headers["content-length"]) < len(NumpyJSONResponse({"values": np.arange(5000.0)}).body)
+    assert large.json()["values"][-1] == 4999.0
+
+    identity = client.get("/rows", params={"n": 5000}, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b''.join(response.iter_raw())
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert [json.loads(line)["row_index"] for line in lines] == list(range(500))
+
+
+def test_column_oriented_shapes():
+    records = [{"area": 1.0, "city": "北京"}, {"area": 2.0, "rooms": 3}]
+    assert records_to_columns(records) == {
+        "columns": ["area", "city", "rooms"],
+        "data": {"area": [1.0, 2.0], "city": ["北京", None], "rooms": [None, 3]}
+    }
+
+    shaped = predictions_to_columns(np.array([0, 1]), np.array([[0.9, 0.1], [0.2, 0.8]]))
+    assert json.loads(NumpyJSONResponse(shaped).body) == {
+        "columns": ["prediction", "proba_0", "proba_1"],
+        "data": {"prediction": [0, 1], "proba_0": [0.9, 0.2], "proba_1": [0.1, 0.8]}
+    }
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from api.export_jobs import ExportJobManager
+from data.dataset_registry import DatasetRegistry
+
+
+def test_registry_resolves_current_and_evicts_oldest():
+    registry = DatasetRegistry(max_datasets=2)
+    first = registry.register(pd.DataFrame({'a': [1]}), 'first.csv')
+    second = registry.register(pd.DataFrame({'a': [1, 2]}), 'second.csv')
+
+    assert registry.get('current')['dataset_id'] == second
+    assert registry.get(first)['file_name'] == 'first.csv'
+
+    third = registry.register(pd.DataFrame({'a': [1, 2, 3]}), 'third.csv')
+    assert registry.get(first) is None
+    assert [item['dataset_id'] for item in registry.list_datasets()] == [second, third]
+    assert 'df' not in registry.list_datasets()[0]
+    assert registry.list_datasets()[1]['rows_count'] == 3
+
+
+def test_score_stored_dataset_without_input_columns(tmp_path, make_predictor):
+    X = pd.DataFrame({'area': np.arange(100, dtype=float), 'rooms': np.arange(100, dtype=float) % 4})
+    predictor, model = make_predictor(X, 2 * X['area'] + X['rooms'])
+
+    registry = DatasetRegistry()
+    dataset_id = registry.register(X.assign(price=0.0, city='x'), 'houses.csv')
+    handle = predictor.get_handle('linear_regression_1')
+    manager = ExportJobManager(str(tmp_path / 'spool'))
+
+    job = manager.submit(handle, registry.get(dataset_id)['df'], 'csv', include_input=False, source=dataset_id)
+    for _ in range(500):
+        job = manager.get(job['job_id'])
+        if job['status'] != 'pending' and job['status'] != 'running':
+            break
+        time.sleep(0.01)
+
+    assert job['status'] == 'done'
+    assert job['source'] == dataset_id
+    result = pd.read_csv(job['path'])
+    assert list(result.columns) == ['prediction']
+    np.testing.assert_allclose(result['prediction'], model.predict(X))
+    manager.shutdown()
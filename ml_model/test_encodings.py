@@ -0,0 +1,86 @@
+import io
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.encodings import (
+    JSON_MEDIA_TYPE, ARROW_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, NPY_MEDIA_TYPE,
+    EncodingUnavailable, media_type, negotiate, decode_frame, encode_predictions
+)
+
+
+def test_media_type_and_negotiation():
+    assert media_type(None) == JSON_MEDIA_TYPE
+    assert media_type('Application/X-Msgpack; charset=binary') == MSGPACK_MEDIA_TYPE
+    assert negotiate(None) == JSON_MEDIA_TYPE
+    assert negotiate('*/*') == JSON_MEDIA_TYPE
+    assert negotiate('application/x-npy') == NPY_MEDIA_TYPE
+    assert negotiate('application/json;q=0.5, application/vnd.apache.arrow.stream') == ARROW_MEDIA_TYPE
+    assert negotiate('application/x-npy;q=0, application/json') == JSON_MEDIA_TYPE
+
+
+def test_npy_round_trip():
+    X = np.arange(6, dtype=np.float64).reshape(3, 2)
+    buffer = io.BytesIO()
+    np.save(buffer, X)
+
+    df, model_name = decode_frame(NPY_MEDIA_TYPE, buffer.getvalue(), ['area', 'rooms'])
+    assert model_name is None
+    assert list(df.columns) == ['area', 'rooms']
+    np.testing.assert_array_equal(df.to_numpy(), X)
+
+    with pytest.raises(ValueError, match='列名'):
+        decode_frame(NPY_MEDIA_TYPE, buffer.getvalue(), None)
+    with pytest.raises(ValueError, match='2列'):
+        decode_frame(NPY_MEDIA_TYPE, buffer.getvalue(), ['area'])
+
+    content = encode_predictions(NPY_MEDIA_TYPE, {'predictions': [1.5, 2.5, 3.5], 'model_name': 'm', 'count': 3})
+    np.testing.assert_array_equal(np.load(io.BytesIO(content)), [1.5, 2.5, 3.5])
+
+
+def test_arrow_round_trip():
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.ipc
+
+    frame = pd.DataFrame({'area': [100.0, 120.0], 'rooms': [2.0, 3.0]})
+    table = pa.Table.from_pandas(frame, preserve_index=False).replace_schema_metadata({'model_name': 'ridge_1'})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    df, model_name = decode_frame(ARROW_MEDIA_TYPE, sink.getvalue().to_pybytes())
+    assert model_name == 'ridge_1'
+    pd.testing.assert_frame_equal(df, frame)
+
+    result = {
+        'predictions': np.array([0, 1]),
+        'predictions_proba': np.array([[0.9, 0.1], [0.2, 0.8]]),
+        'model_name': 'logistic_1',
+        'count': 2
+    }
+    output = pa.ipc.open_stream(encode_predictions(ARROW_MEDIA_TYPE, result)).read_all()
+    assert output.column_names == ['prediction', 'proba_0', 'proba_1']
+    assert output.schema.metadata[b'model_name'] == b'logistic_1'
+    assert output.column('proba_1').to_pylist() == [0.1, 0.8]
+
+
+def test_msgpack_round_trip_or_unavailable():
+    try:
+        import msgpack
+    except ImportError:
+        with pytest.raises(EncodingUnavailable):
+            decode_frame(MSGPACK_MEDIA_TYPE, b'')
+        return
+
+    body = msgpack.packb({'model_name': 'ridge_1', 'data': {'area': [100.0, 120.0], 'rooms': [2.0, 3.0]}})
+    df, model_name = decode_frame(MSGPACK_MEDIA_TYPE, body)
+    assert model_name == 'ridge_1'
+    assert df['rooms'].tolist() == [2.0, 3.0]
+
+    content = encode_predictions(MSGPACK_MEDIA_TYPE, {'predictions': np.array([1.0, 2.0]), 'model_name': 'm', 'count': 2})
+    assert msgpack.unpackb(content)['predictions'] == [1.0, 2.0]
+
+
+def test_unknown_encoding_is_rejected():
+    with pytest.raises(EncodingUnavailable):
+        decode_frame('text/xml', b'<rows/>')
@@ -0,0 +1,71 @@
+import os
+import math
+import time
+import asyncio
+import threading
+import pytest
+
+from api.executors import WorkerPool, resolve_pool_size
+
+
+def test_pool_runs_work_off_the_event_loop():
+    pool = WorkerPool("test", 2)
+    loop_thread = threading.get_ident()
+
+    async def run():
+        return await asyncio.gather(*(pool.run(lambda: threading.get_ident()) for _ in range(4)))
+
+    try:
+        thread_ids = asyncio.run(run())
+    finally:
+        pool.shutdown(wait=True)
+
+    assert loop_thread not in thread_ids
+    stats = pool.get_stats()
+    assert stats['submitted'] == stats['completed'] == 4
+    assert stats['active'] == stats['queued'] == 0
+    assert stats['run_ms']['count'] == 4
+
+
+def test_saturation_and_errors_are_reported():
+    pool = WorkerPool("test", 1)
+    release = threading.Event()
+
+    def fail():
+        raise ValueError('boom')
+
+    try:
+        blocked = [pool.submit(release.wait) for _ in range(3)]
+        stats = pool.get_stats()
+        assert stats['active'] == 1
+        assert stats['queued'] == 2
+        assert stats['saturation'] == 1.0
+
+        release.set()
+        for future in blocked:
+            future.result(timeout=5)
+
+        with pytest.raises(ValueError, match='boom'):
+            pool.submit(fail).result(timeout=5)
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
+
+    stats = pool.get_stats()
+    assert stats['completed'] == 4
+    assert stats['failed'] == 1
+    assert stats['queue_wait_ms']['count'] == 3
+
+
+def test_process_pool():
+    pool = WorkerPool("test", 1, kind="process")
+    try:
+        assert pool.submit(math.factorial, 10).result(timeout=60) == 3628800
+    finally:
+        pool.shutdown(wait=True)
+
+    assert resolve_pool_size(3) == 3
+    assert resolve_pool_size(None) >= 5
+    assert resolve_pool_size(0, "process") == (os.cpu_count() or 1)
+    with pytest.raises(ValueError):
+        WorkerPool("test", 1, kind="fiber")
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+from models.exporter import export_file_extension
+
+
+@pytest.fixture
+def fitted(make_predictor):
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame({'area': rng.normal(100, 30, 250), 'rooms': rng.integers(1, 6, 250).astype(float)})
+    predictor, model = make_predictor(X, 3 * X['area'] + 10 * X['rooms'])
+    return predictor, X, model
+
+
+READERS = {
+    'csv': pd.read_csv,
+    'json': pd.read_json,
+    'excel': pd.read_excel,
+    'parquet': pd.read_parquet,
+    'arrow': pd.read_feather
+}
+
+
+@pytest.mark.parametrize('format', list(READERS))
+def test_export_predictions_in_chunks(tmp_path, fitted, format):
+    if format in ('parquet', 'arrow'):
+        pytest.importorskip('pyarrow')
+
+    predictor, X, model = fitted
+    data = X.assign(id=np.arange(len(X))).to_dict('records')
+    output_path = str(tmp_path / f'predictions.{export_file_extension(format)}')
+
+    result = predictor.export_predictions(data, output_path, format, chunk_size=100)
+
+    assert result['success'], result.get('message')
+    assert result['count'] == 250
+    exported = READERS[format](output_path)
+    assert list(exported.columns) == ['area', 'rooms', 'id', 'prediction']
+    assert exported['id'].tolist() == list(range(250))
+    np.testing.assert_allclose(exported['prediction'], model.predict(X), rtol=1e-9)
+
+
+def test_export_rejects_unknown_format_and_missing_features(tmp_path, fitted):
+    predictor, X, _ = fitted
+
+    result = predictor.export_predictions(X.to_dict('records'), str(tmp_path / 'out.xml'), 'xml')
+    assert not result['success']
+    assert '不支持的导出格式' in result['message']
+
+    result = predictor.export_predictions(X[['area']].to_dict('records'), str(tmp_path / 'out.csv'), 'csv')
+    assert not result['success']
+    assert '缺少特征' in result['message']
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_arrow_export_promotes_mixed_numeric_chunks(tmp_path, fitted, format):
+    pytest.importorskip('pyarrow')
+    predictor, _, model = fitted
+    data = [{'area': 100, 'rooms': 2}, {'area': 120, 'rooms': 3}, {'area': 110.5, 'rooms': 2}]
+    output_path = str(tmp_path / f'mixed.{format}')
+
+    result = predictor.export_predictions(data, output_path, format, chunk_size=2)
+
+    assert result['success'], result.get('message')
+    exported = READERS[format](output_path)
+    assert exported['area'].tolist() == [100.0, 120.0, 110.5]
+    np.testing.assert_allclose(exported['prediction'], model.predict(pd.DataFrame(data)), rtol=1e-9)
+
+
+@pytest.mark.parametrize('format', list(READERS))
+def test_export_empty_input(tmp_path, fitted, format):
+    if format in ('parquet', 'arrow'):
+        pytest.importorskip('pyarrow')
+
+    predictor, _, _ = fitted
+    output_path = str(tmp_path / f'empty.{export_file_extension(format)}')
+
+    result = predictor.export_predictions([], output_path, format)
+
+    assert result['success'], result.get('message')
+    assert result['count'] == 0
+    exported = READERS[format](output_path)
+    assert len(exported) == 0
+    if format != 'json':
+        assert list(exported.columns) == ['prediction']
@@ -0,0 +1,83 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from api.export_jobs import ExportJobManager
+from utils.state_store import StateStore
+
+
+@pytest.fixture
+def fitted(make_predictor):
+    X = pd.DataFrame({'area': np.arange(100, dtype=float)})
+    predictor, _ = make_predictor(X, 2 * X['area'])
+    return predictor.get_handle('linear_regression_1'), X
+
+
+def wait_for(manager, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f'导出任务超时: {job_id}')
+
+
+def test_concurrent_jobs_write_separate_files(tmp_path, fitted):
+    handle, X = fitted
+    manager = ExportJobManager(str(tmp_path / 'spool'), ttl=60, max_workers=4)
+
+    submitted = [manager.submit(handle, X.head(n).to_dict('records'), 'csv') for n in (10, 50, 100)]
+    jobs = [wait_for(manager, item['job_id']) for item in submitted]
+
+    assert len({job['path'] for job in jobs}) == 3
+    for job, n in zip(jobs, (10, 50, 100)):
+        assert job['status'] == 'done'
+        assert manager.describe(job)['download_url'].endswith('/download')
+        result = pd.read_csv(job['path'])
+        assert len(result) == n
+        np.testing.assert_allclose(result['prediction'], 2 * result['area'], atol=1e-9)
+
+    manager.shutdown()
+
+
+def test_failed_job_and_ttl_cleanup(tmp_path, fitted):
+    handle, X = fitted
+    manager = ExportJobManager(str(tmp_path / 'spool'), ttl=0.05)
+
+    failed = wait_for(manager, manager.submit(handle, [{'rooms': 1}], 'csv')['job_id'])
+    assert failed['status'] == 'failed'
+    assert '缺少特征' in failed['message']
+    assert not os.path.exists(failed['path'])
+
+    done = wait_for(manager, manager.submit(handle, X.to_dict('records'), 'json')['job_id'])
+    assert os.path.exists(done['path'])
+
+    time.sleep(0.1)
+    assert manager.cleanup() == 2
+    assert manager.get(done['job_id']) is None
+    assert not os.path.exists(done['path'])
+
+
+def test_shutdown_keeps_shared_jobs_and_fails_unfinished(tmp_path, fitted):
+    handle, X = fitted
+    store = StateStore(str(tmp_path / 'state.db'))
+    worker = ExportJobManager(str(tmp_path / 'spool'), ttl=60, store=store)
+    other = ExportJobManager(str(tmp_path / 'spool'), ttl=60, store=store)
+
+    done = wait_for(worker, worker.submit(handle, X.to_dict('records'), 'csv')['job_id'])
+    pending = {**done, 'job_id': 'pending', 'status': 'pending', 'finished_at': None}
+    worker.jobs['pending'] = pending
+    store.put_job({**pending, 'job_id': 'orphan', 'status': 'running', 'pid': 2 ** 22 + 1})
+
+    worker.shutdown()
+
+    assert other.get(done['job_id'])['status'] == 'done'
+    assert os.path.exists(done['path'])
+    assert other.get('pending')['status'] == 'failed'
+    orphan = other.get('orphan')
+    assert orphan['status'] == 'failed' and orphan['finished_at'] is not None
+    assert 'pid' not in other.describe(orphan)
@@ -0,0 +1,90 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+grpc = pytest.importorskip('grpc')
+
+from api.executors import WorkerPool
+from api.grpc_server import InferenceServicer, create_grpc_server
+from api.protos import inference_pb2, inference_pb2_grpc
+
+FEATURES = ['area', 'rooms', 'age']
+
+
+@pytest.fixture
+def predictor(make_predictor):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(50, 3)), columns=FEATURES)
+    return make_predictor(X, X.to_numpy() @ np.array([2.0, -1.0, 0.5]) + 3.0, 'linear_1')[0]
+
+
+def _run(predictor, client):
+    async def run():
+        pool = WorkerPool("inference", 2)
+        server, port = create_grpc_server(InferenceServicer(predictor.get_handle, pool), "127.0.0.1", 0)
+        await server.start()
+        try:
+            async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+                return await client(inference_pb2_grpc.InferenceStub(channel))
+        finally:
+            await server.stop(None)
+            pool.shutdown()
+
+    return asyncio.run(run())
+
+
+def test_unary_predict_uses_model_feature_order(predictor):
+    async def client(stub):
+        default_order = await stub.Predict(inference_pb2.PredictReq(values=[1.0, 2.0, 3.0]))
+        named = await stub.Predict(inference_pb2.PredictReq(
+            model_name='linear_1', feature_names=['age', 'area', 'rooms'], values=[3.0, 1.0, 2.0]
+        ))
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            await stub.Predict(inference_pb2.PredictReq(values=[1.0]))
+        return default_order, named, error.value
+
+    default_order, named, error = _run(predictor, client)
+    expected = predictor.predict({'area': 1.0, 'rooms': 2.0, 'age': 3.0})['prediction']
+    assert default_order.model_name == 'linear_1'
+    assert default_order.prediction == pytest.approx(expected)
+    assert named.prediction == pytest.approx(expected)
+    assert error.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_client_and_bidi_streams_match_batch_predict(predictor):
+    X = np.random.default_rng(1).normal(size=(7, 3))
+    expected = predictor.batch_predict(pd.DataFrame(X, columns=FEATURES), serialize=False)['predictions']
+    chunks = [X[:3], X[3:5], X[5:]]
+
+    def requests():
+        for sequence, chunk in enumerate(chunks):
+            yield inference_pb2.BatchReq(
+                feature_names=FEATURES if sequence == 0 else [],
+                values=chunk.ravel().tolist(),
+                sequence=sequence
+            )
+
+    async def client(stub):
+        merged = await stub.PredictBatches(requests())
+        replies = [reply async for reply in stub.StreamPredict(requests())]
+        return merged, replies
+
+    merged, replies = _run(predictor, client)
+    assert merged.count == 7 and merged.sequence == 3
+    np.testing.assert_allclose(np.asarray(merged.predictions), expected)
+    assert [reply.sequence for reply in replies] == [0, 1, 2]
+    assert [reply.count for reply in replies] == [3, 2, 2]
+    np.testing.assert_allclose(np.concatenate([np.asarray(reply.predictions) for reply in replies]), expected)
+
+
+def test_ragged_chunk_is_rejected(predictor):
+    async def client(stub):
+        with pytest.raises(grpc.aio.AioRpcError) as error:
+            await stub.PredictBatches(iter([inference_pb2.BatchReq(values=[1.0, 2.0, 3.0, 4.0])]))
+        return error.value
+
+    error = _run(predictor, client)
+    assert error.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert '整数倍' in error.details()
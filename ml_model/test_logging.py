@@ -0,0 +1,80 @@
+import json
+import queue
+import logging
+
+import pytest
+
+from api.executors import WorkerPool
+from utils.logging_setup import (
+    AsyncQueueHandler, SamplingFilter, _worker_log_path, configure_logging, shutdown_logging, set_request_id, reset_request_id
+)
+
+
+def _record(message: str, *args, level: int = logging.WARNING) -> logging.LogRecord:
+    return logging.LogRecord('test', level, __file__, 1, message, args, None)
+
+
+def test_json_records_carry_request_id_and_timing(tmp_path):
+    log_file = tmp_path / 'logs' / 'app.log'
+    configure_logging({'file': str(log_file), 'console': False, 'json': True, 'level': 'INFO'}, force=True)
+    logger = logging.getLogger('test_logging')
+    pool = WorkerPool("inference", 1)
+
+    token = set_request_id('req-1')
+    try:
+        logger.info("请求完成 %.1fms", 12.5, extra={'route': '/predict', 'duration_ms': 12.5})
+        pool.submit(logger.warning, "工作线程 %s", "inference").result()
+    finally:
+        reset_request_id(token)
+        pool.shutdown()
+    logger.info("请求之外")
+    shutdown_logging()
+
+    records = [json.loads(line) for line in log_file.read_text(encoding='utf-8').splitlines()]
+    assert [record['message'] for record in records] == ['请求完成 12.5ms', '工作线程 inference', '请求之外']
+    assert [record['request_id'] for record in records] == ['req-1', 'req-1', None]
+    assert records[0]['route'] == '/predict' and records[0]['duration_ms'] == 12.5
+    assert records[1]['level'] == 'WARNING' and records[1]['thread'].startswith('inference')
+
+
+def test_repeated_messages_are_sampled_per_template():
+    now = [0.0]
+    sampler = SamplingFilter(logging.WARNING, window=60.0, burst=2, clock=lambda: now[0])
+
+    passed = [sampler.filter(_record("预测失败: %s", i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert sampler.filter(_record("其他错误: %s", 1))
+    assert sampler.filter(_record("预测失败: %s", 0, level=logging.INFO))
+    assert all(sampler.filter(_record("预测失败: %s", i, level=logging.ERROR)) for i in range(5))
+
+    now[0] = 61.0
+    record = _record("预测失败: %s", 5)
+    assert sampler.filter(record)
+    assert record.suppressed == 3
+    assert sampler.suppressed_total == 3
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = AsyncQueueHandler(queue.Queue(maxsize=1))
+    for i in range(3):
+        handler.handle(_record("队列 %s", i))
+
+    assert handler.dropped == 2
+    assert handler.queue.get_nowait().getMessage() == '队列 0'
+
+
+def test_worker_log_files_reuse_free_slots(tmp_path):
+    pytest.importorskip('fcntl')
+    template = str(tmp_path / 'logs' / 'ml_system.{worker}.log')
+
+    first, first_slot = _worker_log_path(template)
+    second, second_slot = _worker_log_path(template)
+    assert first.endswith('ml_system.0.log')
+    assert second.endswith('ml_system.1.log')
+
+    first_slot.close()
+    restarted, restarted_slot = _worker_log_path(template)
+    assert restarted == first
+
+    restarted_slot.close()
+    second_slot.close()
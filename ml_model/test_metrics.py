@@ -0,0 +1,52 @@
+from utils.metrics import MetricsRegistry, PHASE_SECONDS, phase_timer
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', '请求数', ['route', 'status'])
+    latency = registry.histogram('latency_seconds', '耗时', [0.1, 1], ['route'])
+    registry.callback('queue_depth', '队列长度', lambda: [({'pool': 'inference'}, 3)])
+    registry.callback('hit_ratio', '命中率', lambda: 0.25)
+    registry.callback('disabled', '未启用', lambda: None)
+
+    requests.inc(route='/predict', status=200)
+    requests.inc(2, route='/predict', status=200)
+    requests.inc(route='/a"b', status=500)
+    for value in (0.05, 0.1, 0.5, 2):
+        latency.observe(value, route='/predict')
+
+    lines = registry.render().splitlines()
+    assert '# TYPE requests_total counter' in lines
+    assert 'requests_total{route="/predict",status="200"} 3' in lines
+    assert 'requests_total{route="/a\\"b",status="500"} 1' in lines
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/predict",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/predict",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/predict",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/predict"} 2.65' in lines
+    assert 'latency_seconds_count{route="/predict"} 4' in lines
+    assert 'queue_depth{pool="inference"} 3' in lines
+    assert 'hit_ratio 0.25' in lines
+    assert '# TYPE disabled gauge' in lines
+
+
+def test_failing_callback_is_skipped():
+    registry = MetricsRegistry()
+    registry.callback('broken', '异常', lambda: 1 / 0)
+    registry.callback('ok', '正常', lambda: 1)
+
+    assert registry.render() == '# HELP ok 正常\n# TYPE ok gauge\nok 1\n'
+
+
+def test_phase_timer_records_on_error():
+    before = PHASE_SECONDS.labels(phase='test_phase').snapshot()['count']
+
+    with phase_timer('test_phase'):
+        pass
+    try:
+        with phase_timer('test_phase'):
+            raise ValueError('boom')
+    except ValueError:
+        pass
+
+    assert PHASE_SECONDS.labels(phase='test_phase').snapshot()['count'] == before + 2
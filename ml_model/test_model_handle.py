@@ -0,0 +1,53 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from models.predictor import Predictor
+
+
+@pytest.fixture
+def models_dir(save_model):
+    X = pd.DataFrame({'area': np.arange(50, dtype=float)})
+    for model_name, slope in [('linear_regression_1', 2.0), ('linear_regression_2', 5.0)]:
+        models_dir = save_model(model_name, LinearRegression().fit(X, slope * X['area']), ['area'])
+    return models_dir
+
+
+def test_handles_are_immutable_and_shared(models_dir):
+    predictor = Predictor(models_dir=models_dir)
+
+    handle = predictor.get_handle('linear_regression_1')
+    assert predictor.get_handle('linear_regression_1') is handle
+    assert handle.input_plan is not None
+
+    with pytest.raises(AttributeError):
+        handle.model_name = 'other'
+
+    slow = handle.replace(input_plan=None)
+    assert slow.input_plan is None
+    assert handle.input_plan is not None
+    assert slow.predict({'area': 3.0})['prediction'] == pytest.approx(handle.predict({'area': 3.0})['prediction'])
+
+    with pytest.raises(ValueError, match='模型不存在'):
+        predictor.get_handle('missing_model')
+
+
+def test_concurrent_requests_use_their_own_model(models_dir):
+    predictor = Predictor(models_dir=models_dir)
+    predictor.set_current_model('linear_regression_1')
+    slopes = {'linear_regression_1': 2.0, 'linear_regression_2': 5.0}
+
+    def request(i):
+        model_name = 'linear_regression_1' if i % 2 else 'linear_regression_2'
+        result = predictor.get_handle(model_name).predict({'area': float(i)})
+        return result['model_name'], result['prediction'], slopes[model_name] * i
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(request, range(400)))
+
+    assert all(prediction == pytest.approx(expected) for _, prediction, expected in results)
+    assert predictor.current_model_name == 'linear_regression_1'
+
@@ -0,0 +1,109 @@
+import os
+import threading
+import numpy as np
+import pytest
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+from models.predictor import Predictor
+
+
+def slope_model(slope):
+    X = pd.DataFrame({'area': np.arange(20, dtype=float)})
+    return LinearRegression().fit(X, slope * X['area'])
+
+
+def test_refresh_picks_up_added_changed_and_removed_models(tmp_path, save_model):
+    models_dir = str(tmp_path)
+    predictor = Predictor(models_dir=models_dir, poll_interval=0)
+    assert predictor.get_available_models() == []
+
+    save_model('linear_regression_1', slope_model(2.0), ['area'])
+    assert predictor.refresh_models()['added'] == ['linear_regression_1']
+    assert predictor.set_current_model('linear_regression_1')['success']
+    assert predictor.predict({'area': 10.0})['prediction'] == pytest.approx(20.0)
+
+    save_model('linear_regression_1', slope_model(3.0), ['area'])
+    assert predictor.refresh_models()['changed'] == ['linear_regression_1']
+    assert predictor.predict({'area': 10.0})['prediction'] == pytest.approx(30.0)
+
+    os.remove(os.path.join(models_dir, 'linear_regression_1_info.json'))
+    assert predictor.refresh_models()['removed'] == ['linear_regression_1']
+    assert 'linear_regression_1' not in predictor.loaded_models
+    assert not predictor.set_current_model('linear_regression_1')['success']
+
+
+def test_refresh_is_throttled_by_poll_interval(tmp_path, save_model):
+    models_dir = str(tmp_path)
+    predictor = Predictor(models_dir=models_dir, poll_interval=3600)
+
+    save_model('ridge_1', slope_model(1.0), ['area'])
+    assert 'ridge_1' not in predictor.get_available_models()
+    assert predictor.refresh_models(force=True)['added'] == ['ridge_1']
+
+
+
+def test_forced_rescans_for_unknown_models_are_rate_limited(tmp_path, monkeypatch, save_model):
+    models_dir = str(tmp_path)
+    predictor = Predictor(models_dir=models_dir, poll_interval=3600, rescan_interval=3600)
+    scans = []
+    scan_model_files = predictor._scan_model_files
+    monkeypatch.setattr(predictor, '_scan_model_files', lambda: scans.append(1) or scan_model_files())
+
+    assert not predictor.has_model('missing_1')
+    save_model('ridge_1', slope_model(1.0), ['area'])
+    for _ in range(20):
+        assert not predictor.has_model('ridge_1')
+    assert len(scans) == 1
+
+    predictor.rescan_interval = 0
+    assert predictor.has_model('ridge_1')
+    assert len(scans) == 2
+
+
+def test_refresh_retries_unreadable_model_info(tmp_path, save_model):
+    models_dir = str(tmp_path)
+    predictor = Predictor(models_dir=models_dir, poll_interval=0)
+
+    save_model('ridge_1', slope_model(1.0), ['area'])
+    info_path = os.path.join(models_dir, 'ridge_1_info.json')
+    with open(info_path) as f:
+        info = f.read()
+    with open(info_path, 'w') as f:
+        f.write(info[:10])
+
+    assert predictor.refresh_models()['added'] == []
+    assert 'ridge_1' not in predictor.available_models
+
+    with open(info_path, 'w') as f:
+        f.write(info)
+    assert predictor.refresh_models()['added'] == ['ridge_1']
+
+
+def test_refresh_under_concurrent_lookups(tmp_path, save_model):
+    models_dir = str(tmp_path)
+    save_model('linear_regression_1', slope_model(1.0), ['area'])
+    predictor = Predictor(models_dir=models_dir, poll_interval=0)
+    stop = threading.Event()
+    errors = []
+
+    def lookup():
+        while not stop.is_set():
+            try:
+                result = predictor.get_handle('linear_regression_1').predict({'area': 1.0})
+                assert result['success']
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=lookup) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for slope in range(2, 30):
+        save_model('linear_regression_1', slope_model(float(slope)), ['area'])
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    predictor.refresh_models(force=True)
+    assert predictor.get_handle('linear_regression_1').predict({'area': 1.0})['prediction'] == pytest.approx(29.0)
@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.svm import SVR
+
+from config.settings import PREDICTION_CONFIG
+from models.parallel import chunk_ranges, parallel_predict, resolve_backend, resolve_n_jobs
+from models.predictor import Predictor
+
+
+def test_chunk_ranges_cover_all_rows():
+    assert chunk_ranges(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert chunk_ranges(0, 4) == []
+    assert resolve_n_jobs(0) == 1
+    assert resolve_n_jobs(3) == 3
+    assert resolve_n_jobs(-1) == (os.cpu_count() or 1)
+
+
+def test_backend_selection():
+    assert resolve_backend(RandomForestRegressor()) == 'threading'
+    assert resolve_backend(SVR()) == 'threading'
+    assert resolve_backend(object()) == 'loky'
+    assert resolve_backend(SVR(), 'loky') == 'loky'
+
+
+@pytest.mark.parametrize('backend', ['threading', 'loky'])
+def test_parallel_predict_preserves_order(backend, make_data):
+    X, y = make_data(500)
+    model = SVR().fit(X, y)
+
+    actual = parallel_predict(model.predict, X, chunk_size=64, n_jobs=2, backend=backend)
+    np.testing.assert_allclose(actual, model.predict(X))
+
+    array = X.to_numpy()
+    model = SVR().fit(array, y)
+    actual = parallel_predict(model.predict, array, chunk_size=100, n_jobs=2, backend=backend)
+    np.testing.assert_allclose(actual, model.predict(array))
+
+
+def test_batch_predict_splits_large_inputs(tmp_path, monkeypatch, make_data, save_model):
+    X, y = make_data(500)
+    model = SVR().fit(X, y)
+    save_model('svr_1', model, list(X.columns))
+
+    monkeypatch.setitem(PREDICTION_CONFIG, 'parallel_min_rows', 100)
+    monkeypatch.setitem(PREDICTION_CONFIG, 'parallel_chunk_size', 64)
+    monkeypatch.setitem(PREDICTION_CONFIG, 'parallel_workers', 2)
+
+    calls = []
+    original = SVR.predict
+
+    def counting_predict(self, data):
+        calls.append(len(data))
+        return original(self, data)
+
+    monkeypatch.setattr(SVR, 'predict', counting_predict)
+
+    predictor = Predictor(models_dir=str(tmp_path))
+    predictor.set_current_model('svr_1')
+    calls.clear()
+
+    result = predictor.batch_predict(X.to_dict('records'))
+    assert result['success']
+    assert sorted(calls) == sorted(end - start for start, end in chunk_ranges(len(X), 64))
+    np.testing.assert_allclose(result['predictions'], original(model, X))
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.svm import SVR
+
+from models.compiled import compile_model, reduce_precision
+from models.predictor import Predictor
+
+
+def test_forest_reduced_precision_is_accepted(make_data):
+    X, y = make_data()
+    model = RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y)
+    compiled = compile_model(model)
+
+    reduced, report = reduce_precision(compiled, X.to_numpy(), tolerance=1e-4)
+
+    assert report['accepted']
+    assert reduced.threshold.dtype == np.float32
+    assert report['reduced_bytes'] < report['original_bytes']
+    np.testing.assert_allclose(reduced.predict(X.to_numpy()), model.predict(X), rtol=1e-4)
+
+
+def test_reduced_precision_rejected_above_tolerance(make_data):
+    X, y = make_data()
+    compiled = compile_model(LinearRegression().fit(X, y))
+
+    reduced, report = reduce_precision(compiled, X.to_numpy(), tolerance=0.0)
+
+    assert reduced is None
+    assert not report['accepted']
+    assert report['max_abs_deviation'] > 0
+
+
+def test_reduced_precision_requires_compatible_model_and_sample(make_data):
+    X, y = make_data(50)
+
+    _, report = reduce_precision(compile_model(SVR().fit(X, y)), X.to_numpy(), tolerance=1e-4)
+    assert not report['accepted']
+
+    _, report = reduce_precision(compile_model(LinearRegression().fit(X, y)), None, tolerance=1e-4)
+    assert not report['accepted']
+
+
+def test_predictor_loads_reduced_precision_model(tmp_path, make_data, save_model):
+    X, y = make_data()
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+
+    save_model('random_forest_1', model, list(X.columns))
+    np.save(tmp_path / 'random_forest_1_validation.npy', X.head(50).to_numpy())
+
+    predictor = Predictor(models_dir=str(tmp_path), reduced_precision=True, precision_tolerance=1e-4)
+    result = predictor.set_current_model('random_forest_1')
+
+    assert result['success']
+    assert result['precision']['accepted']
+    assert predictor.compiled_model.value.dtype == np.float32
+    assert predictor.get_model_info()['precision']['accepted']
+
+    prediction = predictor.predict({'area': 120.0, 'rooms': 3, 'age': 10.0})
+    expected = model.predict(pd.DataFrame([{'area': 120.0, 'rooms': 3, 'age': 10.0}]))[0]
+    assert abs(prediction['prediction'] - expected) <= 1e-4 * abs(expected)
+
+    report = result['precision']
+    assert report['estimator_released']
+    assert predictor.current_handle._model is None
+    assert report['resident_bytes_after'] == predictor.compiled_model.nbytes
+    assert report['resident_bytes_after'] < report['estimator_bytes'] < report['resident_bytes_before']
+    assert report['memory_saved_bytes'] == report['resident_bytes_before'] - report['resident_bytes_after']
+
+    fallback = predictor.batch_predict([{'area': np.nan, 'rooms': 3, 'age': 10.0}, {'area': 120.0, 'rooms': 3, 'age': 10.0}])
+    assert fallback['success']
+    assert fallback['count'] == 2
+    assert predictor.current_handle._model is None
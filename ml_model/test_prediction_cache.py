@@ -0,0 +1,123 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from models.prediction_cache import PredictionCache
+from models.predictor import Predictor
+
+
+def test_lookup_deduplicates_and_counts():
+    cache = PredictionCache(max_entries=10, ttl=60)
+    X = np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0]])
+
+    values, found, keys = cache.lookup(('m', 1), X)
+    assert not found.any()
+    cache.store(('m', 1), keys[:2], np.array([10.0, 20.0]))
+
+    values, found, _ = cache.lookup(('m', 1), X)
+    assert found.all()
+    np.testing.assert_array_equal(values, [10.0, 20.0, 10.0])
+
+    _, found, _ = cache.lookup(('m', 2), X)
+    assert not found.any()
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 3
+    assert stats['misses'] == 6
+    assert stats['hit_ratio'] == pytest.approx(1 / 3)
+
+
+def test_negative_zero_shares_entry():
+    cache = PredictionCache()
+    _, _, keys = cache.lookup('m', np.array([[0.0, 1.0]]))
+    cache.store('m', keys, np.array([5.0]))
+
+    values, found, _ = cache.lookup('m', np.array([[-0.0, 1.0]]))
+    assert found.all()
+    assert values[0] == 5.0
+
+
+def test_ttl_expiry_and_lru_eviction():
+    cache = PredictionCache(max_entries=2, ttl=0.05)
+    rows = np.array([[1.0], [2.0], [3.0]])
+    _, _, keys = cache.lookup('m', rows)
+
+    cache.store('m', keys[:2], np.array([1.0, 2.0]))
+    cache.lookup('m', rows[:1])
+    cache.store('m', keys[2:], np.array([3.0]))
+
+    _, found, _ = cache.lookup('m', rows)
+    np.testing.assert_array_equal(found, [True, False, True])
+    assert cache.get_stats()['evictions'] == 1
+
+    time.sleep(0.1)
+    _, found, _ = cache.lookup('m', rows)
+    assert not found.any()
+    assert cache.get_stats()['entries'] == 0
+
+
+def test_invalidate_drops_only_that_models_buckets():
+    cache = PredictionCache(max_entries=4, ttl=60)
+    rows = np.array([[1.0], [2.0]])
+    _, _, keys = cache.lookup(('a', 1), rows)
+    for model_key in (('a', 1), ('a', 2), ('ab', 1)):
+        cache.store(model_key, keys, np.array([1.0, 2.0]))
+
+    assert cache.get_stats()['evictions'] == 2
+    assert not cache.lookup(('a', 1), rows)[1].any()
+    assert cache.invalidate('a') == 2
+    assert cache.lookup(('ab', 1), rows)[1].all()
+    assert cache.get_stats()['entries'] == 2
+
+
+def test_cached_predictions_match_uncached(tmp_path, make_data, save_model):
+    X, y = make_data(200)
+    model = RandomForestRegressor(n_estimators=10, random_state=42).fit(X, y)
+    save_model('random_forest_1', model, list(X.columns))
+
+    cached = Predictor(models_dir=str(tmp_path), cache_enabled=True)
+    uncached = Predictor(models_dir=str(tmp_path), cache_enabled=False)
+    assert uncached.prediction_cache is None
+    cached.set_current_model('random_forest_1')
+    uncached.set_current_model('random_forest_1')
+
+    records = pd.concat([X.head(30), X.head(10)]).to_dict('records')
+    first = cached.batch_predict(records)
+    second = cached.batch_predict(records)
+    expected = uncached.batch_predict(records)
+
+    np.testing.assert_allclose(first['predictions'], expected['predictions'])
+    assert second['predictions'] == first['predictions']
+
+    stats = cached.prediction_cache.get_stats()
+    assert stats['entries'] == 30
+    assert stats['hits'] == 40
+
+    row = X.iloc[0].to_dict()
+    result = cached.predict(row)
+    assert result['prediction'] == pytest.approx(uncached.predict(row)['prediction'])
+    assert cached.prediction_cache.get_stats()['hits'] == 41
+
+
+def test_model_change_invalidates_entries(tmp_path, make_data, save_model):
+    X, y = make_data(200)
+    save_model('linear_regression_1', LinearRegression().fit(X, y), list(X.columns))
+
+    predictor = Predictor(models_dir=str(tmp_path), cache_enabled=True, poll_interval=0)
+    predictor.set_current_model('linear_regression_1')
+    row = X.iloc[0].to_dict()
+    before = predictor.predict(row)['prediction']
+    assert predictor.prediction_cache.get_stats()['entries'] == 1
+
+    retrained = LinearRegression().fit(X, y * 2)
+    time.sleep(0.01)
+    save_model('linear_regression_1', retrained, list(X.columns))
+    predictor.refresh_models(force=True)
+
+    assert predictor.prediction_cache.get_stats()['entries'] == 0
+    after = predictor.predict(row)['prediction']
+    assert after == pytest.approx(2 * before, rel=1e-6)
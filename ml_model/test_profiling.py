@@ -0,0 +1,65 @@
+import pstats
+import threading
+
+from utils.profiling import RequestProfiler, valid_request_id, valid_profile_id
+
+
+def _busy_work(n: int) -> int:
+    return sum(i * i for i in range(n))
+
+
+def _profile(profiler: RequestProfiler, request_id: str) -> dict:
+    session = profiler.start('GET', '/', 'sampled', request_id=request_id)
+    profiler.stop(session, 200)
+    return profiler.save(session)
+
+
+def test_profile_captures_pool_threads_and_is_retrievable(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), top_n=5)
+    session = profiler.start('POST', '/model/train', 'requested', request_id='req-1')
+    assert session is not None
+    assert valid_profile_id(session.profile_id)
+    assert profiler.start('POST', '/predict/batch', 'requested') is None
+
+    worker = threading.Thread(target=_busy_work, args=(200000,))
+    worker.start()
+    worker.join()
+    profiler.note_request()
+    profiler.stop(session, 200)
+
+    info = profiler.save(session)
+    assert info['status_code'] == 200
+    assert info['overlapping_requests'] == 1
+    assert info['request_id'] == 'req-1'
+    assert len(info['by_cumulative']) == 5
+
+    assert profiler.get(session.profile_id)['path'] == '/model/train'
+    stats = pstats.Stats(profiler.stats_path(session.profile_id))
+    assert any(key[2] == '_busy_work' for key in stats.stats)
+    assert [item['profile_id'] for item in profiler.list_profiles()] == [session.profile_id]
+    assert 'by_cumulative' not in profiler.list_profiles()[0]
+
+    session = profiler.start('POST', '/predict/batch', 'sampled')
+    assert session is not None
+    profiler.stop(session, 200)
+
+
+def test_old_profiles_are_pruned_and_ids_never_collide(tmp_path):
+    profiler = RequestProfiler(str(tmp_path), max_profiles=2)
+    profiles = [_profile(profiler, 'same-request') for _ in range(3)]
+
+    assert len({info['profile_id'] for info in profiles}) == 3
+    assert [item['profile_id'] for item in profiler.list_profiles()] == [info['profile_id'] for info in profiles[1:]]
+    assert profiler.get(profiles[0]['profile_id']) is None and profiler.stats_path(profiles[0]['profile_id']) is None
+
+
+def test_ids_are_validated(tmp_path):
+    profiler = RequestProfiler(str(tmp_path))
+
+    assert valid_request_id('3f2a-req_01')
+    assert not valid_request_id('')
+    assert not valid_request_id('../secrets')
+    assert not valid_request_id('x' * 65)
+    assert not valid_profile_id('req-1')
+    assert profiler.get('../secrets') is None
+    assert profiler.stats_path('../secrets') is None
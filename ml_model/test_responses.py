@@ -0,0 +1,67 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.encoders import jsonable_encoder
+
+from api import responses
+from api.responses import NumpyJSONResponse, encode_default
+from utils.helpers import serialize_numpy_pandas
+
+
+def legacy_body(content) -> bytes:
+    return json.dumps(jsonable_encoder(serialize_numpy_pandas(content)), ensure_ascii=False)
+
+
+def test_matches_legacy_serialization():
+    content = {
+        'success': True,
+        'predictions': np.array([1.5, 2.25, -3.0]),
+        'predictions_proba': np.array([[0.2, 0.8], [0.6, 0.4]], dtype=np.float32),
+        'labels': np.array([0, 1, 1], dtype=np.int64),
+        'count': np.int64(3),
+        'score': np.float32(0.5),
+        'valid': np.bool_(True),
+        'dtypes': {'area': np.dtype('float64'), 'city': np.dtype('O')},
+        'stats': pd.Series({'mean': np.float64(1.0), 'std': np.float64(2.0)}),
+        'created_at': pd.Timestamp('2024-01-02 03:04:05'),
+        'elapsed': pd.Timedelta(seconds=90),
+        'preview': pd.DataFrame({'area': [1.0, 2.0], 'city': ['北京', '上海']}).to_dict('records'),
+        'message': '预测成功',
+        'nothing': None
+    }
+
+    body, legacy = json.loads(NumpyJSONResponse(content).body), json.loads(legacy_body(content))
+    np.testing.assert_allclose(body.pop('predictions_proba'), legacy.pop('predictions_proba'), rtol=1e-6)
+    assert body == legacy
+
+
+def test_unsupported_types_raise():
+    with pytest.raises(TypeError, match='object'):
+        encode_default(object())
+    with pytest.raises(TypeError):
+        NumpyJSONResponse({'value': object()})
+
+
+@pytest.mark.parametrize('backend', ['orjson', 'json'])
+def test_non_finite_values_become_null(monkeypatch, backend):
+    if backend == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(responses, 'orjson', None)
+
+    content = {
+        'predictions': np.array([1.5, np.nan, np.inf]),
+        'proba': np.array([[0.5, -np.inf]], dtype=np.float32),
+        'score': np.float64('nan'),
+        'values': [float('inf'), 2.0],
+        'stats': pd.Series({'mean': np.nan})
+    }
+
+    assert json.loads(responses.dumps(content)) == {
+        'predictions': [1.5, None, None],
+        'proba': [[0.5, None]],
+        'score': None,
+        'values': [None, 2.0],
+        'stats': {'mean': None}
+    }
@@ -0,0 +1,131 @@
+import os
+import asyncio
+
+import pytest
+
+from api.executors import WorkerPool
+from api.scheduler import AdmissionRejected, TrainingScheduler, resolve_training_cores, resolve_worker_count
+
+
+def test_training_cores_reserve_inference_capacity():
+    assert resolve_training_cores(8, 2) == 6
+    assert resolve_training_cores(1, 1) == 1
+    assert resolve_training_cores(None, 0) == (os.cpu_count() or 1)
+
+
+def test_training_cores_are_split_across_workers(monkeypatch):
+    assert resolve_training_cores(16, 1, workers=4) == 3
+    assert resolve_training_cores(4, 1, workers=8) == 1
+    monkeypatch.setattr(os, 'cpu_count', lambda: 8)
+    assert resolve_training_cores(None, 1, workers=2) == 3
+
+    monkeypatch.delenv('WEB_CONCURRENCY', raising=False)
+    assert resolve_worker_count(3) == 3
+    monkeypatch.setenv('WEB_CONCURRENCY', '4')
+    assert resolve_worker_count(1) == 4
+    monkeypatch.setenv('WEB_CONCURRENCY', 'auto')
+    assert resolve_worker_count(2) == 2
+
+
+def test_jobs_share_core_budget_and_queue_in_order():
+    training = WorkerPool("training", 2)
+    process = WorkerPool("training_process", 2)
+    scheduler = TrainingScheduler(capacity=4, max_queued=2, max_job_cores=3)
+    events = []
+
+    async def job(name, pool, cores, release):
+        async with scheduler.reserve(pool, cores) as n_jobs:
+            events.append((name, n_jobs))
+            await release.wait()
+
+    async def run():
+        releases = [asyncio.Event() for _ in range(4)]
+        tasks = [asyncio.create_task(job('search', training, 8, releases[0]))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(job('compare', process, 1, releases[1])))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(job('train', training, 1, releases[2])))
+        tasks.append(asyncio.create_task(job('second_search', training, 8, releases[3])))
+        await asyncio.sleep(0)
+
+        assert events == [('search', 3), ('compare', 1)]
+        assert scheduler.get_stats()['queued'] == 2
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            async with scheduler.reserve(training):
+                pass
+        assert rejected.value.status_code == 429
+        assert int(rejected.value.headers['Retry-After']) >= 1
+
+        releases[0].set()
+        await asyncio.sleep(0.01)
+        assert events[2:] == [('train', 1), ('second_search', 2)]
+
+        for release in releases[1:]:
+            release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+
+    stats = scheduler.get_stats()
+    assert stats['cores_in_use'] == 0 and stats['queued'] == 0
+    assert stats['admitted'] == 4 and stats['rejected'] == 1
+    assert stats['running'] == {'training': 0, 'training_process': 0}
+
+
+def test_cancelled_waiter_leaves_queue():
+    pool = WorkerPool("training", 1)
+    scheduler = TrainingScheduler(capacity=1, max_queued=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def holder():
+            async with scheduler.reserve(pool):
+                await release.wait()
+
+        first = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()['queued'] == 1
+
+        waiting.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()['queued'] == 0
+
+        release.set()
+        await first
+
+    asyncio.run(run())
+    assert scheduler.cores_in_use == 0
+
+
+def test_job_starts_when_only_other_pools_are_queued():
+    training = WorkerPool("training", 1)
+    process = WorkerPool("training_process", 1)
+    scheduler = TrainingScheduler(capacity=4, max_queued=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def holder(pool):
+            async with scheduler.reserve(pool):
+                await release.wait()
+
+        tasks = [asyncio.create_task(holder(training))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(holder(training)))
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()['queued'] == 1
+
+        tasks.append(asyncio.create_task(holder(process)))
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()['running'] == {'training': 1, 'training_process': 1}
+        assert scheduler.get_stats()['queued'] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert scheduler.cores_in_use == 0 and scheduler.rejected == 0
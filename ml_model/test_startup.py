@@ -0,0 +1,48 @@
+import sys
+import os
+import subprocess
+
+from utils.startup import PACKAGE_ROOT, parse_import_times, profile_imports, format_import_profile
+
+
+def test_parse_import_times():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     numpy.core",
+        "import time:      3000 |       3120 |   numpy",
+        "import time:       500 |       3620 | api.ml_api"
+    ])
+
+    entries = parse_import_times(output)
+    assert [entry['module'] for entry in entries] == ['numpy.core', 'numpy', 'api.ml_api']
+    assert [entry['depth'] for entry in entries] == [2, 1, 0]
+    assert entries[1]['self_ms'] == 3.0
+    assert entries[2]['cumulative_ms'] == 3.62
+
+
+def test_app_import_defers_heavy_modules(tmp_path):
+    code = (
+        "import sys; import api.ml_api as api; "
+        "print(','.join(m for m in ('sklearn', 'joblib', 'scipy') if m in sys.modules)); "
+        "print(len(api.predictor.available_models))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=str(tmp_path), env={**os.environ, 'PYTHONPATH': PACKAGE_ROOT},
+        capture_output=True, text=True, timeout=120
+    )
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.splitlines() == ['', '0']
+
+
+def test_profile_imports_reports_modules(tmp_path):
+    report = profile_imports("utils.state_store", top_n=1000, cwd=str(tmp_path))
+
+    assert report['success']
+    target = [entry for entry in report['by_cumulative'] if entry['module'] == 'utils.state_store']
+    assert len(target) == 1 and report['total_ms'] == target[0]['cumulative_ms'] > 0
+    assert 'utils.state_store' in format_import_profile(report)
+    assert len(profile_imports("utils.state_store", top_n=3, cwd=str(tmp_path))['by_self']) == 3
+
+    assert not profile_imports("missing_module_xyz", cwd=str(tmp_path))['success']
@@ -0,0 +1,82 @@
+import os
+import time
+import threading
+
+import pandas as pd
+import pytest
+
+from api.export_jobs import ExportJobManager
+from data.dataset_registry import DatasetRegistry, new_dataset_id
+from utils.state_store import StateStore, sqlite_path
+
+
+def test_state_and_sequences_are_shared(tmp_path):
+    path = str(tmp_path / 'state.db')
+    first, second = StateStore(path), StateStore(path)
+
+    first.update({'data_uploaded': True, 'current_model_name': 'ridge_1'})
+    assert second.get('data_uploaded') is True
+    assert second.get_many(['current_model_name', 'missing']) == {'current_model_name': 'ridge_1'}
+    assert second.get('missing', 'default') == 'default'
+
+    values = []
+    threads = [
+        threading.Thread(target=lambda store=store: values.extend(store.next_sequence('ridge') for _ in range(20)))
+        for store in (first, second)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(values) == list(range(1, 41))
+
+    assert sqlite_path('sqlite:///ml_system.db') == 'ml_system.db'
+    with pytest.raises(ValueError):
+        sqlite_path('postgresql://localhost/ml')
+
+
+def test_datasets_are_loaded_by_id_in_other_workers(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    writer = DatasetRegistry(max_datasets=2, store=store)
+    reader = DatasetRegistry(max_datasets=2, store=StateStore(store.path))
+
+    ids = []
+    for i in range(3):
+        dataset_id = new_dataset_id()
+        path = tmp_path / 'uploads' / dataset_id / f'part{i}.csv'
+        path.parent.mkdir(parents=True)
+        df = pd.DataFrame({'a': range(i + 1)})
+        df.to_csv(path, index=False)
+        ids.append(writer.register(df, f'part{i}.csv', path=str(path), dataset_id=dataset_id))
+
+    assert reader.current_id() == ids[2]
+    assert reader.get('current')['df']['a'].tolist() == [0, 1, 2]
+    assert [item['dataset_id'] for item in reader.list_datasets()] == ids[1:]
+    assert 'path' not in reader.list_datasets()[0]
+    assert reader.get(ids[0]) is None
+    assert not (tmp_path / 'uploads' / ids[0]).exists()
+
+    assert reader.remove(ids[1])
+    assert writer.get(ids[1]) is None
+
+
+def test_export_jobs_are_visible_across_workers(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    owner = ExportJobManager(str(tmp_path / 'spool'), ttl=3600, store=store)
+    other = ExportJobManager(str(tmp_path / 'spool'), ttl=3600, store=StateStore(store.path))
+
+    job = {
+        'job_id': 'job1', 'status': 'done', 'path': str(tmp_path / 'spool' / 'job1.csv'),
+        'created_at': time.time() - 10, 'finished_at': time.time() - 5
+    }
+    open(job['path'], 'w').close()
+    owner.jobs['job1'] = job
+    owner._save(job)
+
+    assert other.get('job1')['status'] == 'done'
+    assert other.describe(other.get('job1'))['download_url'] == '/predict/export/job1/download'
+
+    other.ttl = 1
+    assert other.cleanup() == 1
+    assert not os.path.exists(job['path'])
+    assert store.get_job('job1') is None
@@ -0,0 +1,70 @@
+import io
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def fitted(make_predictor):
+    rng = np.random.default_rng(3)
+    X = pd.DataFrame({'area': rng.normal(100, 30, 200), 'rooms': rng.integers(1, 6, 200).astype(float)})
+    predictor, model = make_predictor(X, 3 * X['area'] + 10 * X['rooms'])
+    return predictor, X, model
+
+
+def test_stream_predict_ndjson_in_chunks(fitted):
+    predictor, X, model = fitted
+    data = X.assign(price=0.0).to_csv(index=False)
+
+    chunks = list(predictor.stream_predict(pd.read_csv(io.StringIO(data), chunksize=64)))
+
+    assert len(chunks) == 4
+    lines = [line for chunk in chunks for line in chunk.decode('utf-8').splitlines()]
+    records = [json.loads(line) for line in lines]
+    assert [record['row_index'] for record in records] == list(range(200))
+    np.testing.assert_allclose([record['prediction'] for record in records], model.predict(X), rtol=1e-12)
+    assert lines == [json.dumps(record, separators=(',', ':')) for record in records]
+
+
+def test_stream_predict_csv_with_input(fitted):
+    predictor, X, model = fitted
+    chunks = [X.iloc[:50], X.iloc[50:120], X.iloc[120:]]
+
+    output = b''.join(predictor.stream_predict(iter(chunks), format='csv', include_input=True))
+    result = pd.read_csv(io.BytesIO(output))
+
+    assert list(result.columns) == ['row_index', 'area', 'rooms', 'prediction']
+    assert len(result) == 200
+    np.testing.assert_allclose(result['prediction'], model.predict(X), rtol=1e-9)
+
+
+def test_stream_predict_validates_first_chunk(fitted):
+    predictor, X, _ = fitted
+
+    with pytest.raises(ValueError, match='缺少特征'):
+        predictor.stream_predict(iter([X[['area']]]))
+
+    with pytest.raises(ValueError, match='不支持'):
+        predictor.stream_predict(iter([X]), format='xml')
+
+
+@pytest.mark.parametrize('format', ['ndjson', 'csv'])
+def test_api_stream_marks_failure_mid_stream(fitted, format):
+    from api.ml_api import _stream_with_cleanup
+
+    predictor, X, _ = fitted
+    broken = X.iloc[50:100].astype(object)
+    broken.iloc[0, 0] = 'abc'
+
+    stream = predictor.stream_predict(iter([X.iloc[:50], broken]), format=format)
+    lines = b''.join(_stream_with_cleanup(stream, None, None, format)).decode('utf-8').splitlines()
+
+    if format == 'csv':
+        assert len(lines) == 52
+        assert lines[-1].startswith('#error: 流式预测中断')
+        assert len(pd.read_csv(io.StringIO('\n'.join(lines)), comment='#')) == 50
+    else:
+        assert len(lines) == 51
+        assert json.loads(lines[-1])['error'].startswith('流式预测中断')
+        assert all('error' not in json.loads(line) for line in lines[:-1])
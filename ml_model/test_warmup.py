@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+
+from models.predictor import Predictor
+
+
+@pytest.fixture
+def models_dir(save_model):
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame({'area': rng.normal(100, 30, 100), 'rooms': rng.integers(1, 6, 100).astype(float)})
+    y = 3 * X['area'] + 10 * X['rooms']
+    save_model('linear_regression_1', LinearRegression().fit(X, y), list(X.columns))
+    return save_model('ridge_1', Ridge().fit(X, y), list(X.columns))
+
+
+def test_warmup_preloads_models(models_dir):
+    predictor = Predictor(models_dir=models_dir)
+
+    result = predictor.warmup(['linear_regression_1', 'ridge_1', 'missing_model'])
+
+    assert result['loaded_count'] == 2
+    assert not result['success']
+    assert set(predictor.loaded_models) == {'linear_regression_1', 'ridge_1'}
+    assert predictor.current_model_name == 'linear_regression_1'
+    assert all('predict_ms' in item for item in result['models'] if item['success'])
+
+
+def test_warmup_uses_most_recently_used_models(models_dir):
+    predictor = Predictor(models_dir=models_dir)
+    predictor.set_current_model('ridge_1')
+
+    restarted = Predictor(models_dir=models_dir)
+    assert restarted.get_recent_models(1) == ['ridge_1']
+
+    result = restarted.warmup(top_n=1)
+    assert [item['model_name'] for item in result['models']] == ['ridge_1']
+    assert restarted.predict({'area': 100.0, 'rooms': 2.0})['success']
@@ -1,18 +1,4 @@
-from .helpers import (
-    ensure_dir,
-    save_json,
-    load_json,
-    validate_csv_file,
-    format_metrics,
-    generate_model_summary,
-    create_prediction_report,
-    calculate_feature_importance,
-    detect_outliers,
-    generate_data_profile,
-    safe_float_conversion,
-    safe_int_conversion,
-    truncate_string
-)
+from utils.startup import lazy_exports
 
 __all__ = [
     'ensure_dir',
@@ -28,4 +14,7 @@ __all__ = [
     'safe_float_conversion',
     'safe_int_conversion',
     'truncate_string'
-]
\ No newline at end of file
+]
+
+
+__getattr__ = lazy_exports(__name__, dict.fromkeys(__all__, '.helpers'))
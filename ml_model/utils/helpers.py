@@ -5,7 +5,6 @@ import numpy as np
 from typing import Dict, List, Any, Optional, Union
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -21,7 +20,7 @@ def save_json(data: Dict[str, Any], file_path: str) -> bool:
             json.dump(data, f, ensure_ascii=False, indent=2)
         return True
     except Exception as e:
-        logger.error(f"保存JSON文件失败: {str(e)}")
+        logger.error("保存JSON文件失败: %s", e)
         return False
 
 
@@ -30,7 +29,7 @@ def load_json(file_path: str) -> Optional[Dict[str, Any]]:
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
-        logger.error(f"加载JSON文件失败: {str(e)}")
+        logger.error("加载JSON文件失败: %s", e)
         return None
 
 
@@ -129,7 +128,7 @@ def calculate_feature_importance(model, feature_names: List[str]) -> Dict[str, f
         else:
             return {}
     except Exception as e:
-        logger.error(f"计算特征重要性失败: {str(e)}")
+        logger.error("计算特征重要性失败: %s", e)
         return {}
 
 
@@ -150,7 +149,7 @@ def detect_outliers(df: pd.DataFrame, column: str, method: str = 'iqr') -> List[
         
         return outliers
     except Exception as e:
-        logger.error(f"检测异常值失败: {str(e)}")
+        logger.error("检测异常值失败: %s", e)
         return []
 
 
@@ -0,0 +1,233 @@
+import os
+import sys
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Any, Optional, Tuple
+
+REQUEST_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar('request_id', default=None)
+
+RECORD_FIELDS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'request_id'}
+
+
+def set_request_id(request_id: Optional[str]) -> contextvars.Token:
+    return REQUEST_ID.set(request_id)
+
+
+def reset_request_id(token: contextvars.Token):
+    REQUEST_ID.reset(token)
+
+
+def current_request_id() -> Optional[str]:
+    return REQUEST_ID.get()
+
+
+class RequestContextFilter(logging.Filter):
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, 'request_id', None) is None:
+            record.request_id = REQUEST_ID.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+
+    def __init__(self, level: int = logging.WARNING, window: float = 60.0, burst: int = 10, clock=time.monotonic):
+        super().__init__()
+        self.level = level
+        self.window = window
+        self.burst = burst
+        self.clock = clock
+        self.suppressed_total = 0
+        self._windows: Dict[Tuple[str, int, Any], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.level or record.levelno >= logging.ERROR or self.burst <= 0:
+            return True
+
+        key = (record.name, record.levelno, record.msg)
+        now = self.clock()
+        with self._lock:
+            state = self._windows.get(key)
+            if state is None or now - state[0] >= self.window:
+                suppressed = state[2] if state is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if len(self._windows) > 10000:
+                    self._expire(now)
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+
+            if state[1] < self.burst:
+                state[1] += 1
+                return True
+
+            state[2] += 1
+            self.suppressed_total += 1
+            return False
+
+    def _expire(self, now: float):
+        for key in [key for key, state in self._windows.items() if now - state[0] >= self.window]:
+            del self._windows[key]
+
+
+class JSONFormatter(logging.Formatter):
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'pid': record.process,
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_FIELDS and not key.startswith('_'):
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload['exception'] = record.exc_text
+        if record.stack_info:
+            payload['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class AsyncQueueHandler(QueueHandler):
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_state: Dict[str, Any] = {'listener': None, 'handler': None, 'sampler': None, 'slot': None}
+
+
+def _worker_log_path(template: str) -> Tuple[str, Any]:
+    if '{worker}' not in template:
+        return template.format(pid=os.getpid()), None
+
+    try:
+        import fcntl
+    except ImportError:
+        return template.format(worker=os.getpid(), pid=os.getpid()), None
+
+    index = 0
+    while True:
+        path = template.format(worker=index, pid=os.getpid())
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        slot = open(f"{path}.lock", 'a')
+        try:
+            fcntl.flock(slot, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            slot.close()
+            index += 1
+            continue
+        return path, slot
+
+
+def _formatter(config: Dict[str, Any]) -> logging.Formatter:
+    if config.get('json', True):
+        return JSONFormatter()
+    return logging.Formatter(config['format'])
+
+
+def configure_logging(config: Optional[Dict[str, Any]] = None, force: bool = False) -> QueueListener:
+    if _state['listener'] is not None and not force:
+        return _state['listener']
+
+    if config is None:
+        from config.settings import LOGGING_CONFIG
+        config = LOGGING_CONFIG
+
+    shutdown_logging()
+
+    formatter = _formatter(config)
+    handlers = []
+    if config.get('console', True):
+        console = logging.StreamHandler(sys.stderr)
+        console.setFormatter(formatter)
+        handlers.append(console)
+    if config.get('file'):
+        path, _state['slot'] = _worker_log_path(config['file'])
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        file_handler = RotatingFileHandler(
+            path,
+            maxBytes=config.get('max_bytes', 10 * 1024 * 1024),
+            backupCount=config.get('backup_count', 5),
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+
+    log_queue = queue.Queue(maxsize=config.get('queue_size', 10000))
+    handler = AsyncQueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter())
+    sampler = SamplingFilter(
+        logging.getLevelName(config.get('sample_level', 'WARNING')),
+        window=config.get('sample_window', 60.0),
+        burst=config.get('sample_burst', 10)
+    )
+    handler.addFilter(sampler)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(config.get('level', 'INFO'))
+
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _state.update({'listener': listener, 'handler': handler, 'sampler': sampler})
+    return listener
+
+
+def shutdown_logging():
+    listener, handler, slot = _state['listener'], _state['handler'], _state['slot']
+    _state.update({'listener': None, 'handler': None, 'sampler': None, 'slot': None})
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+        for target in listener.handlers:
+            target.close()
+    if slot is not None:
+        slot.close()
+
+
+def get_logging_stats() -> Dict[str, Any]:
+    handler, sampler = _state['handler'], _state['sampler']
+    return {
+        'configured': handler is not None,
+        'queued': handler.queue.qsize() if handler is not None else 0,
+        'dropped': handler.dropped if handler is not None else 0,
+        'suppressed': sampler.suppressed_total if sampler is not None else 0
+    }
+
+
+atexit.register(shutdown_logging)
@@ -0,0 +1,209 @@
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Iterator, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Histogram:
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self.counts)
+            total = self.sum
+            count = self.count
+
+        cumulative = 0
+        buckets: List[Dict[str, Any]] = []
+        for bound, bucket_count in zip(self.buckets + [float('inf')], counts):
+            cumulative += bucket_count
+            buckets.append({'le': '+Inf' if bound == float('inf') else bound, 'count': cumulative})
+
+        return {
+            'count': count,
+            'sum': total,
+            'mean': total / count if count else 0.0,
+            'buckets': buckets
+        }
+
+
+REQUEST_BUCKETS_SECONDS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 120]
+PHASE_BUCKETS_SECONDS = [0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30, 120, 600]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if value == float('-inf'):
+        return '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1.0, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + value
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = list(self.values.items())
+        return [(self.name, dict(zip(self.labelnames, key)), value) for key, value in values]
+
+
+class LabeledHistogram:
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float], labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = sorted(buckets)
+        self.labelnames = tuple(labelnames)
+        self.histograms: Dict[Tuple[str, ...], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels) -> Histogram:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, value: float, **labels):
+        self.labels(**labels).observe(value)
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        histogram = self.labels(**labels)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            histograms = list(self.histograms.items())
+
+        samples = []
+        for key, histogram in histograms:
+            labels = dict(zip(self.labelnames, key))
+            snapshot = histogram.snapshot()
+            for bucket in snapshot['buckets']:
+                le = '+Inf' if bucket['le'] == '+Inf' else _format_value(bucket['le'])
+                samples.append((f'{self.name}_bucket', {**labels, 'le': le}, bucket['count']))
+            samples.append((f'{self.name}_sum', labels, snapshot['sum']))
+            samples.append((f'{self.name}_count', labels, snapshot['count']))
+        return samples
+
+
+class CallbackMetric:
+
+    def __init__(self, name: str, documentation: str, callback: Callable[[], Any], kind: str = 'gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.kind = kind
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        values = self.callback()
+        if values is None:
+            return []
+        if isinstance(values, (int, float)):
+            return [(self.name, {}, values)]
+        return [(self.name, dict(labels), value) for labels, value in values]
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self.metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, buckets: Sequence[float],
+                  labelnames: Sequence[str] = ()) -> LabeledHistogram:
+        return self.register(LabeledHistogram(name, documentation, buckets, labelnames))
+
+    def callback(self, name: str, documentation: str, callback: Callable[[], Any], kind: str = 'gauge') -> CallbackMetric:
+        return self.register(CallbackMetric(name, documentation, callback, kind))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self.metrics.values())
+
+        lines = []
+        for metric in metrics:
+            try:
+                samples = metric.samples()
+            except Exception as e:
+                logger.warning("采集指标失败 %s: %s", metric.name, e)
+                continue
+
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in samples:
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+PHASE_SECONDS = REGISTRY.histogram(
+    'ml_phase_duration_seconds',
+    '热点路径各阶段耗时（CSV解析、预处理、训练、交叉验证、调参、模型加载、预测、序列化）',
+    PHASE_BUCKETS_SECONDS,
+    ['phase']
+)
+
+
+def phase_timer(phase: str):
+    return PHASE_SECONDS.time(phase=phase)
@@ -0,0 +1,178 @@
+import os
+import re
+import json
+import time
+import uuid
+import pstats
+import cProfile
+import logging
+import threading
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+def valid_request_id(request_id: str) -> bool:
+    return bool(request_id) and REQUEST_ID_PATTERN.match(request_id) is not None
+
+
+def valid_profile_id(profile_id: str) -> bool:
+    return bool(profile_id) and PROFILE_ID_PATTERN.match(profile_id) is not None
+
+
+def _function_label(key) -> str:
+    file_name, line, function = key
+    if file_name == '~':
+        return function
+    return f"{file_name}:{line}({function})"
+
+
+def summarize_stats(stats: pstats.Stats, top_n: int) -> Dict[str, Any]:
+    rows = [
+        {
+            'function': _function_label(key),
+            'calls': calls,
+            'primitive_calls': primitive_calls,
+            'tottime_ms': tottime * 1000,
+            'cumtime_ms': cumtime * 1000
+        }
+        for key, (primitive_calls, calls, tottime, cumtime, _) in stats.stats.items()
+    ]
+    return {
+        'function_count': len(rows),
+        'total_calls': stats.total_calls,
+        'by_cumulative': sorted(rows, key=lambda row: row['cumtime_ms'], reverse=True)[:top_n],
+        'by_self': sorted(rows, key=lambda row: row['tottime_ms'], reverse=True)[:top_n]
+    }
+
+
+class ProfileSession:
+
+    def __init__(self, profile_id: str, method: str, path: str, reason: str, overlapping_requests: int = 0,
+                 request_id: Optional[str] = None):
+        self.profile_id = profile_id
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.overlapping_requests = overlapping_requests
+        self.started_at = time.time()
+        self.wall_ms = None
+        self.status_code = None
+        self.profiler = cProfile.Profile()
+
+
+class RequestProfiler:
+
+    def __init__(self, output_dir: str, max_profiles: int = 50, top_n: int = 30):
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+        self.top_n = top_n
+        self.session: Optional[ProfileSession] = None
+        self._lock = threading.Lock()
+
+    def start(self, method: str, path: str, reason: str, overlapping_requests: int = 0,
+              request_id: Optional[str] = None) -> Optional[ProfileSession]:
+        if not self._lock.acquire(blocking=False):
+            return None
+
+        session = ProfileSession(uuid.uuid4().hex, method, path, reason, overlapping_requests, request_id)
+        try:
+            session.profiler.enable()
+        except ValueError as e:
+            self._lock.release()
+            logger.warning("无法开启请求分析 %s: %s", session.profile_id, e)
+            return None
+
+        self.session = session
+        return session
+
+    def note_request(self):
+        session = self.session
+        if session is not None:
+            session.overlapping_requests += 1
+
+    def stop(self, session: ProfileSession, status_code: int):
+        session.profiler.disable()
+        session.wall_ms = (time.time() - session.started_at) * 1000
+        session.status_code = status_code
+        self.session = None
+        self._lock.release()
+
+    def _paths(self, profile_id: str) -> Dict[str, str]:
+        base = os.path.join(self.output_dir, profile_id)
+        return {'stats': f"{base}.prof", 'info': f"{base}.json"}
+
+    def save(self, session: ProfileSession) -> Optional[Dict[str, Any]]:
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            paths = self._paths(session.profile_id)
+            stats = pstats.Stats(session.profiler)
+            stats.dump_stats(paths['stats'])
+
+            info = {
+                'profile_id': session.profile_id,
+                'request_id': session.request_id,
+                'method': session.method,
+                'path': session.path,
+                'reason': session.reason,
+                'status_code': session.status_code,
+                'started_at': session.started_at,
+                'wall_ms': session.wall_ms,
+                'profiled_ms': stats.total_tt * 1000,
+                'overlapping_requests': session.overlapping_requests,
+                'worker_pid': os.getpid(),
+                **summarize_stats(stats, self.top_n)
+            }
+            with open(paths['info'], 'w') as f:
+                json.dump(info, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error("保存请求分析结果失败 %s: %s", session.profile_id, e)
+            return None
+
+        self.prune()
+        return info
+
+    def prune(self) -> int:
+        profiles = self.list_profiles()
+        expired = profiles[:max(0, len(profiles) - self.max_profiles)]
+        for info in expired:
+            for path in self._paths(info['profile_id']).values():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+        return len(expired)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        if not valid_profile_id(profile_id):
+            return None
+        try:
+            with open(self._paths(profile_id)['info'], 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def stats_path(self, profile_id: str) -> Optional[str]:
+        if not valid_profile_id(profile_id):
+            return None
+        path = self._paths(profile_id)['stats']
+        return path if os.path.exists(path) else None
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        try:
+            names = os.listdir(self.output_dir)
+        except OSError:
+            return []
+
+        profiles = []
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            info = self.get(name[:-len('.json')])
+            if info is not None:
+                profiles.append({key: value for key, value in info.items() if key not in ('by_cumulative', 'by_self')})
+        return sorted(profiles, key=lambda info: info['started_at'])
@@ -0,0 +1,85 @@
+import os
+import re
+import sys
+import importlib
+import subprocess
+from typing import Callable, Dict, List, Any, Optional
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    def __getattr__(name: str) -> Any:
+        if name in exports:
+            return getattr(importlib.import_module(exports[name], package), name)
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    return __getattr__
+
+
+def parse_import_times(output: str) -> List[Dict[str, Any]]:
+    entries = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entries.append({
+            'module': module,
+            'depth': max(0, (len(indent) - 1) // 2),
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+    return entries
+
+
+def profile_imports(module: str = "api.ml_api", top_n: int = 20, cwd: Optional[str] = None) -> Dict[str, Any]:
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get('PYTHONPATH')]))
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=cwd, env=env, capture_output=True, text=True, timeout=300
+        )
+    except Exception as e:
+        return {'success': False, 'message': f'导入耗时分析失败: {str(e)}'}
+
+    if completed.returncode != 0:
+        errors = completed.stderr.strip().splitlines()
+        return {
+            'success': False,
+            'message': f'导入 {module} 失败: {errors[-1] if errors else completed.returncode}'
+        }
+
+    entries = parse_import_times(completed.stderr)
+    target = [entry for entry in entries if entry['module'] == module]
+    packages: Dict[str, float] = {}
+    for entry in entries:
+        package = entry['module'].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + entry['self_ms']
+
+    return {
+        'success': True,
+        'module': module,
+        'total_ms': target[-1]['cumulative_ms'] if target else sum(entry['self_ms'] for entry in entries),
+        'module_count': len(entries),
+        'by_self': sorted(entries, key=lambda entry: entry['self_ms'], reverse=True)[:top_n],
+        'by_cumulative': sorted(entries, key=lambda entry: entry['cumulative_ms'], reverse=True)[:top_n],
+        'by_package': sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top_n]
+    }
+
+
+def format_import_profile(report: Dict[str, Any]) -> str:
+    if not report['success']:
+        return report['message']
+
+    lines = [f"导入 {report['module']} 共耗时 {report['total_ms']:.1f}ms, 模块数 {report['module_count']}", "", "按包汇总 (self ms):"]
+    lines += [f"  {total:10.1f}  {package}" for package, total in report['by_package']]
+    lines += ["", "按模块累计耗时 (cumulative ms / self ms):"]
+    lines += [
+        f"  {entry['cumulative_ms']:10.1f} {entry['self_ms']:10.1f}  {entry['module']}"
+        for entry in report['by_cumulative']
+    ]
+    lines += ["", "按模块自身耗时 (self ms):"]
+    lines += [f"  {entry['self_ms']:10.1f}  {entry['module']}" for entry in report['by_self']]
+    return "\n".join(lines)
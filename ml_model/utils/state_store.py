@@ -0,0 +1,178 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sequences (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS models (
+    model_name TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS export_jobs (
+    job_id TEXT PRIMARY KEY,
+    finished_at REAL,
+    record TEXT NOT NULL
+);
+"""
+
+
+def sqlite_path(url: str) -> str:
+    if not url.startswith("sqlite:///") or len(url) == len("sqlite:///"):
+        raise ValueError(f'只支持基于文件的SQLite数据库: {url}')
+    return url[len("sqlite:///"):]
+
+
+class StateStore:
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_url(cls, url: str) -> 'StateStore':
+        return cls(sqlite_path(url))
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        return self._connection().execute(sql, params).fetchall()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        rows = self._query("SELECT value FROM state WHERE key = ?", (key,))
+        return json.loads(rows[0][0]) if rows else default
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        placeholders = ",".join("?" * len(keys))
+        rows = self._query(f"SELECT key, value FROM state WHERE key IN ({placeholders})", tuple(keys))
+        return {key: json.loads(value) for key, value in rows}
+
+    def update(self, values: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO state (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                [(key, json.dumps(value)) for key, value in values.items()]
+            )
+
+    def set(self, key: str, value: Any):
+        self.update({key: value})
+
+    def next_sequence(self, name: str) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "INSERT INTO sequences (name, value) VALUES (?, 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1 RETURNING value",
+                (name,)
+            ).fetchone()[0]
+
+    def add_dataset(self, record: Dict[str, Any], max_datasets: int) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO datasets (dataset_id, created_at, record) VALUES (?, ?, ?)",
+                (record['dataset_id'], record['created_at'], json.dumps(record))
+            )
+            evicted = conn.execute(
+                "SELECT record FROM datasets ORDER BY created_at DESC LIMIT -1 OFFSET ?",
+                (max_datasets,)
+            ).fetchall()
+            evicted = [json.loads(row[0]) for row in evicted]
+            conn.executemany(
+                "DELETE FROM datasets WHERE dataset_id = ?",
+                [(entry['dataset_id'],) for entry in evicted]
+            )
+        return evicted
+
+    def get_dataset(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT record FROM datasets WHERE dataset_id = ?", (dataset_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def remove_dataset(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT record FROM datasets WHERE dataset_id = ?", (dataset_id,)).fetchone()
+            conn.execute("DELETE FROM datasets WHERE dataset_id = ?", (dataset_id,))
+        return json.loads(row[0]) if row else None
+
+    def list_datasets(self) -> List[Dict[str, Any]]:
+        rows = self._query("SELECT record FROM datasets ORDER BY created_at")
+        return [json.loads(row[0]) for row in rows]
+
+    def add_model(self, model_name: str, record: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO models (model_name, created_at, record) VALUES (?, ?, ?)",
+                (model_name, time.time(), json.dumps(record))
+            )
+
+    def list_models(self) -> List[str]:
+        return [row[0] for row in self._query("SELECT model_name FROM models ORDER BY created_at")]
+
+    def put_job(self, job: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO export_jobs (job_id, finished_at, record) VALUES (?, ?, ?)",
+                (job['job_id'], job.get('finished_at'), json.dumps(job))
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT record FROM export_jobs WHERE job_id = ?", (job_id,))
+        return json.loads(rows[0][0]) if rows else None
+
+    def delete_job(self, job_id: str):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM export_jobs WHERE job_id = ?", (job_id,))
+
+    def expire_jobs(self, finished_before: float) -> List[Dict[str, Any]]:
+        rows = self._query(
+            "SELECT job_id, record FROM export_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+            (finished_before,)
+        )
+        if not rows:
+            return []
+
+        with self._connect() as conn:
+            deleted = [
+                (job_id, record) for job_id, record in rows
+                if conn.execute("DELETE FROM export_jobs WHERE job_id = ?", (job_id,)).rowcount
+            ]
+        return [json.loads(record) for _, record in deleted]